@@ -4,8 +4,18 @@ Django admin configuration for accounts app.
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Count
 from django.utils.html import format_html
-from .models import User, InstructorRequest, EmailVerificationToken, PasswordResetToken
+from apps.analytics.models import PlatformStats
+from .authentication import revoke_tokens
+from .models import (
+    User,
+    InstructorRequest,
+    EmailVerificationToken,
+    PasswordResetToken,
+    OutboxEmail,
+    OutboxStatus,
+)
 
 
 @admin.register(User)
@@ -85,24 +95,36 @@ class UserAdmin(BaseUserAdmin):
 
     def activate_users(self, request, queryset):
         count = queryset.update(is_active=True)
+        revoke_tokens(queryset.values_list("pk", flat=True))
         self.message_user(request, f"{count} user(s) activated successfully.")
 
     activate_users.short_description = "Activate selected users"  # type: ignore
 
     def deactivate_users(self, request, queryset):
         count = queryset.update(is_active=False)
+        revoke_tokens(queryset.values_list("pk", flat=True))
         self.message_user(request, f"{count} user(s) deactivated successfully.")
 
     deactivate_users.short_description = "Deactivate selected users"  # type: ignore
 
     def make_instructor(self, request, queryset):
+        changed = queryset.exclude(role="INSTRUCTOR").order_by().values_list("role")
+        moved = dict(changed.annotate(total=Count("id")))
         count = queryset.update(role="INSTRUCTOR")
+        revoke_tokens(queryset.values_list("pk", flat=True))
+        for role, total in moved.items():
+            PlatformStats.objects.shift_role(role, "INSTRUCTOR", total)
         self.message_user(request, f"{count} user(s) promoted to Instructor.")
 
     make_instructor.short_description = "Promote to Instructor"  # type: ignore
 
     def make_student(self, request, queryset):
+        changed = queryset.exclude(role="STUDENT").order_by().values_list("role")
+        moved = dict(changed.annotate(total=Count("id")))
         count = queryset.update(role="STUDENT")
+        revoke_tokens(queryset.values_list("pk", flat=True))
+        for role, total in moved.items():
+            PlatformStats.objects.shift_role(role, "STUDENT", total)
         self.message_user(request, f"{count} user(s) changed to Student.")
 
     make_student.short_description = "Change to Student"  # type: ignore
@@ -156,7 +178,7 @@ class InstructorRequestAdmin(admin.ModelAdmin):
 
     def approve_requests(self, request, queryset):
         from django.utils import timezone
-        from .tasks import send_instructor_request_decision_email
+        from .outbox import enqueue_email
 
         for req in queryset.filter(status="PENDING"):
             req.status = "APPROVED"
@@ -169,7 +191,7 @@ class InstructorRequestAdmin(admin.ModelAdmin):
             req.user.save()
 
             # Send notification
-            send_instructor_request_decision_email(str(req.id))
+            enqueue_email("send_instructor_request_decision_email", request_id=str(req.id))
 
         self.message_user(request, f"{queryset.count()} request(s) approved.")
 
@@ -177,7 +199,7 @@ class InstructorRequestAdmin(admin.ModelAdmin):
 
     def reject_requests(self, request, queryset):
         from django.utils import timezone
-        from .tasks import send_instructor_request_decision_email
+        from .outbox import enqueue_email
 
         for req in queryset.filter(status="PENDING"):
             req.status = "REJECTED"
@@ -186,7 +208,7 @@ class InstructorRequestAdmin(admin.ModelAdmin):
             req.save()
 
             # Send notification
-            send_instructor_request_decision_email(str(req.id))
+            enqueue_email("send_instructor_request_decision_email", request_id=str(req.id))
 
         self.message_user(request, f"{queryset.count()} request(s) rejected.")
 
@@ -227,3 +249,36 @@ class PasswordResetTokenAdmin(admin.ModelAdmin):
         return format_html('<span style="color: green;">Valid</span>')
 
     is_expired_display.short_description = "Status"  # type: ignore
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """Admin for OutboxEmail model."""
+
+    list_display = ("task", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status", "task", "created_at")
+    search_fields = ("task", "last_error")
+    ordering = ("-created_at",)
+    readonly_fields = (
+        "task",
+        "kwargs",
+        "attempts",
+        "locked_until",
+        "last_error",
+        "created_at",
+        "sent_at",
+    )
+    actions = ["retry_emails"]
+
+    def retry_emails(self, request, queryset):
+        from django.utils import timezone
+
+        count = queryset.exclude(status=OutboxStatus.SENT).update(
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+            locked_until=None,
+        )
+        self.message_user(request, f"{count} email(s) queued for retry.")
+
+    retry_emails.short_description = "Retry selected emails"  # type: ignore
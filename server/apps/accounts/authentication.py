@@ -0,0 +1,133 @@
+"""
+JWT authentication that builds the request user from token claims.
+
+Access tokens carry the user's role, active and verification flags (see
+apps.accounts.tokens), so authenticating a request needs no user lookup.
+Tokens are revoked by bumping `User.auth_version`: every request compares
+the token's version with the user's current one, read from a short-lived
+per-process cache, so a revoked token stops working within
+AUTH_VERSION_CACHE_TTL seconds everywhere and immediately in the process
+that made the change.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from config.routers import primary_reads
+
+from .models import User
+from .tokens import USER_CLAIMS
+
+
+class AuthVersionCache:
+    """Per-process cache of user auth versions with a time-to-live."""
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """Current auth version of a user, or None if the user is gone."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        # Revocations must be seen at once, whatever replica serves the request
+        with primary_reads():
+            version = (
+                User.objects.filter(pk=user_id)
+                .values_list("auth_version", flat=True)
+                .first()
+            )
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries = {
+                    key: value for key, value in self._entries.items() if value[1] > now
+                }
+                if len(self._entries) >= self.max_size:
+                    self._entries.clear()
+            self._entries[user_id] = (version, now + settings.AUTH_VERSION_CACHE_TTL)
+        return version
+
+    def forget(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+auth_versions = AuthVersionCache()
+
+
+def revoke_tokens(user_ids):
+    """
+    Invalidate the access tokens issued to the given users. Clients get a
+    `token_revoked` error and refresh, which issues tokens with the users'
+    current claims.
+    """
+    user_ids = [str(user_id) for user_id in user_ids]
+    updated = User.objects.filter(pk__in=user_ids).update(
+        auth_version=F("auth_version") + 1
+    )
+
+    def forget():
+        for user_id in user_ids:
+            auth_versions.forget(user_id)
+
+    # Evict now and again after commit, so no request caches the old version
+    forget()
+    transaction.on_commit(forget)
+    return updated
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate with the claims embedded in the access token. The user is
+    built without a query; fields outside USER_CLAIMS are loaded on first
+    access, and saving it writes only the claims changed on the instance.
+    Tokens issued without the claims fall back to a user lookup.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or not all(
+            claim in validated_token for claim in USER_CLAIMS
+        ):
+            with primary_reads():
+                return super().get_user(validated_token)
+
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        version = auth_versions.get(str(user_id))
+        if version is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if version != validated_token["auth_version"]:
+            raise AuthenticationFailed(
+                "Token has been revoked; refresh it.", code="token_revoked"
+            )
+
+        values = {claim: validated_token[claim] for claim in USER_CLAIMS}
+        values[User._meta.pk.attname] = User._meta.pk.to_python(user_id)
+        field_names = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        user = User.from_db(
+            DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names]
+        )
+        user._token_claims = {claim: values[claim] for claim in USER_CLAIMS}
+        return user
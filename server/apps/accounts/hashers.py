@@ -0,0 +1,18 @@
+"""
+Password hashers configured from settings.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfiguredPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count taken from
+    PASSWORD_HASH_ITERATIONS (Django's default when 0). Stored hashes with
+    another count still verify and are rehashed on the user's next login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS or PBKDF2PasswordHasher.iterations
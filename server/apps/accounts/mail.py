@@ -0,0 +1,148 @@
+"""
+Email rendering and bulk dispatch helpers.
+"""
+
+import logging
+import smtplib
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template import Context, Engine
+from django.utils import timezone
+from django.utils.html import escape, strip_tags
+
+logger = logging.getLogger(__name__)
+
+# Marks a per-recipient value in a pre-rendered template skeleton
+PLACEHOLDER = "\ue000{}\ue001"
+
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=None)
+def get_email_engine():
+    """Template engine for emails, with the cached loader always enabled."""
+    return Engine(
+        dirs=[str(directory) for directory in settings.TEMPLATES[0]["DIRS"]],
+        loaders=[
+            (
+                "django.template.loaders.cached.Loader",
+                [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ],
+            )
+        ],
+    )
+
+
+@lru_cache(maxsize=None)
+def base_context():
+    """Context shared by every email."""
+    return {"site_name": settings.SITE_NAME, "site_url": settings.FRONTEND_URL}
+
+
+@lru_cache(maxsize=1024)
+def _text_alternative(html_content):
+    return strip_tags(html_content)
+
+
+@lru_cache(maxsize=256)
+def _render_skeleton(template_name, shared_items, fill_names, today):
+    """Render a template with placeholders for the per-recipient values."""
+    context = {
+        **base_context(),
+        **dict(shared_items),
+        **{name: PLACEHOLDER.format(name) for name in fill_names},
+    }
+    html_content = get_email_engine().get_template(template_name).render(
+        Context(context)
+    )
+    return html_content, _text_alternative(html_content)
+
+
+def render_email(template_name, context=None, fill=None):
+    """
+    Render an email template; return (html_content, text_content).
+
+    `fill` holds per-recipient values that the template prints verbatim
+    (`{{ name }}`, no filters or tags). When every `context` value is a plain
+    scalar, the template and its plain-text alternative are rendered once per
+    template and context, and recipients only cost a few string replaces.
+    """
+    context = context or {}
+    fill = fill or {}
+
+    if not all(isinstance(value, SCALAR_TYPES) for value in context.values()):
+        html_content = get_email_engine().get_template(template_name).render(
+            Context({**base_context(), **context, **fill})
+        )
+        return html_content, _text_alternative(html_content)
+
+    html_content, text_content = _render_skeleton(
+        template_name,
+        tuple(sorted(context.items())),
+        tuple(sorted(fill)),
+        # The base template prints the current year
+        timezone.localdate(),
+    )
+    for name, value in fill.items():
+        placeholder, value = PLACEHOLDER.format(name), escape(value)
+        html_content = html_content.replace(placeholder, value)
+        text_content = text_content.replace(placeholder, value)
+    return html_content, text_content
+
+
+def send_bulk_mail(subject, text_content, html_content, recipients, chunk_size=None):
+    """
+    Send one message per recipient, reusing a single mail connection per
+    chunk of recipients instead of connecting once per message.
+
+    Returns (sent, failed): the recipients that were sent to, and a
+    {recipient: error message} dict of per-recipient failures.
+    """
+    chunk_size = chunk_size or settings.EMAIL_BULK_CHUNK_SIZE
+    recipients = list(dict.fromkeys(recipients))
+    sent, failed = [], {}
+
+    for start in range(0, len(recipients), chunk_size):
+        chunk = recipients[start:start + chunk_size]
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as exc:
+            failed.update((recipient, str(exc)) for recipient in chunk)
+            continue
+
+        try:
+            for recipient in chunk:
+                message = EmailMultiAlternatives(
+                    subject=subject,
+                    body=text_content,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[recipient],
+                    connection=connection,
+                )
+                message.attach_alternative(html_content, "text/html")
+                try:
+                    connection.send_messages([message])
+                except smtplib.SMTPServerDisconnected as exc:
+                    failed[recipient] = str(exc)
+                    # Reconnect for the rest of the chunk; if that fails too,
+                    # each remaining send retries the connection and reports
+                    connection.close()
+                    try:
+                        connection.open()
+                    except Exception:
+                        pass
+                except Exception as exc:
+                    failed[recipient] = str(exc)
+                else:
+                    sent.append(recipient)
+        finally:
+            connection.close()
+
+    for recipient, error in failed.items():
+        logger.error(f"Failed to send '{subject}' to {recipient}: {error}")
+    return sent, failed
@@ -0,0 +1,70 @@
+"""
+Benchmark verification email rendering.
+"""
+
+import secrets
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from apps.accounts.models import User
+from apps.accounts.tasks import render_verification_email
+
+TEMPLATE_NAME = "accounts/emails/verification_email.html"
+
+
+class Command(BaseCommand):
+    help = (
+        "Render verification emails with plain render_to_string + strip_tags "
+        "and with the email rendering service, and report throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        # Unsaved users: rendering needs no database
+        users = [
+            User(
+                email=f"student{index}@example.com",
+                first_name="Student",
+                last_name=str(index),
+            )
+            for index in range(count)
+        ]
+        urls = [
+            f"{settings.FRONTEND_URL}/verify-email?token={secrets.token_urlsafe(32)}"
+            for _ in range(count)
+        ]
+
+        def baseline():
+            for user, url in zip(users, urls):
+                html_content = render_to_string(
+                    TEMPLATE_NAME,
+                    {
+                        "user_name": user.get_full_name(),
+                        "site_name": settings.SITE_NAME,
+                        "site_url": settings.FRONTEND_URL,
+                        "verification_url": url,
+                        "user_email": user.email,
+                    },
+                )
+                strip_tags(html_content)
+
+        def service():
+            for user, url in zip(users, urls):
+                render_verification_email(user, url)
+
+        runs = (("render_to_string + strip_tags", baseline), ("render_email", service))
+        for label, run in runs:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{label:<30} {elapsed:7.2f} s  {count / elapsed:10.0f} emails/s"
+            )
+        self.stdout.write(self.style.SUCCESS("Email rendering benchmark finished."))
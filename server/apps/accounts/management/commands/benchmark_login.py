@@ -0,0 +1,121 @@
+"""
+Benchmark login throughput.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from config.benchmarking import benchmark_database
+
+LOGIN_URL = "/api/v1/accounts/login/"
+PASSWORD = "Benchmark-Passw0rd"
+
+# Isolated counters for the rate limit runs
+BENCHMARK_CACHES = {
+    **settings.CACHES,
+    "login-benchmark": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "login-benchmark",
+    },
+}
+
+# Without any login limit every attempt reaches the password check; a 429
+# would be timed as an attempt that skipped hashing
+UNLIMITED_LOGINS = {
+    "LOGIN_RATELIMIT_IP": "",
+    "LOGIN_RATELIMIT_EMAIL": "",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time sequential logins in one process, i.e. the throughput of one "
+        "sync gunicorn worker, for several PBKDF2 iteration counts and with "
+        "the optional login rate limit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=50)
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            action="append",
+            help="PBKDF2 iteration count to time; repeatable. "
+            "Defaults to the configured count.",
+        )
+        parser.add_argument(
+            "--rate",
+            default="10/h",
+            help="Per-IP limit applied to the failed-login run; a long window "
+            "keeps the run inside one rate limit period.",
+        )
+
+    def _login(self, client, password):
+        return client.post(
+            LOGIN_URL,
+            {"email": "benchmark@example.com", "password": password},
+            format="json",
+        )
+
+    def _throughput(self, client, count, password, expected):
+        statuses = []
+        start = time.perf_counter()
+        for _ in range(count):
+            statuses.append(self._login(client, password).status_code)
+        elapsed = time.perf_counter() - start
+
+        unexpected = set(statuses) - set(expected)
+        if unexpected:
+            raise CommandError(
+                f"Unexpected login responses {sorted(unexpected)}; "
+                f"expected only {sorted(expected)}."
+            )
+        return count / elapsed, statuses
+
+    def handle(self, *args, **options):
+        count = options["logins"]
+        iterations = options["iterations"] or [settings.PASSWORD_HASH_ITERATIONS]
+
+        with benchmark_database(), override_settings(**UNLIMITED_LOGINS):
+            user = User.objects.create_user(
+                email="benchmark@example.com", password=PASSWORD, email_verified=True
+            )
+            client = APIClient()
+
+            with CaptureQueriesContext(connection) as queries:
+                self._login(client, PASSWORD)
+            self.stdout.write(f"Queries per login: {len(queries)}")
+
+            for rounds in iterations:
+                with override_settings(PASSWORD_HASH_ITERATIONS=rounds):
+                    user.set_password(PASSWORD)
+                    user.save(update_fields=["password"])
+                    rate, _ = self._throughput(client, count, PASSWORD, {200})
+                label = rounds or "default"
+                self.stdout.write(
+                    f"iterations={label:<10} {rate:8.1f} logins/s per worker"
+                )
+
+            with override_settings(
+                CACHES=BENCHMARK_CACHES, RATELIMIT_USE_CACHE="login-benchmark"
+            ):
+                rate, _ = self._throughput(client, count, "wrong-password", {400})
+                self.stdout.write(f"failed logins, no limit:   {rate:8.1f} attempts/s")
+
+                with override_settings(LOGIN_RATELIMIT_IP=options["rate"]):
+                    rate, statuses = self._throughput(
+                        client, count, "wrong-password", {400, 429}
+                    )
+                rejected = statuses.count(429)
+                self.stdout.write(
+                    f"failed logins, {options['rate']:<10} {rate:8.1f} attempts/s "
+                    f"({rejected} of {count} rejected before hashing)"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Login benchmark finished."))
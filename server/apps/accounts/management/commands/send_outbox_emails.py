@@ -0,0 +1,64 @@
+"""
+Worker that sends queued outbox emails.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.accounts.outbox import claim_batch, deliver
+
+
+def _deliver(email):
+    try:
+        return deliver(email)
+    finally:
+        # Each pool thread has its own database connection
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Send queued outbox emails with a thread pool, retrying failures."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=settings.EMAIL_OUTBOX_WORKERS
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no email is due instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            while True:
+                batch = claim_batch(options["batch_size"])
+                if not batch:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                for delivered in pool.map(_deliver, batch):
+                    if delivered:
+                        sent += 1
+                    else:
+                        failed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Sent {sent} email(s); {failed} failed or deferred.")
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-date_joined', '-id'], name='users_date_jo_cdf9fa_idx'),
+        ),
+    ]
@@ -29,6 +29,15 @@ class InstructorRequestStatus(models.TextChoices):
     REJECTED = "REJECTED", "Rejected"
 
 
+class OutboxStatus(models.TextChoices):
+    """Delivery status of queued emails."""
+
+    PENDING = "PENDING", "Pending"
+    SENDING = "SENDING", "Sending"
+    SENT = "SENT", "Sent"
+    FAILED = "FAILED", "Failed"
+
+
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication."""
 
@@ -81,6 +90,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     email_verified = models.BooleanField(default=False)
+    # Bumped to revoke issued access tokens (see apps.accounts.authentication)
+    auth_version = models.PositiveIntegerField(default=0)
 
     # Profile information
     bio = models.TextField(max_length=500, blank=True)
@@ -105,11 +116,42 @@ class User(AbstractBaseUser, PermissionsMixin):
         indexes = [
             models.Index(fields=["email", "is_active"]),
             models.Index(fields=["role", "is_active"]),
+            models.Index(fields=["-date_joined", "-id"]),
         ]
 
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        # Users built from token claims carry the values the token was issued
+        # with, which may be stale: a full save writes only the claims
+        # changed on this instance, not the token's copies of the others
+        token_claims = getattr(self, "_token_claims", None)
+        if token_claims and kwargs.get("update_fields") is None and not args:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and not (
+                    field.attname in token_claims
+                    and getattr(self, field.attname) == token_claims[field.attname]
+                )
+            ]
+        super().save(*args, **kwargs)
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Users built from token claims load every other field on first access
+        # instead of one query per deferred field
+        if fields is not None and getattr(self, "_token_claims", None):
+            deferred = self.get_deferred_fields()
+            if deferred.issuperset(fields):
+                fields = deferred
+            # From the primary, even while the request reads from a replica
+            using = using or self._state.db
+        super().refresh_from_db(using=using, fields=fields)
+
     def get_full_name(self):
         """Return the full name of the user."""
         return f"{self.first_name} {self.last_name}".strip() or self.email
@@ -231,3 +273,42 @@ class PasswordResetToken(models.Model):
     def is_expired(self):
         """Check if token is expired."""
         return timezone.now() > self.expires_at or self.used
+
+
+class OutboxEmail(models.Model):
+    """
+    Email queued for the outbox worker (`manage.py send_outbox_emails`).
+    Stores the task name and its keyword arguments; the worker renders and
+    sends the message outside the request.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING,
+    )
+
+    # Delivery attempts
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "email_outbox"
+        verbose_name = "Outbox Email"
+        verbose_name_plural = "Outbox Emails"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
@@ -0,0 +1,102 @@
+"""
+Database-backed email outbox.
+
+Request handlers only insert an OutboxEmail row (inside their transaction);
+the `send_outbox_emails` worker claims due rows and runs the matching email
+task, retrying failures with exponential backoff.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxEmail, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(task, **kwargs):
+    """Queue an email task by name; kwargs must be JSON-serializable."""
+    from .tasks import EMAIL_TASKS
+
+    if task not in EMAIL_TASKS:
+        raise ValueError(f"Unknown email task: {task}")
+    return OutboxEmail.objects.create(task=task, kwargs=kwargs)
+
+
+def claim_batch(limit):
+    """
+    Claim up to `limit` due emails for this worker.
+
+    Each row is claimed with a conditional UPDATE, so concurrent workers never
+    send the same email twice. Rows left SENDING by a crashed worker become
+    claimable again once their lock expires.
+    """
+    now = timezone.now()
+    due = Q(status=OutboxStatus.PENDING, next_attempt_at__lte=now) | Q(
+        status=OutboxStatus.SENDING, locked_until__lt=now
+    )
+    locked_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LOCK_TIMEOUT)
+
+    claimed = []
+    candidates = OutboxEmail.objects.filter(due).order_by("next_attempt_at")
+    for email_id in candidates.values_list("id", flat=True)[:limit]:
+        updated = OutboxEmail.objects.filter(due, pk=email_id).update(
+            status=OutboxStatus.SENDING,
+            locked_until=locked_until,
+            attempts=F("attempts") + 1,
+        )
+        if updated:
+            claimed.append(email_id)
+
+    return list(OutboxEmail.objects.filter(pk__in=claimed))
+
+
+def retry_delay(attempts):
+    """Exponential backoff after the given number of attempts."""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def deliver(email):
+    """Run the task of a claimed email and record the outcome."""
+    from .tasks import EMAIL_TASKS
+
+    try:
+        result = EMAIL_TASKS[email.task](**email.kwargs)
+    except Exception as exc:
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            status, next_attempt_at = OutboxStatus.FAILED, email.next_attempt_at
+            logger.error(f"Giving up on outbox email {email.id}: {exc}")
+        else:
+            status = OutboxStatus.PENDING
+            next_attempt_at = timezone.now() + retry_delay(email.attempts)
+            logger.warning(f"Outbox email {email.id} failed, will retry: {exc}")
+
+        OutboxEmail.objects.filter(pk=email.pk).update(
+            status=status,
+            next_attempt_at=next_attempt_at,
+            locked_until=None,
+            last_error=str(exc),
+        )
+        return False
+
+    if result is False:
+        # Nothing to send (e.g. the user was deleted); retrying will not help
+        OutboxEmail.objects.filter(pk=email.pk).update(
+            status=OutboxStatus.FAILED,
+            locked_until=None,
+            last_error="Task reported nothing to send.",
+        )
+        return False
+
+    OutboxEmail.objects.filter(pk=email.pk).update(
+        status=OutboxStatus.SENT,
+        locked_until=None,
+        sent_at=timezone.now(),
+        last_error="",
+    )
+    return True
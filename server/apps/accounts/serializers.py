@@ -4,10 +4,14 @@ Serializers for user accounts and authentication.
 
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
-from django.contrib.auth import authenticate
+from django.contrib.auth.signals import user_login_failed
 from django.utils import timezone
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from .models import User, InstructorRequest, UserRole
-from .tasks import send_verification_email, send_password_reset_email
+from .outbox import enqueue_email
+from .tokens import UserClaimsRefreshToken, set_user_claims
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -85,8 +89,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             email_verified=False,
         )
 
-        # Send verification email asynchronously
-        send_verification_email(user.id)
+        # Queue the verification email for the outbox worker
+        enqueue_email("send_verification_email", user_id=str(user.id))
 
         return user
 
@@ -105,10 +109,9 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get("password")
 
         if email and password:
-            # Check if user exists
-            try:
-                user = User.objects.get(email=email)
-            except User.DoesNotExist:
+            # One lookup serves the account checks and the password check
+            user = User.objects.filter(email=email).first()
+            if user is None:
                 raise serializers.ValidationError(
                     {"email": "No account found with this email address."}
                 )
@@ -125,9 +128,13 @@ class UserLoginSerializer(serializers.Serializer):
                     {"email": "This account has been deactivated."}
                 )
 
-            # Authenticate user
-            user = authenticate(email=email, password=password)
-            if not user:
+            # Check the password; rehashes it if the hasher settings changed
+            if not user.check_password(password):
+                user_login_failed.send(
+                    sender=__name__,
+                    credentials={"email": email},
+                    request=self.context.get("request"),
+                )
                 raise serializers.ValidationError({"password": "Incorrect password."})
 
             # Update last login
@@ -143,6 +150,26 @@ class UserLoginSerializer(serializers.Serializer):
         return attrs
 
 
+class UserClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Issue an access token with the user's current claims, so a client whose
+    token was revoked by a role or status change can continue after refreshing.
+    """
+
+    token_class = UserClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}
+        ).first()
+        if user is None or not user.is_active:
+            raise InvalidToken("User not found or inactive.")
+
+        set_user_claims(refresh, user)
+        return super().validate({"refresh": str(refresh)})
+
+
 class EmailVerificationSerializer(serializers.Serializer):
     """Serializer for email verification."""
 
@@ -207,7 +234,7 @@ class PasswordResetRequestSerializer(serializers.Serializer):
         """Send password reset email."""
         user = self.context.get("user")
         if user:
-            send_password_reset_email(user.id)
+            enqueue_email("send_password_reset_email", user_id=str(user.id))
 
 
 class PasswordResetConfirmSerializer(serializers.Serializer):
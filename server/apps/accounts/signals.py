@@ -1,15 +1,45 @@
 """
 Signals for accounts app.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 import logging
 
+from .authentication import revoke_tokens
+
 logger = logging.getLogger(__name__)
 
+# Changing one of these revokes the user's access tokens, which carry them
+REVOKING_FIELDS = ("email", "role", "is_active", "email_verified")
+
+
+@receiver(pre_save, sender='accounts.User')
+def user_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember the stored claim fields so a change can revoke tokens."""
+    instance._previous_claims = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is None or set(update_fields) & set(REVOKING_FIELDS):
+        instance._previous_claims = (
+            sender.objects.filter(pk=instance.pk).values(*REVOKING_FIELDS).first()
+        )
+
 
 @receiver(post_save, sender='accounts.User')
-def user_post_save(sender, instance, created, **kwargs):
+def user_post_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
     """Handle user post-save events."""
     if created:
         logger.info(f"New user created: {instance.email} with role {instance.role}")
+        return
+
+    # Only the saved fields changed in the database
+    saved = REVOKING_FIELDS if update_fields is None else update_fields
+    previous = getattr(instance, "_previous_claims", None)
+    if previous and any(
+        previous[field] != getattr(instance, field)
+        for field in REVOKING_FIELDS
+        if field in saved
+    ):
+        revoke_tokens([instance.pk])
+        # Keep a later save() of this instance from writing the old version back
+        instance.refresh_from_db(fields=["auth_version"])
@@ -1,5 +1,8 @@
 """
-Celery tasks for asynchronous operations.
+Email tasks, run by the outbox worker (see outbox.py).
+
+Tasks raise on delivery errors so the worker can retry them, and return
+False when there is nothing to send.
 """
 
 import logging
@@ -7,36 +10,40 @@ import secrets
 from datetime import timedelta
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
 from django.utils import timezone
-from django.utils.html import strip_tags
+from .mail import render_email, send_bulk_mail
 from .models import EmailVerificationToken, User
 
 logger = logging.getLogger(__name__)
 
 
+def render_verification_email(user, verification_url):
+    """Render the verification email; return (html_content, text_content)."""
+    return render_email(
+        "accounts/emails/verification_email.html",
+        fill={
+            "user_name": user.get_full_name(),
+            "user_email": user.email,
+            "verification_url": verification_url,
+        },
+    )
+
+
 def send_verification_email(user_id):
     """Send verification email using template."""
-    user = User.objects.get(id=user_id)
+    user = User.objects.filter(id=user_id).first()
+    if user is None:
+        logger.error(f"User with id {user_id} does not exist")
+        return False
     # Generate token
     token = secrets.token_urlsafe(32)
     expires_at = timezone.now() + timedelta(hours=24)
 
     EmailVerificationToken.objects.create(user=user, token=token, expires_at=expires_at)
 
-    # Prepare context
-    verification_url = f"{settings.FRONTEND_URL}/verify-email?token={token}"
-    context = {
-        "user": user,
-        "site_name": settings.SITE_NAME,
-        "site_url": settings.FRONTEND_URL,
-        "verification_url": verification_url,
-        "user_email": user.email,
-    }
-
     # Render templates
-    html_content = render_to_string("accounts/emails/verification_email.html", context)
-    text_content = strip_tags(html_content)
+    verification_url = f"{settings.FRONTEND_URL}/verify-email?token={token}"
+    html_content, text_content = render_verification_email(user, verification_url)
 
     # Send email
     subject = f"Verify your email - {settings.SITE_NAME}"
@@ -48,6 +55,7 @@ def send_verification_email(user_id):
     )
     email.attach_alternative(html_content, "text/html")
     email.send()
+    return True
 
 
 def send_password_reset_email(user_id):
@@ -70,22 +78,19 @@ def send_password_reset_email(user_id):
         # Create reset URL
         reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
 
-        # Prepare context for HTML template
-        context = {
-            "user": user,
-            "site_name": settings.SITE_NAME,
-            "site_url": settings.FRONTEND_URL,
-            "reset_url": reset_url,
-            "user_email": user.email,
-            "email_subtitle": "Password Reset Request",
-            "subject": f"Password Reset - {settings.SITE_NAME}",
-        }
-
         # Render HTML email
-        html_content = render_to_string(
-            "accounts/emails/password_reset_email.html", context
+        html_content, text_content = render_email(
+            "accounts/emails/password_reset_email.html",
+            {
+                "email_subtitle": "Password Reset Request",
+                "subject": f"Password Reset - {settings.SITE_NAME}",
+            },
+            fill={
+                "user_name": user.get_full_name(),
+                "user_email": user.email,
+                "reset_url": reset_url,
+            },
         )
-        text_content = strip_tags(html_content)
 
         # Send email with HTML alternative
         subject = f"Password Reset - {settings.SITE_NAME}"
@@ -104,9 +109,6 @@ def send_password_reset_email(user_id):
     except User.DoesNotExist:
         logger.error(f"User with id {user_id} does not exist")
         return False
-    except Exception as exc:
-        logger.error(f"Error sending password reset email: {str(exc)}")
-        return False
 
 
 def send_instructor_request_notification(request_id):
@@ -115,9 +117,13 @@ def send_instructor_request_notification(request_id):
 
     try:
         request_obj = InstructorRequest.objects.get(id=request_id)
-        admins = User.objects.filter(role=UserRole.ADMIN, is_active=True)
+        admin_emails = list(
+            User.objects.filter(role=UserRole.ADMIN, is_active=True).values_list(
+                "email", flat=True
+            )
+        )
 
-        if not admins.exists():
+        if not admin_emails:
             logger.warning(
                 f"No active admins found to notify about request {request_id}"
             )
@@ -126,49 +132,33 @@ def send_instructor_request_notification(request_id):
         # Prepare context
         context = {
             "request": request_obj,
-            "site_name": settings.SITE_NAME,
-            "site_url": settings.FRONTEND_URL,
             "admin_url": f"{settings.FRONTEND_URL}/admin/instructor-requests",
             "email_subtitle": "New Instructor Request",
             "subject": f"New Instructor Request - {settings.SITE_NAME}",
         }
 
         # Render HTML template once
-        html_content = render_to_string(
+        html_content, text_content = render_email(
             "accounts/emails/instructor_request_notification.html", context
         )
-        text_content = strip_tags(html_content)
-
-        # Send to each admin
-        sent_count = 0
-        for admin in admins:
-            try:
-                subject = f"New Instructor Request - {settings.SITE_NAME}"
-                email = EmailMultiAlternatives(
-                    subject=subject,
-                    body=text_content,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=[admin.email],
-                )
-                email.attach_alternative(html_content, "text/html")
-                email.send()
-                sent_count += 1
-            except Exception as e:
-                logger.error(
-                    f"Failed to send notification to admin {admin.email}: {str(e)}"
-                )
+
+        # Send to all admins over shared connections
+        sent, failed = send_bulk_mail(
+            context["subject"], text_content, html_content, admin_emails
+        )
+
+        if not sent:
+            # Let the outbox retry when no admin could be reached
+            raise RuntimeError(f"No admin notified about request {request_id}")
 
         logger.info(
-            f"Instructor request notification sent for request {request_id} to {sent_count}/{admins.count()} admins"
+            f"Instructor request notification sent for request {request_id} to {len(sent)}/{len(admin_emails)} admins"
         )
-        return sent_count > 0
+        return True
 
     except InstructorRequest.DoesNotExist:
         logger.error(f"Instructor request {request_id} does not exist")
         return False
-    except Exception as exc:
-        logger.error(f"Error sending instructor request notification: {str(exc)}")
-        return False
 
 
 def send_instructor_request_decision_email(request_id):
@@ -180,12 +170,7 @@ def send_instructor_request_decision_email(request_id):
         user = request_obj.user
 
         # Prepare common context
-        context = {
-            "user": user,
-            "site_name": settings.SITE_NAME,
-            "site_url": settings.FRONTEND_URL,
-            "user_email": user.email,
-        }
+        context = {}
 
         if request_obj.status == "APPROVED":
             # Approved email context
@@ -213,8 +198,11 @@ def send_instructor_request_decision_email(request_id):
             template_name = "accounts/emails/instructor_rejected.html"
 
         # Render HTML email
-        html_content = render_to_string(template_name, context)
-        text_content = strip_tags(html_content)
+        html_content, text_content = render_email(
+            template_name,
+            context,
+            fill={"user_name": user.get_full_name(), "user_email": user.email},
+        )
 
         # Send email
         subject = context["subject"]
@@ -235,6 +223,15 @@ def send_instructor_request_decision_email(request_id):
     except InstructorRequest.DoesNotExist:
         logger.error(f"Instructor request {request_id} does not exist")
         return False
-    except Exception as exc:
-        logger.error(f"Error sending decision email: {str(exc)}")
-        return False
+
+
+# Tasks that can be queued with outbox.enqueue_email()
+EMAIL_TASKS = {
+    task.__name__: task
+    for task in (
+        send_verification_email,
+        send_password_reset_email,
+        send_instructor_request_notification,
+        send_instructor_request_decision_email,
+    )
+}
@@ -0,0 +1,202 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .authentication import auth_versions
+from .models import OutboxEmail, OutboxStatus, User
+from .outbox import claim_batch, deliver, enqueue_email, retry_delay
+
+PASSWORD = "Passw0rd!x"
+LOGIN_URL = "/api/v1/accounts/login/"
+
+
+class ClaimsUserSaveTests(TestCase):
+    """Saving a user built from token claims must not write stale claims back."""
+
+    def setUp(self):
+        auth_versions.clear()
+        self.user = User.objects.create_user(
+            email="student@example.com", password=PASSWORD, email_verified=True
+        )
+        self.client = APIClient()
+        response = self.client.post(
+            LOGIN_URL,
+            {"email": self.user.email, "password": PASSWORD},
+            format="json",
+        )
+        access = response.json()["data"]["tokens"]["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        # Cache the token's auth version, as another worker would have
+        self.assertEqual(self.client.get("/api/v1/accounts/profile/").status_code, 200)
+
+    def test_profile_update_keeps_claim_fields(self):
+        # Changed elsewhere; this process still accepts the token
+        User.objects.filter(pk=self.user.pk).update(
+            is_active=False, email="changed@example.com"
+        )
+
+        response = self.client.patch(
+            "/api/v1/accounts/profile/", {"last_name": "Lee"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_name, "Lee")
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(self.user.email, "changed@example.com")
+
+    def test_password_change_keeps_claim_fields(self):
+        User.objects.filter(pk=self.user.pk).update(role="INSTRUCTOR")
+
+        response = self.client.post(
+            "/api/v1/accounts/password/change/",
+            {
+                "old_password": PASSWORD,
+                "new_password": "N3w-Passw0rd!",
+                "new_password_confirm": "N3w-Passw0rd!",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("N3w-Passw0rd!"))
+        self.assertEqual(self.user.role, "INSTRUCTOR")
+
+    def test_email_change_revokes_tokens(self):
+        self.user.email = "new@example.com"
+        self.user.save()
+
+        self.assertEqual(self.user.auth_version, 1)
+        response = self.client.get("/api/v1/accounts/profile/")
+        self.assertEqual(response.status_code, 401)
+
+
+class LoginRateLimitTests(TestCase):
+    def setUp(self):
+        caches[settings.RATELIMIT_USE_CACHE].clear()
+        User.objects.create_user(
+            email="student@example.com", password=PASSWORD, email_verified=True
+        )
+        self.client = APIClient()
+
+    def login(self, email="student@example.com", password=PASSWORD):
+        return self.client.post(
+            LOGIN_URL, {"email": email, "password": password}, format="json"
+        )
+
+    @override_settings(LOGIN_RATELIMIT_IP="2/m", LOGIN_RATELIMIT_EMAIL="")
+    def test_ip_limit_rejects_with_retry_after(self):
+        statuses = [self.login(password="wrong").status_code for _ in range(2)]
+        response = self.login()
+
+        self.assertEqual(statuses, [400, 400])
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(int(response["Retry-After"]), range(1, 61))
+
+    @override_settings(LOGIN_RATELIMIT_IP="", LOGIN_RATELIMIT_EMAIL="1/m")
+    def test_email_limit_counts_per_address(self):
+        self.assertEqual(self.login(password="wrong").status_code, 400)
+        self.assertEqual(self.login(email="Student@example.com").status_code, 429)
+        self.assertEqual(self.login(email="other@example.com").status_code, 400)
+
+    @override_settings(LOGIN_RATELIMIT_IP="", LOGIN_RATELIMIT_EMAIL="")
+    def test_login_is_not_throttled_twice(self):
+        # Only the login limits apply; there is no throttle scope on top
+        for _ in range(25):
+            self.assertEqual(self.login().status_code, 200)
+
+
+@override_settings(
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+    EMAIL_OUTBOX_RETRY_DELAY=30,
+    EMAIL_OUTBOX_MAX_RETRY_DELAY=3600,
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.task = mock.Mock(side_effect=OSError("smtp down"))
+        patcher = mock.patch.dict("apps.accounts.tasks.EMAIL_TASKS", {"flaky": self.task})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = timezone.now() + timedelta(minutes=1)
+
+    def at(self, now):
+        self.now = now
+        return mock.patch("django.utils.timezone.now", return_value=now)
+
+    def attempt(self):
+        """One worker pass at self.now: claim the due emails and send them."""
+        with self.at(self.now):
+            return [deliver(email) for email in claim_batch(10)]
+
+    def test_claim_skips_rows_taken_by_a_concurrent_worker(self):
+        emails = [enqueue_email("flaky") for _ in range(3)]
+        update = QuerySet.update
+        raced, other_worker = [], []
+
+        def racing_update(queryset, **kwargs):
+            # Another worker claims the first email between this worker's
+            # SELECT of candidates and its UPDATE
+            if not raced:
+                raced.append(True)
+                other_worker.extend(claim_batch(1))
+            return update(queryset, **kwargs)
+
+        with self.at(self.now), mock.patch.object(QuerySet, "update", racing_update):
+            claimed = claim_batch(10)
+
+        oldest = min(emails, key=lambda email: email.next_attempt_at)
+        self.assertEqual([email.pk for email in other_worker], [oldest.pk])
+        self.assertEqual(
+            {email.pk for email in claimed}, {email.pk for email in emails} - {oldest.pk}
+        )
+        self.assertEqual(
+            set(OutboxEmail.objects.values_list("status", "attempts")),
+            {(OutboxStatus.SENDING, 1)},
+        )
+        with self.at(self.now):
+            self.assertEqual(claim_batch(10), [])
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email = enqueue_email("flaky", user_id="1")
+
+        self.assertEqual(self.attempt(), [False])
+        email.refresh_from_db()
+        self.assertEqual(
+            (email.status, email.attempts, email.locked_until, email.last_error),
+            (OutboxStatus.PENDING, 1, None, "smtp down"),
+        )
+        self.assertEqual(email.next_attempt_at, self.now + timedelta(seconds=30))
+
+        # Not due before the delay has passed
+        with self.at(self.now + timedelta(seconds=29)):
+            self.assertEqual(claim_batch(10), [])
+
+        self.now += timedelta(seconds=30)
+        self.assertEqual(self.attempt(), [False])
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(email.next_attempt_at, self.now + timedelta(seconds=60))
+        self.task.assert_called_with(user_id="1")
+        self.assertEqual(retry_delay(20), timedelta(seconds=3600))
+
+    def test_gives_up_after_max_attempts(self):
+        email = enqueue_email("flaky")
+
+        for _ in range(3):
+            self.assertEqual(self.attempt(), [False])
+            self.now += timedelta(hours=1)
+
+        email.refresh_from_db()
+        self.assertEqual(
+            (email.status, email.attempts, email.locked_until),
+            (OutboxStatus.FAILED, 3, None),
+        )
+        self.assertEqual(self.attempt(), [])
+        self.assertEqual(self.task.call_count, 3)
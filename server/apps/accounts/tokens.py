@@ -0,0 +1,23 @@
+"""
+JWT tokens carrying the user fields needed to authorize a request.
+"""
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# User fields copied into every token; see ClaimsJWTAuthentication
+USER_CLAIMS = ("email", "role", "is_active", "email_verified", "auth_version")
+
+
+def set_user_claims(token, user):
+    """Write the current USER_CLAIMS of `user` into `token`."""
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        return set_user_claims(super().for_user(user), user)
@@ -4,14 +4,15 @@ Views for user accounts and authentication.
 
 import logging
 
+from django.conf import settings
 from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
+from django_ratelimit.core import get_usage
 from rest_framework import generics, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from .models import (
@@ -34,10 +35,8 @@ from .serializers import (
     UserRoleUpdateSerializer,
     UserSerializer,
 )
-from .tasks import (
-    send_instructor_request_decision_email,
-    send_instructor_request_notification,
-)
+from .outbox import enqueue_email
+from .tokens import UserClaimsRefreshToken
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +49,7 @@ class UserRegistrationView(generics.CreateAPIView):
 
     serializer_class = UserRegistrationSerializer
     permission_classes = [AllowAny]
+    throttle_scope = "register"
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -116,6 +116,32 @@ class EmailVerificationView(generics.GenericAPIView):
             )
 
 
+def _login_email(group, request):
+    return str(request.data.get("email", "")).strip().lower()
+
+
+def login_rate_limited(request):
+    """
+    Count a login attempt against LOGIN_RATELIMIT_IP and LOGIN_RATELIMIT_EMAIL.
+    Return 0 while both limits allow it, otherwise the seconds until the
+    exceeded limits reset. Checked before the password is hashed, so
+    rejected attempts cost no hashing time.
+    """
+    limits = [
+        ("login-ip", "ip", settings.LOGIN_RATELIMIT_IP),
+        ("login-email", _login_email, settings.LOGIN_RATELIMIT_EMAIL),
+    ]
+    wait = 0
+    for group, key, rate in limits:
+        usage = rate and get_usage(
+            request, group=group, key=key, rate=rate, increment=True
+        )
+        if usage and usage["should_limit"]:
+            # time_left is negative when the counter could not be read
+            wait = max(wait, usage["time_left"], 1)
+    return wait
+
+
 class UserLoginView(TokenObtainPairView):
     """
     User login endpoint.
@@ -125,13 +151,24 @@ class UserLoginView(TokenObtainPairView):
     permission_classes = [AllowAny]
 
     def post(self, request, *args, **kwargs):
-        serializer = UserLoginSerializer(data=request.data)
+        wait = login_rate_limited(request)
+        if wait:
+            return Response(
+                {
+                    "success": False,
+                    "error": {"message": "Too many login attempts. Try again later."},
+                },
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(wait)},
+            )
+
+        serializer = UserLoginSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
 
         user = serializer.validated_data["user"]  # type: ignore
 
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = UserClaimsRefreshToken.for_user(user)
 
         return Response(
             {
@@ -209,6 +246,7 @@ class PasswordResetRequestView(generics.GenericAPIView):
 
     serializer_class = PasswordResetRequestSerializer
     permission_classes = [AllowAny]
+    throttle_scope = "password_reset"
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -229,6 +267,7 @@ class PasswordResetConfirmView(generics.GenericAPIView):
 
     serializer_class = PasswordResetConfirmSerializer
     permission_classes = [AllowAny]
+    throttle_scope = "password_reset"
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -327,7 +366,10 @@ class InstructorRequestViewSet(viewsets.ModelViewSet):
         instructor_request = serializer.save()
 
         # Send notification to admins
-        send_instructor_request_notification(str(instructor_request.id))
+        enqueue_email(
+            "send_instructor_request_notification",
+            request_id=str(instructor_request.id),
+        )
 
         return Response(
             {
@@ -363,7 +405,10 @@ class InstructorRequestViewSet(viewsets.ModelViewSet):
         serializer.save()
 
         # Send decision email to user
-        send_instructor_request_decision_email(str(instructor_request.id))
+        enqueue_email(
+            "send_instructor_request_decision_email",
+            request_id=str(instructor_request.id),
+        )
 
         return Response(
             {
@@ -1,3 +1,54 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import CourseDailyStats, PlatformDailyStats, PlatformStats
+
+
+@admin.register(PlatformStats)
+class PlatformStatsAdmin(admin.ModelAdmin):
+    """Read-only admin for the platform counters."""
+
+    list_display = (
+        "__str__",
+        "total_users",
+        "total_courses",
+        "total_enrollments",
+        "updated_at",
+        "reconciled_at",
+    )
+    readonly_fields = PlatformStats.COUNTER_FIELDS + ("updated_at", "reconciled_at")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PlatformDailyStats)
+class PlatformDailyStatsAdmin(admin.ModelAdmin):
+    """Read-only admin for the platform daily rollups."""
+
+    list_display = ("date", "new_users", "enrollments", "completions", "reviews")
+    date_hierarchy = "date"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CourseDailyStats)
+class CourseDailyStatsAdmin(admin.ModelAdmin):
+    """Read-only admin for the course daily rollups."""
+
+    list_display = ("date", "course", "category", "enrollments", "completions", "reviews")
+    list_filter = ("category",)
+    list_select_related = ("course", "category")
+    date_hierarchy = "date"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,25 @@
+"""
+Recount the platform stats counters.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.analytics.models import PlatformStats
+
+
+class Command(BaseCommand):
+    help = "Recount the platform stats row from the source tables."
+
+    def handle(self, *args, **options):
+        before = PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).first()
+        with transaction.atomic():
+            after = PlatformStats.objects.reconcile()
+
+        for field in PlatformStats.COUNTER_FIELDS:
+            old = getattr(before, field, None)
+            new = getattr(after, field)
+            if old != new:
+                self.stdout.write(f"{field}: {old} -> {new}")
+
+        self.stdout.write(self.style.SUCCESS("Platform stats reconciled."))
@@ -0,0 +1,31 @@
+"""
+Roll new activity up into the daily analytics tables.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.rollups import reset_rollups, run_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Add enrollments, completions, reviews and sign-ups recorded since the "
+        "last run to the daily rollup tables. Run it periodically (e.g. cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop the rollups and recompute them from the full history.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            reset_rollups()
+            self.stdout.write("Rollups cleared.")
+
+        for source, rows in run_rollups().items():
+            self.stdout.write(f"{source}: {rows} new rows")
+
+        self.stdout.write(self.style.SUCCESS("Analytics rollups are up to date."))
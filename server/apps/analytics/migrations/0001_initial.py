@@ -0,0 +1,36 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:39
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_users', models.PositiveIntegerField(default=0)),
+                ('total_students', models.PositiveIntegerField(default=0)),
+                ('total_instructors', models.PositiveIntegerField(default=0)),
+                ('total_courses', models.PositiveIntegerField(default=0)),
+                ('published_courses', models.PositiveIntegerField(default=0)),
+                ('pending_courses', models.PositiveIntegerField(default=0)),
+                ('total_enrollments', models.PositiveIntegerField(default=0)),
+                ('pending_instructor_requests', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Platform Stats',
+                'verbose_name_plural': 'Platform Stats',
+                'db_table': 'platform_stats',
+            },
+        ),
+    ]
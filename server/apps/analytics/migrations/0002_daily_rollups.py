@@ -0,0 +1,68 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_search_index'),
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('new_users', models.PositiveIntegerField(default=0)),
+                ('enrollments', models.PositiveIntegerField(default=0)),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('reviews', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Platform Daily Stats',
+                'verbose_name_plural': 'Platform Daily Stats',
+                'db_table': 'platform_daily_stats',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, unique=True)),
+                ('position', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'rollup_watermarks',
+                'ordering': ['source'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('enrollments', models.PositiveIntegerField(default=0)),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('reviews', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_stats', to='courses.category')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='courses.course')),
+            ],
+            options={
+                'verbose_name': 'Course Daily Stats',
+                'verbose_name_plural': 'Course Daily Stats',
+                'db_table': 'course_daily_stats',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['category', 'date'], name='course_dail_categor_8f364e_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='coursedailystats',
+            constraint=models.UniqueConstraint(fields=('course', 'date'), name='unique_course_daily_stats'),
+        ),
+    ]
@@ -1,3 +1,207 @@
+"""
+Analytics models.
+"""
+
 from django.db import models
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+# Counter fields keyed by the User.role / Course.status value they count
+ROLE_COUNTERS = {"STUDENT": "total_students", "INSTRUCTOR": "total_instructors"}
+COURSE_STATUS_COUNTERS = {"PUBLISHED": "published_courses", "PENDING": "pending_courses"}
+
+
+class PlatformStatsManager(models.Manager):
+    """Manager for the single PlatformStats row."""
+
+    def load(self):
+        """Return the stats row, computing it on first use."""
+        stats = self.filter(pk=PlatformStats.SINGLETON_ID).first()
+        return stats or self.reconcile()
+
+    def shift(self, **deltas):
+        """Apply counter deltas with one UPDATE (e.g. shift(total_users=1))."""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        updated = self.filter(pk=PlatformStats.SINGLETON_ID).update(
+            updated_at=timezone.now(),
+            **{
+                field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+                for field, delta in deltas.items()
+            },
+        )
+        if not updated:
+            # No row yet: a full count already includes this change
+            self.reconcile()
+
+    def shift_role(self, old_role, new_role, count=1):
+        """Move `count` users between role counters."""
+        deltas = {}
+        if old_role in ROLE_COUNTERS:
+            deltas[ROLE_COUNTERS[old_role]] = -count
+        if new_role in ROLE_COUNTERS:
+            field = ROLE_COUNTERS[new_role]
+            deltas[field] = deltas.get(field, 0) + count
+        self.shift(**deltas)
+
+    def shift_course_status(self, old_status, new_status, count=1):
+        """Move `count` courses between status counters."""
+        deltas = {}
+        if old_status in COURSE_STATUS_COUNTERS:
+            deltas[COURSE_STATUS_COUNTERS[old_status]] = -count
+        if new_status in COURSE_STATUS_COUNTERS:
+            field = COURSE_STATUS_COUNTERS[new_status]
+            deltas[field] = deltas.get(field, 0) + count
+        self.shift(**deltas)
+
+    def reconcile(self):
+        """Recount every counter from the source tables."""
+        from apps.accounts.models import InstructorRequest, User
+        from apps.courses.models import Course
+        from apps.enrollments.models import Enrollment
+
+        roles = dict(
+            User.objects.order_by().values_list("role").annotate(total=Count("id"))
+        )
+        statuses = dict(
+            Course.objects.order_by().values_list("status").annotate(total=Count("id"))
+        )
+        now = timezone.now()
+        counters = {
+            "total_users": sum(roles.values()),
+            "total_courses": sum(statuses.values()),
+            "total_enrollments": Enrollment.objects.count(),
+            "pending_instructor_requests": InstructorRequest.objects.filter(
+                status="PENDING"
+            ).count(),
+            **{field: roles.get(role, 0) for role, field in ROLE_COUNTERS.items()},
+            **{
+                field: statuses.get(status, 0)
+                for status, field in COURSE_STATUS_COUNTERS.items()
+            },
+        }
+        stats, _ = self.update_or_create(
+            pk=PlatformStats.SINGLETON_ID,
+            defaults={**counters, "updated_at": now, "reconciled_at": now},
+        )
+        return stats
+
+
+class PlatformStats(models.Model):
+    """
+    Platform-wide counters for the admin dashboard, kept in a single row.
+    Maintained incrementally from signals and recounted by
+    `manage.py reconcile_platform_stats`.
+    """
+
+    SINGLETON_ID = 1
+
+    total_users = models.PositiveIntegerField(default=0)
+    total_students = models.PositiveIntegerField(default=0)
+    total_instructors = models.PositiveIntegerField(default=0)
+    total_courses = models.PositiveIntegerField(default=0)
+    published_courses = models.PositiveIntegerField(default=0)
+    pending_courses = models.PositiveIntegerField(default=0)
+    total_enrollments = models.PositiveIntegerField(default=0)
+    pending_instructor_requests = models.PositiveIntegerField(default=0)
+
+    # Freshness
+    updated_at = models.DateTimeField(default=timezone.now)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    objects = PlatformStatsManager()
+
+    COUNTER_FIELDS = (
+        "total_users",
+        "total_students",
+        "total_instructors",
+        "total_courses",
+        "published_courses",
+        "pending_courses",
+        "total_enrollments",
+        "pending_instructor_requests",
+    )
+
+    class Meta:
+        db_table = "platform_stats"
+        verbose_name = "Platform Stats"
+        verbose_name_plural = "Platform Stats"
+
+    def __str__(self):
+        return f"Platform stats (updated {self.updated_at:%Y-%m-%d %H:%M})"
+
+
+class CourseDailyStats(models.Model):
+    """
+    Daily enrollment, completion and review counts of one course, filled by
+    `manage.py rollup_analytics`. The category is copied from the course
+    when the row is created so category series need no join.
+    """
+
+    date = models.DateField()
+    course = models.ForeignKey(
+        "courses.Course", on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    category = models.ForeignKey(
+        "courses.Category",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="daily_stats",
+    )
+    enrollments = models.PositiveIntegerField(default=0)
+    completions = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "course_daily_stats"
+        verbose_name = "Course Daily Stats"
+        verbose_name_plural = "Course Daily Stats"
+        ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "date"], name="unique_course_daily_stats"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["category", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id} on {self.date}"
+
+
+class PlatformDailyStats(models.Model):
+    """Daily platform-wide counts, filled by `manage.py rollup_analytics`."""
+
+    date = models.DateField(unique=True)
+    new_users = models.PositiveIntegerField(default=0)
+    enrollments = models.PositiveIntegerField(default=0)
+    completions = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "platform_daily_stats"
+        verbose_name = "Platform Daily Stats"
+        verbose_name_plural = "Platform Daily Stats"
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"Platform stats on {self.date}"
+
+
+class RollupWatermark(models.Model):
+    """How far the daily rollups have consumed one source table."""
+
+    source = models.CharField(max_length=50, unique=True)
+    position = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "rollup_watermarks"
+        ordering = ["source"]
 
-# Create your models here.
+    def __str__(self):
+        return f"{self.source} up to {self.position:%Y-%m-%d %H:%M}"
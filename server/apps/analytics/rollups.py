@@ -0,0 +1,159 @@
+"""
+Incremental daily rollups of enrollments, completions, reviews and sign-ups.
+
+Each source table is consumed from a RollupWatermark: a run counts only the
+rows timestamped after the watermark and adds them to the daily rows, so the
+cost of a run depends on the new activity, not on the size of the tables.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import CourseDailyStats, PlatformDailyStats, RollupWatermark
+
+# source: (model label, timestamp field, counter field, counted per course)
+ROLLUP_SOURCES = {
+    "enrollments": ("enrollments.Enrollment", "enrolled_at", "enrollments", True),
+    "completions": ("enrollments.Enrollment", "completed_at", "completions", True),
+    "reviews": ("courses.Review", "created_at", "reviews", True),
+    "users": ("accounts.User", "date_joined", "new_users", False),
+}
+
+# Watermark of a source that was never rolled up
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+BATCH_SIZE = 500
+
+
+def rollup_cutoff():
+    """
+    Upper bound of a run. Rows are timestamped before their transaction
+    commits, so the most recent ones are left for the next run.
+    """
+    return timezone.now() - timedelta(seconds=settings.ANALYTICS_ROLLUP_LAG)
+
+
+def _batches(items):
+    items = list(items)
+    for start in range(0, len(items), BATCH_SIZE):
+        yield items[start:start + BATCH_SIZE]
+
+
+def _add_course_counts(counter, totals):
+    """Add {(course_id, date): (count, category_id)} to the course rows."""
+    for batch in _batches(sorted(totals, key=lambda key: (key[1], str(key[0])))):
+        existing = {
+            (stats.course_id, stats.date): stats
+            for stats in CourseDailyStats.objects.filter(
+                course_id__in={course_id for course_id, _ in batch},
+                date__in={date for _, date in batch},
+            )
+        }
+        changed, created = [], []
+        for key in batch:
+            count, category_id = totals[key]
+            stats = existing.get(key)
+            if stats:
+                setattr(stats, counter, getattr(stats, counter) + count)
+                changed.append(stats)
+            else:
+                course_id, date = key
+                created.append(
+                    CourseDailyStats(
+                        course_id=course_id,
+                        category_id=category_id,
+                        date=date,
+                        **{counter: count},
+                    )
+                )
+        CourseDailyStats.objects.bulk_update(changed, [counter])
+        CourseDailyStats.objects.bulk_create(created)
+
+
+def _add_platform_counts(counter, totals):
+    """Add {date: count} to the platform rows."""
+    existing = {
+        stats.date: stats
+        for stats in PlatformDailyStats.objects.filter(date__in=list(totals))
+    }
+    changed, created = [], []
+    for date, count in totals.items():
+        stats = existing.get(date)
+        if stats:
+            setattr(stats, counter, getattr(stats, counter) + count)
+            changed.append(stats)
+        else:
+            created.append(PlatformDailyStats(date=date, **{counter: count}))
+    PlatformDailyStats.objects.bulk_update(changed, [counter])
+    PlatformDailyStats.objects.bulk_create(created)
+
+
+def rollup_source(source, until):
+    """Roll up one source up to `until`; return the number of rows counted."""
+    label, timestamp, counter, per_course = ROLLUP_SOURCES[source]
+    model = apps.get_model(label)
+
+    with transaction.atomic():
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(
+            source=source, defaults={"position": EPOCH}
+        )
+        if until <= watermark.position:
+            return 0
+
+        rows = (
+            model.objects.order_by()
+            .filter(**{f"{timestamp}__gt": watermark.position, f"{timestamp}__lte": until})
+            .annotate(day=TruncDate(timestamp))
+        )
+        platform_totals = {}
+        if per_course:
+            course_totals = {}
+            for row in rows.values("course_id", "course__category_id", "day").annotate(
+                total=Count("pk")
+            ):
+                course_totals[(row["course_id"], row["day"])] = (
+                    row["total"],
+                    row["course__category_id"],
+                )
+                platform_totals[row["day"]] = (
+                    platform_totals.get(row["day"], 0) + row["total"]
+                )
+            _add_course_counts(counter, course_totals)
+        else:
+            platform_totals = dict(
+                rows.values_list("day").annotate(total=Count("pk"))
+            )
+        _add_platform_counts(counter, platform_totals)
+
+        watermark.position = until
+        watermark.save(update_fields=["position", "updated_at"])
+
+    return sum(platform_totals.values())
+
+
+def run_rollups(until=None):
+    """Roll up every source; return {source: rows counted}."""
+    until = until or rollup_cutoff()
+    return {source: rollup_source(source, until) for source in ROLLUP_SOURCES}
+
+
+def reset_rollups():
+    """Drop every rollup row and watermark so the next run starts over."""
+    with transaction.atomic():
+        CourseDailyStats.objects.all().delete()
+        PlatformDailyStats.objects.all().delete()
+        RollupWatermark.objects.all().delete()
+
+
+def rolled_up_until():
+    """Time up to which every source has been rolled up, if any."""
+    positions = list(RollupWatermark.objects.values_list("position", flat=True))
+    if len(positions) < len(ROLLUP_SOURCES):
+        return None
+    return min(positions)
@@ -0,0 +1,37 @@
+"""
+Serializers for analytics app.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from .services import GRANULARITIES
+
+
+class TimeseriesQuerySerializer(serializers.Serializer):
+    """Query parameters of the time-series endpoints."""
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    granularity = serializers.ChoiceField(choices=GRANULARITIES, default="day")
+    course = serializers.UUIDField(required=False)
+    category = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        """Default to the last 30 days and bound the range."""
+        end = attrs.get("end") or timezone.localdate()
+        start = attrs.get("start") or end - timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError({"start": "Start must not be after end."})
+        if (end - start).days >= settings.ANALYTICS_TIMESERIES_MAX_DAYS:
+            raise serializers.ValidationError(
+                {
+                    "start": "Date range must not exceed "
+                    f"{settings.ANALYTICS_TIMESERIES_MAX_DAYS} days."
+                }
+            )
+        attrs["start"], attrs["end"] = start, end
+        return attrs
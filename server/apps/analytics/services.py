@@ -0,0 +1,168 @@
+"""
+Analytics services.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import Trunc
+
+from apps.courses.models import Course, CourseStatus
+from config.cache import bump_version_on_commit, get_cache, get_version
+from config.routers import primary_reads
+
+TWO_PLACES = Decimal("0.01")
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def instructor_namespace(instructor_id):
+    return f"instructor:{instructor_id}:analytics"
+
+
+def invalidate_instructor_analytics(instructor_id):
+    """Invalidate an instructor's cached dashboard after commit."""
+    if instructor_id:
+        bump_version_on_commit(instructor_namespace(instructor_id))
+
+
+def invalidate_course_analytics(course_id):
+    """Invalidate the dashboard of the instructor owning a course."""
+    instructor_id = (
+        Course.objects.filter(pk=course_id).values_list("instructor_id", flat=True).first()
+    )
+    invalidate_instructor_analytics(instructor_id)
+
+
+def _rate(part, whole):
+    if not whole:
+        return Decimal("0.00")
+    return (Decimal(part) * 100 / whole).quantize(TWO_PLACES)
+
+
+def build_instructor_analytics(instructor):
+    """
+    Compute an instructor dashboard with a single grouped query: one row per
+    course with its enrollment and completion counts. Totals are summed from
+    those rows.
+    """
+    rows = list(
+        Course.objects.filter(instructor=instructor)
+        .order_by("-created_at")
+        .values("id", "title", "status", "price", "average_rating", "total_reviews")
+        .annotate(
+            enrolled=Count("enrollments"),
+            completed=Count(
+                "enrollments", filter=Q(enrollments__completed_at__isnull=False)
+            ),
+        )
+    )
+
+    courses = [
+        {
+            "id": str(row["id"]),
+            "title": row["title"],
+            "status": row["status"],
+            "price": row["price"],
+            "enrollments": row["enrolled"],
+            "completed_enrollments": row["completed"],
+            "completion_rate": _rate(row["completed"], row["enrolled"]),
+            "average_rating": row["average_rating"],
+            "total_reviews": row["total_reviews"],
+            "revenue": row["price"] * row["enrolled"],
+        }
+        for row in rows
+    ]
+
+    total_enrollments = sum(course["enrollments"] for course in courses)
+    completed = sum(course["completed_enrollments"] for course in courses)
+    average_rating = (
+        (sum(course["average_rating"] for course in courses) / len(courses)).quantize(
+            TWO_PLACES
+        )
+        if courses
+        else 0
+    )
+
+    return {
+        "total_courses": len(courses),
+        "published_courses": sum(
+            course["status"] == CourseStatus.PUBLISHED for course in courses
+        ),
+        "total_enrollments": total_enrollments,
+        "completed_enrollments": completed,
+        "completion_rate": _rate(completed, total_enrollments),
+        "average_rating": average_rating,
+        "total_reviews": sum(course["total_reviews"] for course in courses),
+        "total_revenue": sum((course["revenue"] for course in courses), Decimal("0.00")),
+        "courses": courses,
+    }
+
+
+def get_instructor_analytics(instructor):
+    """Return the instructor dashboard, cached until their data changes."""
+    namespace = instructor_namespace(instructor.pk)
+    key = f"{namespace}:{get_version(namespace)}"
+
+    cache = get_cache()
+    stats = cache.get(key)
+    if stats is None:
+        # A lagging replica could cache stale stats under the new version
+        with primary_reads():
+            stats = build_instructor_analytics(instructor)
+        cache.set(key, stats, settings.INSTRUCTOR_ANALYTICS_CACHE_TIMEOUT)
+    return stats
+
+
+def period_start(date, granularity):
+    """First day of the day, week (Monday) or month containing `date`."""
+    if granularity == "week":
+        return date - timedelta(days=date.weekday())
+    if granularity == "month":
+        return date.replace(day=1)
+    return date
+
+
+def _periods(start, end, granularity):
+    period = period_start(start, granularity)
+    while period <= end:
+        yield period
+        if granularity == "month":
+            period = (period.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            period += timedelta(days=7 if granularity == "week" else 1)
+
+
+def build_timeseries(queryset, fields, start, end, granularity):
+    """
+    Sum daily rollup rows (CourseDailyStats or PlatformDailyStats) into one
+    entry per day, week or month between `start` and `end`; periods without
+    activity are reported as zeros.
+    """
+    rows = (
+        queryset.filter(date__range=(start, end))
+        .annotate(period=Trunc("date", granularity, output_field=DateField()))
+        .order_by("period")
+        .values("period")
+        .annotate(**{f"total_{field}": Sum(field) for field in fields})
+    )
+    totals = {row["period"]: row for row in rows}
+
+    series = []
+    for period in _periods(start, end, granularity):
+        row = totals.get(period, {})
+        series.append(
+            {
+                "period": period,
+                **{field: row.get(f"total_{field}") or 0 for field in fields},
+            }
+        )
+    return {
+        "start": start,
+        "end": end,
+        "granularity": granularity,
+        "totals": {field: sum(entry[field] for entry in series) for field in fields},
+        "series": series,
+    }
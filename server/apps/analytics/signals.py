@@ -0,0 +1,122 @@
+"""
+Signals for analytics app.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import PlatformStats
+from .services import invalidate_course_analytics, invalidate_instructor_analytics
+
+
+def _previous_value(sender, instance, field, raw):
+    """Current database value of a field, before an update is saved."""
+    if raw or instance._state.adding:
+        return None
+    return sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+
+@receiver(pre_save, sender="accounts.User")
+def user_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember the stored role so a role change can be counted."""
+    instance._previous_role = None
+    if update_fields is None or "role" in update_fields:
+        instance._previous_role = _previous_value(sender, instance, "role", raw)
+
+
+@receiver(post_save, sender="accounts.User")
+def user_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        PlatformStats.objects.shift(total_users=1)
+        PlatformStats.objects.shift_role(None, instance.role)
+        return
+
+    previous_role = getattr(instance, "_previous_role", None)
+    if previous_role and previous_role != instance.role:
+        PlatformStats.objects.shift_role(previous_role, instance.role)
+
+
+@receiver(post_delete, sender="accounts.User")
+def user_post_delete(sender, instance, **kwargs):
+    PlatformStats.objects.shift(total_users=-1)
+    PlatformStats.objects.shift_role(instance.role, None)
+
+
+@receiver(pre_save, sender="courses.Course")
+def course_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember the stored status so a status change can be counted."""
+    instance._previous_status = None
+    if update_fields is None or "status" in update_fields:
+        instance._previous_status = _previous_value(sender, instance, "status", raw)
+
+
+@receiver(post_save, sender="courses.Course")
+def course_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_instructor_analytics(instance.instructor_id)
+    if created:
+        PlatformStats.objects.shift(total_courses=1)
+        PlatformStats.objects.shift_course_status(None, instance.status)
+        return
+
+    previous_status = getattr(instance, "_previous_status", None)
+    if previous_status and previous_status != instance.status:
+        PlatformStats.objects.shift_course_status(previous_status, instance.status)
+
+
+@receiver(post_delete, sender="courses.Course")
+def course_post_delete(sender, instance, **kwargs):
+    invalidate_instructor_analytics(instance.instructor_id)
+    PlatformStats.objects.shift(total_courses=-1)
+    PlatformStats.objects.shift_course_status(instance.status, None)
+
+
+@receiver(post_save, sender="enrollments.Enrollment")
+def enrollment_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        PlatformStats.objects.shift(total_enrollments=1)
+    # Enrollment and completion counts are part of the instructor dashboard
+    invalidate_course_analytics(instance.course_id)
+
+
+@receiver(post_delete, sender="enrollments.Enrollment")
+def enrollment_post_delete(sender, instance, **kwargs):
+    PlatformStats.objects.shift(total_enrollments=-1)
+    invalidate_course_analytics(instance.course_id)
+
+
+@receiver([post_save, post_delete], sender="courses.Review")
+def review_changed(sender, instance, **kwargs):
+    """Ratings are part of the instructor dashboard."""
+    invalidate_course_analytics(instance.course_id)
+
+
+@receiver(pre_save, sender="accounts.InstructorRequest")
+def instructor_request_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember the stored status so leaving PENDING can be counted."""
+    instance._previous_status = None
+    if update_fields is None or "status" in update_fields:
+        instance._previous_status = _previous_value(sender, instance, "status", raw)
+
+
+@receiver(post_save, sender="accounts.InstructorRequest")
+def instructor_request_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    was_pending = (
+        not created and getattr(instance, "_previous_status", None) == "PENDING"
+    )
+    is_pending = instance.status == "PENDING"
+    if was_pending != is_pending:
+        PlatformStats.objects.shift(pending_instructor_requests=1 if is_pending else -1)
+
+
+@receiver(post_delete, sender="accounts.InstructorRequest")
+def instructor_request_post_delete(sender, instance, **kwargs):
+    if instance.status == "PENDING":
+        PlatformStats.objects.shift(pending_instructor_requests=-1)
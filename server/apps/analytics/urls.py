@@ -1,7 +1,22 @@
 from django.urls import path
-from .views import InstructorAnalyticsView, AdminAnalyticsView
+from .views import (
+    InstructorAnalyticsView,
+    AdminAnalyticsView,
+    InstructorTimeseriesView,
+    AdminTimeseriesView,
+)
 
 urlpatterns = [
     path('instructor/', InstructorAnalyticsView.as_view(), name='instructor-analytics'),
+    path(
+        'instructor/timeseries/',
+        InstructorTimeseriesView.as_view(),
+        name='instructor-analytics-timeseries',
+    ),
     path('admin/', AdminAnalyticsView.as_view(), name='admin-analytics'),
+    path(
+        'admin/timeseries/',
+        AdminTimeseriesView.as_view(),
+        name='admin-analytics-timeseries',
+    ),
 ]
@@ -1,26 +1,20 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.db.models import Avg, Sum
 from apps.accounts.permissions import IsInstructor, IsAdmin
-from apps.courses.models import Course
-from apps.enrollments.models import Enrollment
+from .models import CourseDailyStats, PlatformDailyStats, PlatformStats
+from .rollups import rolled_up_until
+from .serializers import TimeseriesQuerySerializer
+from .services import build_timeseries, get_instructor_analytics
+
+COURSE_SERIES_FIELDS = ("enrollments", "completions", "reviews")
+PLATFORM_SERIES_FIELDS = ("new_users",) + COURSE_SERIES_FIELDS
 
 
 class InstructorAnalyticsView(APIView):
     permission_classes = [IsInstructor]
 
     def get(self, request):
-        courses = Course.objects.filter(instructor=request.user)
-
-        stats = {
-            "total_courses": courses.count(),
-            "published_courses": courses.filter(status="PUBLISHED").count(),
-            "total_enrollments": Enrollment.objects.filter(
-                course__instructor=request.user
-            ).count(),
-            "average_rating": courses.aggregate(avg=Avg("average_rating"))["avg"] or 0,
-            "total_reviews": courses.aggregate(sum=Sum("total_reviews"))["sum"] or 0,
-        }
+        stats = get_instructor_analytics(request.user)
 
         return Response({"success": True, "data": stats})
 
@@ -29,19 +23,67 @@ class AdminAnalyticsView(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        from apps.accounts.models import User, InstructorRequest
+        platform_stats = PlatformStats.objects.load()
 
         stats = {
-            "total_users": User.objects.count(),
-            "total_students": User.objects.filter(role="STUDENT").count(),
-            "total_instructors": User.objects.filter(role="INSTRUCTOR").count(),
-            "total_courses": Course.objects.count(),
-            "published_courses": Course.objects.filter(status="PUBLISHED").count(),
-            "pending_courses": Course.objects.filter(status="PENDING").count(),
-            "total_enrollments": Enrollment.objects.count(),
-            "pending_instructor_requests": InstructorRequest.objects.filter(
-                status="PENDING"
-            ).count(),
+            field: getattr(platform_stats, field)
+            for field in PlatformStats.COUNTER_FIELDS
         }
+        # Counters are maintained incrementally; report how fresh they are
+        stats["updated_at"] = platform_stats.updated_at
+        stats["reconciled_at"] = platform_stats.reconciled_at
 
         return Response({"success": True, "data": stats})
+
+
+class TimeseriesView(APIView):
+    """Base view for time series served from the daily rollup tables."""
+
+    def get_series(self, request, params):
+        """Return (rollup queryset, fields) for the validated params."""
+        raise NotImplementedError
+
+    def get(self, request):
+        serializer = TimeseriesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        queryset, fields = self.get_series(request, params)
+        data = build_timeseries(
+            queryset, fields, params["start"], params["end"], params["granularity"]
+        )
+        # Rollups lag behind live data; report how far they go
+        data["rolled_up_until"] = rolled_up_until()
+
+        return Response({"success": True, "data": data})
+
+
+class InstructorTimeseriesView(TimeseriesView):
+    """Daily, weekly or monthly activity across the instructor's courses."""
+
+    permission_classes = [IsInstructor]
+
+    def get_series(self, request, params):
+        queryset = CourseDailyStats.objects.filter(course__instructor=request.user)
+        if params.get("course"):
+            queryset = queryset.filter(course_id=params["course"])
+        if params.get("category"):
+            queryset = queryset.filter(category_id=params["category"])
+        return queryset, COURSE_SERIES_FIELDS
+
+
+class AdminTimeseriesView(TimeseriesView):
+    """Platform activity, optionally narrowed to a course or category."""
+
+    permission_classes = [IsAdmin]
+
+    def get_series(self, request, params):
+        if not (params.get("course") or params.get("category")):
+            return PlatformDailyStats.objects.all(), PLATFORM_SERIES_FIELDS
+
+        queryset = CourseDailyStats.objects.all()
+        if params.get("course"):
+            queryset = queryset.filter(course_id=params["course"])
+        if params.get("category"):
+            queryset = queryset.filter(category_id=params["category"])
+        return queryset, COURSE_SERIES_FIELDS
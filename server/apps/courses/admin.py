@@ -5,6 +5,8 @@ Django admin for courses app.
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
+from apps.analytics.models import PlatformStats
+from .cache import invalidate_course
 from .models import Category, Course, Section, Lesson, Review, CourseStatus
 
 
@@ -81,7 +83,11 @@ class CourseAdmin(admin.ModelAdmin):
         "available_seats",
         "average_rating",
         "total_reviews",
+        "rating_distribution",
         "total_classes_display",
+        "section_count",
+        "lesson_count",
+        "total_video_duration",
         "created_at",
         "updated_at",
         "published_at",
@@ -146,7 +152,16 @@ class CourseAdmin(admin.ModelAdmin):
         ),
         (
             "Statistics",
-            {"fields": ("average_rating", "total_reviews")},
+            {
+                "fields": (
+                    "average_rating",
+                    "total_reviews",
+                    "rating_distribution",
+                    "section_count",
+                    "lesson_count",
+                    "total_video_duration",
+                )
+            },
         ),
         ("Timestamps", {"fields": ("created_at", "updated_at", "published_at")}),
     )
@@ -162,7 +177,7 @@ class CourseAdmin(admin.ModelAdmin):
         return format_html('{} <span style="color: #999;">classes</span>', count)
 
     total_classes.short_description = "Total Classes" # type: ignore
-    total_classes.admin_order_field = "sections__count"  # type: ignore
+    total_classes.admin_order_field = "section_count"  # type: ignore
 
     def total_classes_display(self, obj):
         count = obj.total_classes
@@ -229,11 +244,18 @@ class CourseAdmin(admin.ModelAdmin):
     ]
 
     def approve_courses(self, request, queryset):
-        count = queryset.filter(status=CourseStatus.PENDING).update(
+        pending = queryset.filter(status=CourseStatus.PENDING)
+        course_ids = list(pending.values_list("id", flat=True))
+        count = pending.update(
             status=CourseStatus.APPROVED,
             reviewed_by=request.user,
             reviewed_at=timezone.now(),
         )
+        PlatformStats.objects.shift_course_status(
+            CourseStatus.PENDING, CourseStatus.APPROVED, count
+        )
+        for course_id in course_ids:
+            invalidate_course(course_id)
         self.message_user(request, f"{count} course(s) approved.")
 
     approve_courses.short_description = "✅ Approve selected courses" # type: ignore
@@ -253,11 +275,18 @@ class CourseAdmin(admin.ModelAdmin):
     publish_courses.short_description = "📢 Publish selected courses" # type: ignore
 
     def reject_courses(self, request, queryset):
-        count = queryset.filter(status=CourseStatus.PENDING).update(
+        pending = queryset.filter(status=CourseStatus.PENDING)
+        course_ids = list(pending.values_list("id", flat=True))
+        count = pending.update(
             status=CourseStatus.REJECTED,
             reviewed_by=request.user,
             reviewed_at=timezone.now(),
         )
+        PlatformStats.objects.shift_course_status(
+            CourseStatus.PENDING, CourseStatus.REJECTED, count
+        )
+        for course_id in course_ids:
+            invalidate_course(course_id)
         self.message_user(request, f"{count} course(s) rejected.")
 
     reject_courses.short_description = "❌ Reject selected courses" # type: ignore
@@ -0,0 +1,45 @@
+"""
+Seed data for course benchmark commands.
+"""
+
+from apps.accounts.models import User, UserRole
+from .models import Category, Course, CourseStatus
+
+WORDS = (
+    "python web design data science photography marketing finance music "
+    "writing cooking fitness language history physics drawing business"
+).split()
+
+
+def seed_courses(total, start=0):
+    """Bulk-create `total` published courses with varied titles."""
+    instructor, _ = User.objects.get_or_create(
+        email="benchmark-instructor@example.com",
+        defaults={
+            "first_name": "Bench",
+            "last_name": "Mark",
+            "role": UserRole.INSTRUCTOR,
+        },
+    )
+    category, _ = Category.objects.get_or_create(
+        slug="benchmark", defaults={"name": "Benchmark"}
+    )
+    return Course.objects.bulk_create(
+        (
+            Course(
+                title=f"{WORDS[index % len(WORDS)].title()} course {index}",
+                slug=f"course-{index}",
+                description=" ".join(
+                    WORDS[(index * step) % len(WORDS)] for step in range(1, 8)
+                ),
+                short_description="Benchmark course",
+                learning_outcomes="Benchmarking",
+                instructor=instructor,
+                category=category,
+                price=index % 100,
+                status=CourseStatus.PUBLISHED,
+            )
+            for index in range(start, start + total)
+        ),
+        batch_size=1000,
+    )
@@ -0,0 +1,82 @@
+"""
+Cache layer for course detail payloads.
+
+The user-independent part of CourseDetailSerializer output is cached under a
+per-course version key; the version is bumped from signals whenever the
+course, its structure, its reviews or its enrollments change. Versions live
+in the API cache, so deployments with several worker processes need a shared
+cache backend: with the default LocMem cache a bump only reaches the process
+that made it, and the others keep serving stale payloads and ETags.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import prefetch_related_objects
+from django.utils.http import parse_etags, quote_etag
+
+from config.cache import bump_version_on_commit, get_cache, get_version
+from config.routers import primary_reads
+
+
+def course_namespace(course_id):
+    return f"course:{course_id}"
+
+
+def invalidate_course(course_id):
+    """Invalidate the cached payloads of a course after commit."""
+    bump_version_on_commit(course_namespace(course_id))
+
+
+def course_version(course_id):
+    """Current cache version of a course; it changes with every invalidation."""
+    return get_version(course_namespace(course_id))
+
+
+def get_course_detail_payload(course, request, version):
+    """
+    Return the course detail payload cached under `version`.
+    The payload excludes the per-user `is_enrolled` flag.
+    """
+    from .serializers import CourseDetailSerializer
+
+    # Absolute media URLs depend on the requested host
+    key = f"{course_namespace(course.pk)}:detail:{version}:{request.build_absolute_uri('/')}"
+
+    cache = get_cache()
+    payload = cache.get(key)
+    if payload is None:
+        # A lagging replica could cache a stale payload under the new version
+        with primary_reads():
+            if course._state.db != DEFAULT_DB_ALIAS:
+                course.refresh_from_db(using=DEFAULT_DB_ALIAS)
+            prefetch_related_objects([course], "sections__lessons")
+            payload = dict(
+                CourseDetailSerializer(course, context={"request": request}).data
+            )
+        payload.pop("is_enrolled", None)
+        cache.set(key, payload, settings.COURSE_DETAIL_CACHE_TIMEOUT)
+
+    return payload
+
+
+def course_etag(course_id, version, is_enrolled, base_url):
+    """
+    Build the ETag of a course detail response. Like the payload key, it
+    includes the requested host (`base_url`): the media URLs differ per host.
+    """
+    digest = hashlib.md5(
+        f"{course_id}:{version}:{int(is_enrolled)}:{base_url}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return quote_etag(digest)
+
+
+def etag_matches(request, etag):
+    """Check the If-None-Match request header against an ETag."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = [tag.removeprefix("W/") for tag in parse_etags(header)]
+    return "*" in etags or etag in etags
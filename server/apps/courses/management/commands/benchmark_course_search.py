@@ -0,0 +1,52 @@
+"""
+Benchmark course search latency as the catalog grows.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.courses.benchmarking import seed_courses
+from apps.courses.models import Course
+from apps.courses.search import DatabaseSearchBackend, get_search_backend
+from config.benchmarking import benchmark_database, time_call
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed an isolated database with growing catalogs and compare the "
+        "configured search backend with plain icontains matching."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,50000",
+            help="Comma-separated catalog sizes.",
+        )
+        parser.add_argument("--query", default="pyth")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        backends = [get_search_backend(), DatabaseSearchBackend()]
+
+        with benchmark_database():
+            seeded = 0
+            for size in sizes:
+                seed_courses(size - seeded, start=seeded)
+                seeded = size
+                backends[0].rebuild()
+
+                for backend in backends:
+                    median = time_call(
+                        lambda: self._first_page(backend, options["query"]),
+                        options["repeat"],
+                    )
+                    self.stdout.write(
+                        f"{size:>8} courses  {type(backend).__name__:<24} {median:8.2f} ms"
+                    )
+        self.stdout.write(self.style.SUCCESS("Search benchmark finished."))
+
+    @staticmethod
+    def _first_page(backend, query):
+        queryset = backend.search(Course.objects.all(), query)
+        return list(queryset.order_by("search_rank", "-created_at")[:10])
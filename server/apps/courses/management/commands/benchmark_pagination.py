@@ -0,0 +1,74 @@
+"""
+Benchmark page-number vs keyset pagination of the course catalog.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from apps.courses.benchmarking import seed_courses
+from config.benchmarking import benchmark_database, time_call
+
+CATALOG_URL = "/api/v1/courses/courses/"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed an isolated database with courses and compare page 1 vs a deep "
+        "page of the catalog in page-number and cursor pagination modes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=10_050)
+        parser.add_argument("--page", type=int, default=1000)
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self._seed(options["courses"])
+            self._run(options["page"], options["page_size"], options["repeat"])
+
+    def _seed(self, total):
+        seed_courses(total)
+        self.stdout.write(f"Seeded {total} published courses.")
+
+    def _run(self, page, page_size, repeat):
+        client = Client()
+
+        def fetch(params):
+            response = client.get(CATALOG_URL, params, secure=True)
+            if response.status_code != 200:
+                raise CommandError(f"Catalog returned HTTP {response.status_code}.")
+            return response.json()
+
+        base = {"page_size": page_size}
+        results = {
+            "page-number, page 1": time_call(lambda: fetch({**base, "page": 1}), repeat),
+            f"page-number, page {page}": time_call(
+                lambda: fetch({**base, "page": page}), repeat
+            ),
+            "cursor, page 1": time_call(
+                lambda: fetch({**base, "pagination": "cursor"}), repeat
+            ),
+        }
+
+        # Walk the cursor links (untimed) to reach the deep page
+        cursor_params = {**base, "pagination": "cursor"}
+        next_url = None
+        for _ in range(page - 1):
+            body = client.get(next_url, secure=True).json() if next_url else fetch(
+                cursor_params
+            )
+            next_url = body["next"]
+            if next_url is None:
+                break
+        if next_url:
+            results[f"cursor, page {page}"] = time_call(
+                lambda: client.get(next_url, secure=True), repeat
+            )
+        else:
+            self.stdout.write(self.style.WARNING("Not enough courses for the deep page."))
+
+        for label, median in results.items():
+            self.stdout.write(f"{label:<28} {median:8.2f} ms")
+        self.stdout.write(self.style.SUCCESS("Pagination benchmark finished."))
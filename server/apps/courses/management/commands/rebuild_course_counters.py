@@ -0,0 +1,29 @@
+"""
+Rebuild the denormalized course structure counters.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.courses.models import Course
+
+
+class Command(BaseCommand):
+    help = "Recompute section, lesson and video duration counters for courses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            action="append",
+            dest="courses",
+            help="Only rebuild the given course ID (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Course.objects.all()
+        if options["courses"]:
+            queryset = queryset.filter(id__in=options["courses"])
+
+        updated = queryset.rebuild_structure_counters()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt structure counters for {updated} course(s).")
+        )
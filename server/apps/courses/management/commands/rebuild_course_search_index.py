@@ -0,0 +1,22 @@
+"""
+Rebuild the course full-text search index.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.courses.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Repopulate the course search index from the courses table."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            indexed = backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {indexed} course(s) with {type(backend).__name__}."
+            )
+        )
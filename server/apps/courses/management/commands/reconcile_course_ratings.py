@@ -0,0 +1,30 @@
+"""
+Reconcile the incremental course rating counters.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.courses.models import Course
+
+
+class Command(BaseCommand):
+    help = "Recompute rating sum, histogram and average rating for courses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            action="append",
+            dest="courses",
+            help="Only reconcile the given course ID (can be repeated).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Course.objects.all()
+        if options["courses"]:
+            queryset = queryset.filter(id__in=options["courses"])
+
+        updated = queryset.rebuild_rating_counters(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled rating counters for {updated} course(s).")
+        )
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def rebuild_structure_counters(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Section = apps.get_model("courses", "Section")
+    Lesson = apps.get_model("courses", "Lesson")
+
+    sections = (
+        Section.objects.filter(course=OuterRef("pk"))
+        .order_by()
+        .values("course")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    lessons = (
+        Lesson.objects.filter(section__course=OuterRef("pk"))
+        .order_by()
+        .values("section__course")
+        .annotate(total=Count("id"), duration=Sum("video_duration"))
+    )
+    Course.objects.update(
+        section_count=Coalesce(Subquery(sections), 0),
+        lesson_count=Coalesce(Subquery(lessons.values("total")), 0),
+        total_video_duration=Coalesce(Subquery(lessons.values("duration")), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_admission_deadline_course_available_seats_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='lesson_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='section_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='total_video_duration',
+            field=models.PositiveIntegerField(default=0, help_text='Total video duration in seconds'),
+        ),
+        migrations.RunPython(rebuild_structure_counters, migrations.RunPython.noop),
+    ]
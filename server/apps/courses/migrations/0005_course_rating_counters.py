@@ -0,0 +1,83 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:20
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def rebuild_rating_counters(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Review = apps.get_model("courses", "Review")
+
+    stats = (
+        Review.objects.order_by()
+        .values("course")
+        .annotate(
+            total=Count("id"),
+            rating_sum=Sum("rating"),
+            **{
+                f"rating_{star}_count": Count("id", filter=Q(rating=star))
+                for star in range(1, 6)
+            },
+        )
+    )
+    courses = []
+    for row in stats:
+        course = Course(pk=row.pop("course"))
+        course.total_reviews = row.pop("total")
+        course.rating_sum = row.pop("rating_sum") or 0
+        course.average_rating = round(
+            Decimal(course.rating_sum) / course.total_reviews, 2
+        )
+        for field, value in row.items():
+            setattr(course, field, value)
+        courses.append(course)
+
+    Course.objects.bulk_update(
+        courses,
+        ["total_reviews", "rating_sum", "average_rating"]
+        + [f"rating_{star}_count" for star in range(1, 6)],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_structure_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(rebuild_rating_counters, migrations.RunPython.noop),
+    ]
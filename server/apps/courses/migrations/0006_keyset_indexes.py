@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_course_rating_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['-created_at', '-id'], name='courses_created_83102c_idx'),
+        ),
+    ]
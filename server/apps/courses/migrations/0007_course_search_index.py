@@ -0,0 +1,60 @@
+import uuid
+
+from django.db import migrations
+
+SEARCH_TABLE = "courses_search_index"
+
+
+def create_search_index(apps, schema_editor):
+    """Create and fill the FTS5 index; other databases need no schema."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "course_id UNINDEXED, title, short_description, description, "
+        "instructor_first_name, instructor_last_name, venue, schedule, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+    Course = apps.get_model("courses", "Course")
+    rows = []
+    for course_id, *values in Course.objects.values_list(
+        "id",
+        "title",
+        "short_description",
+        "description",
+        "instructor__first_name",
+        "instructor__last_name",
+        "venue",
+        "schedule",
+    ).iterator():
+        course_id = uuid.UUID(str(course_id))
+        # Same rowid scheme as SQLiteFTSSearchBackend.rowid()
+        rowid = course_id.int & ((1 << 63) - 1)
+        rows.append((rowid, course_id.hex, *[value or "" for value in values]))
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, course_id, title, short_description, "
+            "description, instructor_first_name, instructor_last_name, venue, schedule) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_keyset_indexes'),
+        ('accounts', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -2,12 +2,17 @@
 Course models with approval workflow.
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Coalesce, Greatest, Least, NullIf, Round
 from django.utils import timezone
 from apps.accounts.models import User
+from decimal import Decimal
+from .cache import invalidate_course
 import uuid
 
+RATING_STARS = range(1, 6)
+
 
 class CourseStatus(models.TextChoices):
     """Course status choices."""
@@ -49,6 +54,150 @@ class Category(models.Model):
         return self.name
 
 
+class CourseQuerySet(models.QuerySet):
+    """Custom queryset for courses."""
+
+    def for_catalog(self):
+        """
+        Lightweight queryset for catalog listings.
+        Structure counts are read from the denormalized counters, so the
+        sections and lessons are never loaded.
+        """
+        return self.select_related("instructor", "category")
+
+    def shift_structure_counters(self, sections=0, lessons=0, video_duration=0):
+        """Atomically adjust the structure counters by the given deltas."""
+        changes = {}
+        for field, delta in (
+            ("section_count", sections),
+            ("lesson_count", lessons),
+            ("total_video_duration", video_duration),
+        ):
+            if delta > 0:
+                changes[field] = models.F(field) + delta
+            elif delta < 0:
+                changes[field] = Greatest(models.F(field) + delta, 0)
+
+        if not changes:
+            return 0
+        return self.update(**changes)
+
+    def rebuild_structure_counters(self):
+        """
+        Recompute the structure counters from the section and lesson tables
+        and invalidate the cached payloads of the courses.
+        """
+        sections = (
+            Section.objects.filter(course=models.OuterRef("pk"))
+            .order_by()
+            .values("course")
+            .annotate(total=models.Count("id"))
+            .values("total")
+        )
+        lessons = (
+            Lesson.objects.filter(section__course=models.OuterRef("pk"))
+            .order_by()
+            .values("section__course")
+            .annotate(
+                total=models.Count("id"), duration=models.Sum("video_duration")
+            )
+        )
+        with transaction.atomic():
+            updated = self.update(
+                section_count=Coalesce(models.Subquery(sections), 0),
+                lesson_count=Coalesce(models.Subquery(lessons.values("total")), 0),
+                total_video_duration=Coalesce(
+                    models.Subquery(lessons.values("duration")), 0
+                ),
+            )
+            # The UPDATE bypasses the signals that invalidate the payloads
+            for course_id in self.values_list("pk", flat=True).iterator():
+                invalidate_course(course_id)
+        return updated
+
+
+    def shift_rating(self, added=None, removed=None):
+        """
+        Atomically apply a rating change to the rating counters.
+        `added` is a new rating value, `removed` is a rating that no longer
+        counts (pass both for an edited review).
+        """
+        count_delta = (added is not None) - (removed is not None)
+        sum_delta = (added or 0) - (removed or 0)
+
+        changes = {}
+        if added != removed:
+            if added:
+                field = f"rating_{added}_count"
+                changes[field] = models.F(field) + 1
+            if removed:
+                field = f"rating_{removed}_count"
+                changes[field] = Greatest(models.F(field) - 1, 0)
+
+        # Right-hand side columns refer to the pre-update values
+        new_sum = Greatest(models.F("rating_sum") + sum_delta, 0)
+        new_total = Greatest(models.F("total_reviews") + count_delta, 0)
+        average = models.ExpressionWrapper(
+            new_sum * 1.0 / NullIf(new_total, 0),
+            output_field=models.DecimalField(max_digits=3, decimal_places=2),
+        )
+        changes.update(
+            rating_sum=new_sum,
+            total_reviews=new_total,
+            average_rating=Coalesce(
+                Round(average, 2),
+                0,
+                output_field=models.DecimalField(max_digits=3, decimal_places=2),
+            ),
+        )
+        return self.update(**changes)
+
+    def rebuild_rating_counters(self, batch_size=500):
+        """
+        Recompute rating counters from the review table in bulk and
+        invalidate the cached payloads of the courses.
+        """
+        stats = (
+            Review.objects.filter(course__in=self.values("pk"))
+            .order_by()
+            .values("course")
+            .annotate(
+                total=models.Count("id"),
+                rating_sum=models.Sum("rating"),
+                **{
+                    f"rating_{star}_count": models.Count(
+                        "id", filter=models.Q(rating=star)
+                    )
+                    for star in RATING_STARS
+                },
+            )
+        )
+        by_course = {row.pop("course"): row for row in stats}
+
+        fields = ["total_reviews", "rating_sum", "average_rating"] + [
+            f"rating_{star}_count" for star in RATING_STARS
+        ]
+        courses = []
+        for course in self.only("pk").iterator():
+            row = by_course.get(course.pk, {})
+            course.total_reviews = row.get("total", 0)
+            course.rating_sum = row.get("rating_sum") or 0
+            course.average_rating = (
+                round(Decimal(course.rating_sum) / course.total_reviews, 2)
+                if course.total_reviews
+                else Decimal("0")
+            )
+            for star in RATING_STARS:
+                setattr(course, f"rating_{star}_count", row.get(f"rating_{star}_count", 0))
+            courses.append(course)
+
+        with transaction.atomic():
+            Course.objects.bulk_update(courses, fields, batch_size=batch_size)
+            for course in courses:
+                invalidate_course(course.pk)
+        return len(courses)
+
+
 class Course(models.Model):
     """Course model with approval workflow."""
 
@@ -161,12 +310,27 @@ class Course(models.Model):
         validators=[MinValueValidator(0), MaxValueValidator(5)],
     )
     total_reviews = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+
+    # Structure counters (maintained from Section/Lesson signals)
+    section_count = models.PositiveIntegerField(default=0)
+    lesson_count = models.PositiveIntegerField(default=0)
+    total_video_duration = models.PositiveIntegerField(
+        default=0, help_text="Total video duration in seconds"
+    )
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
 
+    objects = CourseQuerySet.as_manager()
+
     class Meta:
         db_table = "courses"
         verbose_name = "Course"
@@ -180,11 +344,31 @@ class Course(models.Model):
             models.Index(fields=["-average_rating"]),
             models.Index(fields=["class_starts"]),
             models.Index(fields=["admission_deadline"]),
+            models.Index(fields=["-created_at", "-id"]),
         ]
 
     def __str__(self):
         return self.title
 
+    # Counters maintained with F() updates; full saves must not overwrite them
+    # with possibly stale in-memory values. A full save only writes the ones
+    # changed on the instance, e.g. seats reset by an admin.
+    COUNTER_FIELDS = (
+        "available_seats",
+        "enrollment_count",
+        "section_count",
+        "lesson_count",
+        "total_video_duration",
+        "average_rating",
+        "total_reviews",
+        "rating_sum",
+        "rating_1_count",
+        "rating_2_count",
+        "rating_3_count",
+        "rating_4_count",
+        "rating_5_count",
+    )
+
     def save(self, *args, **kwargs):
         """Auto-set is_free based on price and ensure available_seats doesn't exceed total_seats."""
         self.is_free = self.price == 0
@@ -196,8 +380,42 @@ class Course(models.Model):
         # Ensure enrollment_count doesn't exceed total_seats
         if self.enrollment_count > self.total_seats:
             self.enrollment_count = self.total_seats
+
+        if not self._state.adding and kwargs.get("update_fields") is None and not args:
+            deferred = self.get_deferred_fields()
+            loaded = getattr(self, "_loaded_counters", {})
+            kwargs["update_fields"] = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and (
+                    field.name not in self.COUNTER_FIELDS
+                    or getattr(self, field.attname) != loaded.get(field.attname)
+                )
+            ]
             
         super().save(*args, **kwargs)
+        self._remember_counters()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_counters()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._remember_counters()
+
+    def _remember_counters(self):
+        """Keep the stored counter values, to tell changed counters from stale ones."""
+        deferred = self.get_deferred_fields()
+        self._loaded_counters = {
+            name: getattr(self, name)
+            for name in self.COUNTER_FIELDS
+            if name not in deferred
+        }
 
     @property
     def is_published(self):
@@ -205,14 +423,14 @@ class Course(models.Model):
         return self.status == CourseStatus.PUBLISHED
 
     @property
-    def lesson_count(self):
-        """Get total number of lessons."""
-        return self.sections.aggregate(total=models.Sum("lessons__id"))["total"] or 0  # type: ignore
+    def total_classes(self):
+        """Total number of sections (classes)."""
+        return self.section_count
 
     @property
-    def total_classes(self):
-        """Count total number of sections (classes)."""
-        return self.sections.count() # type: ignore
+    def rating_distribution(self):
+        """Number of reviews per star rating."""
+        return {str(star): getattr(self, f"rating_{star}_count") for star in RATING_STARS}
 
     @property
     def is_admission_open(self):
@@ -228,16 +446,21 @@ class Course(models.Model):
 
     def decrease_available_seats(self, count=1):
         """Decrease available seats when a student enrolls."""
-        if self.available_seats >= count:
-            self.available_seats -= count
-            self.save(update_fields=["available_seats"])
-            return True
-        return False
+        # Conditional UPDATE so concurrent enrollments cannot oversell
+        reserved = Course.objects.filter(
+            pk=self.pk, available_seats__gte=count
+        ).update(available_seats=models.F("available_seats") - count)
+        self.refresh_from_db(fields=["available_seats"])
+        return bool(reserved)
 
     def increase_available_seats(self, count=1):
         """Increase available seats when a student unenrolls."""
-        self.available_seats = min(self.available_seats + count, self.total_seats)
-        self.save(update_fields=["available_seats"])
+        Course.objects.filter(pk=self.pk).update(
+            available_seats=Least(
+                models.F("available_seats") + count, models.F("total_seats")
+            )
+        )
+        self.refresh_from_db(fields=["available_seats"])
 
 
 class Section(models.Model):
@@ -362,22 +585,6 @@ class Review(models.Model):
         return f"{self.course.title} - {self.student.email} - {self.rating} stars"
 
     def save(self, *args, **kwargs):
-        """Update course average rating when review is saved."""
-        super().save(*args, **kwargs)
-        self.update_course_rating()
-
-    def delete(self, *args, **kwargs):  # type: ignore
-        """Update course average rating when review is deleted."""
-        super().delete(*args, **kwargs)
-        self.update_course_rating()
-
-    def update_course_rating(self):
-        """Recalculate course average rating."""
-        from django.db.models import Avg, Count
-
-        stats = Review.objects.filter(course=self.course).aggregate(
-            avg_rating=Avg("rating"), total_reviews=Count("id")
-        )
-        self.course.average_rating = stats["avg_rating"] or 0
-        self.course.total_reviews = stats["total_reviews"] or 0
-        self.course.save(update_fields=["average_rating", "total_reviews"])
\ No newline at end of file
+        """Save the review; signals apply the rating change to the course counters."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
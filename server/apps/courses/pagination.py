@@ -0,0 +1,14 @@
+"""
+Pagination classes for courses app.
+"""
+
+from config.pagination import KeysetCursorPagination
+
+
+class ReviewCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination for course reviews.
+    Walks the (course, -created_at) index instead of counting and offsetting.
+    """
+
+    ordering = "-created_at"
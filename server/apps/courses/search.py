@@ -0,0 +1,207 @@
+"""
+Full-text search backends for the course catalog.
+
+On SQLite courses are indexed in an FTS5 virtual table (created by migration
+0007) and matched with ranked prefix queries. Other databases fall back to
+`icontains` matching until a dedicated backend is configured through the
+COURSE_SEARCH_BACKEND setting.
+"""
+
+import re
+import uuid
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from .models import Course
+
+SEARCH_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+# (course lookup, index column) pairs, in index column order
+INDEXED_COLUMNS = (
+    ("title", "title"),
+    ("short_description", "short_description"),
+    ("description", "description"),
+    ("instructor__first_name", "instructor_first_name"),
+    ("instructor__last_name", "instructor_last_name"),
+    ("venue", "venue"),
+    ("schedule", "schedule"),
+)
+
+# Course fields whose change requires re-indexing the course
+INDEXED_FIELDS = {
+    "title",
+    "short_description",
+    "description",
+    "instructor",
+    "instructor_id",
+    "venue",
+    "schedule",
+}
+
+
+def search_terms(query):
+    """Split a search query into lowercase terms."""
+    return SEARCH_TERM_RE.findall(query.lower())
+
+
+class BaseSearchBackend:
+    """Interface of course search backends."""
+
+    def index(self, course_ids):
+        """Add or refresh the given courses in the index."""
+
+    def remove(self, course_ids):
+        """Drop the given courses from the index."""
+
+    def rebuild(self):
+        """Repopulate the whole index; return the number of indexed courses."""
+        return 0
+
+    def search(self, queryset, query):
+        """
+        Narrow a course queryset to the matches of `query`, annotated with
+        `search_rank` (lower is more relevant).
+        """
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Fallback without an index: every term must match some course field."""
+
+    def search(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset
+
+        for term in terms:
+            condition = Q()
+            for lookup, _ in INDEXED_COLUMNS:
+                condition |= Q(**{f"{lookup}__icontains": term})
+            queryset = queryset.filter(condition)
+
+        title_matches = Q()
+        for term in terms:
+            title_matches &= Q(title__icontains=term)
+        return queryset.annotate(
+            search_rank=Case(
+                When(title_matches, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        )
+
+
+class SQLiteFTSSearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 inverted index.
+
+    Rows are keyed by a rowid derived from the course UUID, so refreshing a
+    course is a rowid delete plus insert instead of a scan of the index.
+    """
+
+    table = "courses_search_index"
+    # bm25() column weights: course_id, then the INDEXED_COLUMNS in order
+    weights = (0.0, 10.0, 4.0, 1.0, 5.0, 5.0, 2.0, 1.0)
+
+    @staticmethod
+    def rowid(course_id):
+        return uuid.UUID(str(course_id)).int & ((1 << 63) - 1)
+
+    def _insert(self, cursor, queryset):
+        lookups = [lookup for lookup, _ in INDEXED_COLUMNS]
+        columns = ", ".join(["rowid", "course_id"] + [c for _, c in INDEXED_COLUMNS])
+        placeholders = ", ".join(["%s"] * (len(INDEXED_COLUMNS) + 2))
+        rows = [
+            (self.rowid(course_id), course_id.hex, *[value or "" for value in values])
+            for course_id, *values in queryset.values_list("id", *lookups).iterator()
+        ]
+        cursor.executemany(
+            f"INSERT INTO {self.table} ({columns}) VALUES ({placeholders})", rows
+        )
+
+    def remove(self, course_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(self.rowid(course_id),) for course_id in course_ids],
+            )
+
+    def index(self, course_ids):
+        course_ids = list(course_ids)
+        self.remove(course_ids)
+        with connection.cursor() as cursor:
+            self._insert(cursor, Course.objects.filter(pk__in=course_ids))
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            self._insert(cursor, Course.objects.all())
+            cursor.execute(f"SELECT COUNT(*) FROM {self.table}")
+            return cursor.fetchone()[0]
+
+    def search(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset
+
+        # Every term must match, each as a prefix ("pyth" finds "python")
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in self.weights)
+        # Only courses of the queryset, e.g. published ones, count towards
+        # the result cap; ids are stored as hex in both tables
+        visible_sql, visible_params = (
+            queryset.order_by().values("pk").query.sql_with_params()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT course_id FROM {self.table} WHERE {self.table} MATCH %s "
+                f"AND course_id IN ({visible_sql}) "
+                f"ORDER BY bm25({self.table}, {weights}) LIMIT %s",
+                [match, *visible_params, settings.COURSE_SEARCH_MAX_RESULTS],
+            )
+            course_ids = [uuid.UUID(row[0]) for row in cursor.fetchall()]
+
+        # Rank by position in the ranked id list; ids are fixed-width hex
+        ranked_ids = ",".join(course_id.hex for course_id in course_ids)
+        return queryset.filter(pk__in=course_ids).annotate(
+            search_rank=RawSQL(
+                f"instr(%s, {Course._meta.db_table}.{Course._meta.pk.column})",
+                [ranked_ids],
+                output_field=IntegerField(),
+            )
+        )
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    """Return the configured course search backend."""
+    if settings.COURSE_SEARCH_BACKEND:
+        return import_string(settings.COURSE_SEARCH_BACKEND)()
+    if connection.vendor == "sqlite":
+        return SQLiteFTSSearchBackend()
+    return DatabaseSearchBackend()
+
+
+class CourseSearchFilter(SearchFilter):
+    """
+    `?search=` filter backed by the course search backend.
+    Results are ordered by relevance unless `?ordering=` is given, so this
+    filter must come after OrderingFilter in `filter_backends`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "")
+        if not search_terms(query):
+            return queryset
+
+        queryset = get_search_backend().search(queryset, query)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by("search_rank", "-created_at")
+        return queryset
@@ -3,6 +3,7 @@ Serializers for courses app.
 """
 
 from rest_framework import serializers
+from django.conf import settings
 from django.utils.text import slugify
 from django.utils import timezone
 from .models import Category, Course, Section, Lesson, Review, CourseStatus
@@ -172,7 +173,8 @@ class CourseListSerializer(serializers.ModelSerializer):
         source="instructor.get_full_name", read_only=True
     )
     category_name = serializers.CharField(source="category.name", read_only=True)
-    total_classes = serializers.SerializerMethodField()
+    total_classes = serializers.IntegerField(source="section_count", read_only=True)
+    total_lessons = serializers.IntegerField(source="lesson_count", read_only=True)
     is_admission_open = serializers.SerializerMethodField()
     is_full = serializers.SerializerMethodField()
 
@@ -196,6 +198,7 @@ class CourseListSerializer(serializers.ModelSerializer):
             "average_rating",
             "total_reviews",
             "total_classes",
+            "total_lessons",
             "available_seats",
             "total_seats",
             "is_admission_open",
@@ -208,9 +211,6 @@ class CourseListSerializer(serializers.ModelSerializer):
             "published_at",
         )
 
-    def get_total_classes(self, obj):
-        return obj.total_classes
-
     def get_is_admission_open(self, obj):
         return obj.is_admission_open
 
@@ -224,9 +224,10 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     instructor = UserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     sections = SectionSerializer(many=True, read_only=True)
-    reviews = ReviewSerializer(many=True, read_only=True)
+    reviews = serializers.SerializerMethodField()
     is_enrolled = serializers.SerializerMethodField()
-    total_classes = serializers.SerializerMethodField()
+    total_classes = serializers.IntegerField(source="section_count", read_only=True)
+    rating_distribution = serializers.DictField(read_only=True)
     is_admission_open = serializers.SerializerMethodField()
     is_full = serializers.SerializerMethodField()
 
@@ -255,9 +256,12 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             "enrollment_count",
             "average_rating",
             "total_reviews",
+            "rating_distribution",
             "reviews",
             "is_enrolled",
             "total_classes",
+            "lesson_count",
+            "total_video_duration",
             "available_seats",
             "total_seats",
             "class_starts",
@@ -271,6 +275,18 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             "published_at",
         )
 
+    def get_reviews(self, obj):
+        """
+        Embed only the most recent reviews; the full list is served by the
+        paginated course reviews endpoint.
+        """
+        reviews = (
+            Review.objects.filter(course=obj)
+            .select_related("student")
+            .order_by("-created_at")[: settings.COURSE_DETAIL_RECENT_REVIEWS]
+        )
+        return ReviewSerializer(reviews, many=True, context=self.context).data
+
     def get_is_enrolled(self, obj):
         """Check if current user is enrolled."""
         request = self.context.get("request")
@@ -280,9 +296,6 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             return Enrollment.objects.filter(student=request.user, course=obj).exists()
         return False
 
-    def get_total_classes(self, obj):
-        return obj.total_classes
-
     def get_is_admission_open(self, obj):
         return obj.is_admission_open
 
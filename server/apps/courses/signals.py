@@ -2,15 +2,20 @@
 Signals for courses app.
 """
 
-from django.db.models.signals import post_save
+from django.db.models import Count, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 import logging
 
+from .cache import invalidate_course
+from .models import Course, Lesson, Review, Section
+from .search import INDEXED_FIELDS, get_search_backend
+
 logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender="courses.Course")
-def course_post_save(sender, instance, created, **kwargs):
+def course_post_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
     """Handle course post-save events."""
     if created:
         logger.info(
@@ -19,3 +24,218 @@ def course_post_save(sender, instance, created, **kwargs):
 
     if instance.status == "PUBLISHED" and not created:
         logger.info(f"Course published: {instance.title}")
+
+    invalidate_course(instance.pk)
+
+    if not raw and (update_fields is None or set(update_fields) & INDEXED_FIELDS):
+        get_search_backend().index([instance.pk])
+
+
+@receiver(post_delete, sender="courses.Course")
+def course_post_delete(sender, instance, **kwargs):
+    """Drop a deleted course from the search index."""
+    get_search_backend().remove([instance.pk])
+
+
+def _structure_fields_saved(update_fields, fields):
+    """Check whether a save may have touched any of the given fields."""
+    return update_fields is None or bool(set(update_fields) & set(fields))
+
+
+@receiver(pre_save, sender="courses.Section")
+def section_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember the current course so a move can be counted."""
+    instance._previous_course_id = None
+    if raw or instance._state.adding:
+        return
+    if _structure_fields_saved(update_fields, ["course", "course_id"]):
+        instance._previous_course_id = (
+            Section.objects.filter(pk=instance.pk)
+            .values_list("course_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender="courses.Section")
+def section_post_save(sender, instance, created, raw=False, **kwargs):
+    """Keep course structure counters in sync with section writes."""
+    if raw:
+        return
+
+    if created:
+        Course.objects.filter(pk=instance.course_id).shift_structure_counters(
+            sections=1
+        )
+        return
+
+    previous_course_id = getattr(instance, "_previous_course_id", None)
+    if previous_course_id and previous_course_id != instance.course_id:
+        totals = instance.lessons.aggregate(
+            lessons=Count("id"), duration=Sum("video_duration")
+        )
+        lessons = totals["lessons"] or 0
+        duration = totals["duration"] or 0
+        Course.objects.filter(pk=previous_course_id).shift_structure_counters(
+            sections=-1, lessons=-lessons, video_duration=-duration
+        )
+        Course.objects.filter(pk=instance.course_id).shift_structure_counters(
+            sections=1, lessons=lessons, video_duration=duration
+        )
+
+
+@receiver(post_delete, sender="courses.Section")
+def section_post_delete(sender, instance, **kwargs):
+    """Decrement the section counter (lessons are handled by their own signal)."""
+    Course.objects.filter(pk=instance.course_id).shift_structure_counters(
+        sections=-1
+    )
+
+
+@receiver(pre_save, sender="courses.Lesson")
+def lesson_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember the current section and duration so changes can be counted."""
+    instance._previous_structure = None
+    if raw or instance._state.adding:
+        return
+    if _structure_fields_saved(
+        update_fields, ["section", "section_id", "video_duration"]
+    ):
+        instance._previous_structure = (
+            Lesson.objects.filter(pk=instance.pk)
+            .values_list("section_id", "video_duration")
+            .first()
+        )
+
+
+@receiver(post_save, sender="courses.Lesson")
+def lesson_post_save(sender, instance, created, raw=False, **kwargs):
+    """Keep course structure counters in sync with lesson writes."""
+    if raw:
+        return
+
+    if created:
+        Course.objects.filter(sections=instance.section_id).shift_structure_counters(
+            lessons=1, video_duration=instance.video_duration
+        )
+        return
+
+    previous = getattr(instance, "_previous_structure", None)
+    if previous is None:
+        return
+
+    previous_section_id, previous_duration = previous
+    if previous_section_id != instance.section_id:
+        Course.objects.filter(sections=previous_section_id).shift_structure_counters(
+            lessons=-1, video_duration=-previous_duration
+        )
+        Course.objects.filter(sections=instance.section_id).shift_structure_counters(
+            lessons=1, video_duration=instance.video_duration
+        )
+    elif previous_duration != instance.video_duration:
+        Course.objects.filter(sections=instance.section_id).shift_structure_counters(
+            video_duration=instance.video_duration - previous_duration
+        )
+
+
+@receiver(post_delete, sender="courses.Lesson")
+def lesson_post_delete(sender, instance, **kwargs):
+    """Decrement the lesson counters of the owning course."""
+    Course.objects.filter(sections=instance.section_id).shift_structure_counters(
+        lessons=-1, video_duration=-instance.video_duration
+    )
+
+
+@receiver([post_save, post_delete], sender="courses.Section")
+def section_changed(sender, instance, **kwargs):
+    """Invalidate cached course payloads affected by a section write."""
+    invalidate_course(instance.course_id)
+    previous_course_id = getattr(instance, "_previous_course_id", None)
+    if previous_course_id and previous_course_id != instance.course_id:
+        invalidate_course(previous_course_id)
+
+
+@receiver([post_save, post_delete], sender="courses.Lesson")
+def lesson_changed(sender, instance, **kwargs):
+    """Invalidate cached course payloads affected by a lesson write."""
+    section_ids = {instance.section_id}
+    previous = getattr(instance, "_previous_structure", None)
+    if previous:
+        section_ids.add(previous[0])
+
+    course_ids = Section.objects.filter(pk__in=section_ids).values_list(
+        "course_id", flat=True
+    )
+    for course_id in set(course_ids):
+        invalidate_course(course_id)
+
+
+@receiver(pre_save, sender="courses.Review")
+def review_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember the stored course and rating so a change can be counted."""
+    instance._previous_rating = None
+    if raw or instance._state.adding:
+        return
+    if _structure_fields_saved(update_fields, ["course", "course_id", "rating"]):
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list("course_id", "rating")
+            .first()
+        )
+
+
+@receiver(post_save, sender="courses.Review")
+def review_post_save(sender, instance, created, raw=False, **kwargs):
+    """Keep course rating counters in sync with review writes."""
+    if raw:
+        return
+
+    if created:
+        Course.objects.filter(pk=instance.course_id).shift_rating(added=instance.rating)
+        return
+
+    previous = getattr(instance, "_previous_rating", None)
+    if previous is None:
+        return
+
+    previous_course_id, previous_rating = previous
+    if previous_course_id != instance.course_id:
+        Course.objects.filter(pk=previous_course_id).shift_rating(removed=previous_rating)
+        Course.objects.filter(pk=instance.course_id).shift_rating(added=instance.rating)
+    elif previous_rating != instance.rating:
+        Course.objects.filter(pk=instance.course_id).shift_rating(
+            added=instance.rating, removed=previous_rating
+        )
+
+
+@receiver(post_delete, sender="courses.Review")
+def review_post_delete(sender, instance, **kwargs):
+    """Remove the rating from the course counters, also on cascade deletes."""
+    Course.objects.filter(pk=instance.course_id).shift_rating(removed=instance.rating)
+
+
+@receiver([post_save, post_delete], sender="courses.Review")
+def review_changed(sender, instance, **kwargs):
+    """Invalidate the cached payload of the reviewed course."""
+    invalidate_course(instance.course_id)
+
+
+@receiver(post_save, sender="courses.Category")
+def category_post_save(sender, instance, **kwargs):
+    """Category data is embedded in course payloads."""
+    for course_id in instance.courses.values_list("id", flat=True):
+        invalidate_course(course_id)
+
+
+@receiver(post_save, sender="accounts.User")
+def instructor_post_save(sender, instance, created, update_fields=None, **kwargs):
+    """Instructor profile data is embedded in course payloads."""
+    if created or not instance.is_instructor:
+        return
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    course_ids = list(instance.courses.values_list("id", flat=True))
+    for course_id in course_ids:
+        invalidate_course(course_id)
+    # Instructor names are part of the search index
+    if update_fields is None or {"first_name", "last_name"} & set(update_fields):
+        get_search_backend().index(course_ids)
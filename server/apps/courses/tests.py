@@ -0,0 +1,221 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, UserRole
+from config.cache import get_cache
+from config.middleware import ReplicaReadMiddleware
+from config.routers import REPLICA_DATABASE_ALIAS, ReplicaRouter
+
+from .models import Category, Course, CourseStatus, Review
+
+COURSES_URL = "/api/v1/courses/courses/"
+
+
+class CourseTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="Passw0rd!x",
+            role=UserRole.INSTRUCTOR,
+        )
+        cls.category = Category.objects.create(name="Programming", slug="programming")
+
+    def create_course(self, title, status=CourseStatus.PUBLISHED):
+        index = Course.objects.count()
+        return Course.objects.create(
+            instructor=self.instructor,
+            category=self.category,
+            title=title,
+            slug=f"course-{index}",
+            description="Description",
+            short_description="Short description",
+            learning_outcomes="Outcomes",
+            price=Decimal("10.00"),
+            status=status,
+        )
+
+
+class CourseCounterTests(CourseTestCase):
+    def test_full_save_keeps_stored_seat_counters(self):
+        course = self.create_course("Python")
+        stale = Course.objects.get(pk=course.pk)
+        course.decrease_available_seats()
+        Course.objects.filter(pk=course.pk).update(enrollment_count=1)
+
+        stale.title = "Python basics"
+        stale.save()
+
+        course.refresh_from_db()
+        self.assertEqual(course.title, "Python basics")
+        self.assertEqual((course.available_seats, course.enrollment_count), (29, 1))
+
+    def test_full_save_writes_changed_seat_counters(self):
+        course = self.create_course("Python")
+        course.decrease_available_seats()
+        course.total_seats = 20
+        course.save()
+        course.refresh_from_db()
+        self.assertEqual(course.available_seats, 20)
+
+        course.available_seats = 5
+        course.save()
+        course.refresh_from_db()
+        self.assertEqual(course.available_seats, 5)
+
+
+class CourseRatingTests(CourseTestCase):
+    def rating_of(self, course):
+        course.refresh_from_db()
+        return course.total_reviews, course.average_rating, course.rating_5_count
+
+    def test_review_writes_update_the_counters(self):
+        course = self.create_course("Python")
+        students = [
+            User.objects.create_user(email=f"student-{index}@example.com", password="!")
+            for index in range(2)
+        ]
+        review = Review.objects.create(course=course, student=students[0], rating=5)
+        Review.objects.create(course=course, student=students[1], rating=4)
+        self.assertEqual(self.rating_of(course), (2, Decimal("4.50"), 1))
+
+        review.rating = 2
+        review.save()
+        self.assertEqual(self.rating_of(course), (2, Decimal("3.00"), 0))
+
+        Review.objects.filter(pk=review.pk).delete()
+        self.assertEqual(self.rating_of(course), (1, Decimal("4.00"), 0))
+
+    def test_cascade_delete_removes_the_rating(self):
+        course = self.create_course("Python")
+        student = User.objects.create_user(email="student@example.com", password="!")
+        Review.objects.create(course=course, student=student, rating=5)
+
+        student.delete()
+
+        self.assertEqual(self.rating_of(course), (0, Decimal("0.00"), 0))
+
+
+class CourseListTests(CourseTestCase):
+    def test_query_count_does_not_grow_with_page_size(self):
+        for index in range(30):
+            self.create_course(f"Course {index}")
+        client = APIClient()
+
+        for page_size in (5, 30):
+            # The page count, then the courses with instructor and category
+            with self.assertNumQueries(2):
+                response = client.get(COURSES_URL, {"page_size": page_size})
+            self.assertEqual(len(response.json()["results"]["data"]), page_size)
+
+
+class CourseDetailTests(CourseTestCase):
+    def test_revalidation_does_not_build_the_payload(self):
+        url = f"{COURSES_URL}{self.create_course('Python').pk}/"
+        client = APIClient()
+        etag = client.get(url)["ETag"]
+
+        with mock.patch("apps.courses.views.get_course_detail_payload") as build:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        build.assert_not_called()
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "cdn.example.com"])
+    def test_etag_depends_on_the_host(self):
+        url = f"{COURSES_URL}{self.create_course('Python').pk}/"
+        client = APIClient()
+        etag = client.get(url)["ETag"]
+
+        response = client.get(url, HTTP_HOST="cdn.example.com", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_counter_rebuilds_invalidate_the_payload(self):
+        course = self.create_course("Python")
+        url = f"{COURSES_URL}{course.pk}/"
+        client = APIClient()
+        courses = Course.objects.filter(pk=course.pk)
+
+        for rebuild in (courses.rebuild_structure_counters, courses.rebuild_rating_counters):
+            with self.subTest(rebuild=rebuild.__name__):
+                etag = client.get(url)["ETag"]
+                with self.captureOnCommitCallbacks(execute=True):
+                    rebuild()
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+
+class CourseSearchTests(CourseTestCase):
+    @override_settings(COURSE_SEARCH_MAX_RESULTS=5)
+    def test_hidden_courses_do_not_count_towards_result_cap(self):
+        # The drafts rank higher: their titles are shorter
+        for _ in range(5):
+            self.create_course("Java", status=CourseStatus.DRAFT)
+        published = {
+            str(self.create_course(f"Java for beginners, part {index}").pk)
+            for index in range(3)
+        }
+
+        response = APIClient().get(COURSES_URL, {"search": "java"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 3)
+        ids = {course["id"] for course in response.json()["results"]["data"]}
+        self.assertEqual(ids, published)
+
+    def test_cursor_pagination_keeps_relevance_order(self):
+        body_match = self.create_course("Cooking")
+        body_match.description = "Snippets in python"
+        body_match.save()
+        title_match = self.create_course("Python basics")
+
+        response = APIClient().get(
+            COURSES_URL, {"search": "python", "pagination": "cursor"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 2)
+        ids = [course["id"] for course in response.json()["results"]["data"]]
+        self.assertEqual(ids, [str(title_match.pk), str(body_match.pk)])
+
+
+@mock.patch("config.routers.replica_configured", return_value=True)
+@mock.patch("config.middleware.replica_configured", return_value=True)
+class CatalogReplicaReadTests(TestCase):
+    def serve(self, request, status=200):
+        """Run a request through the middleware; return the read database and response."""
+        databases = []
+
+        def view(request):
+            databases.append(ReplicaRouter().db_for_read(Course))
+            return HttpResponse(status=status)
+
+        response = ReplicaReadMiddleware(view)(request)
+        return databases[0], response
+
+    def test_writes_pin_reads_to_the_primary_in_every_worker(self, *mocks):
+        factory = RequestFactory()
+        database, _ = self.serve(factory.get(COURSES_URL))
+        self.assertEqual(database, REPLICA_DATABASE_ALIAS)
+
+        _, response = self.serve(factory.post(COURSES_URL), status=201)
+        # Another worker, whose cache has not seen the pin
+        get_cache().clear()
+        request = factory.get(COURSES_URL)
+        request.COOKIES.update(
+            {name: morsel.value for name, morsel in response.cookies.items()}
+        )
+        database, _ = self.serve(request)
+        self.assertEqual(database, "default")
+
+    def test_failed_writes_do_not_pin(self, *mocks):
+        factory = RequestFactory()
+        _, response = self.serve(factory.post(COURSES_URL), status=400)
+        self.assertFalse(response.cookies)
@@ -25,6 +25,10 @@ from .serializers import (
     CourseReviewSerializer,
 )
 from apps.accounts.permissions import IsInstructor, IsAdmin, IsInstructorOrAdmin
+from apps.enrollments.models import Enrollment
+from .cache import course_etag, course_version, etag_matches, get_course_detail_payload
+from .pagination import ReviewCursorPagination
+from .search import CourseSearchFilter
 from .permissions import IsCourseInstructorOrAdmin, IsEnrolledOrInstructor
 import logging
 
@@ -36,6 +40,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
     serializer_class = CategorySerializer
     queryset = Category.objects.filter(is_active=True)
+    throttle_scope = "catalog"
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ["name", "description"]
     ordering_fields = ["name", "created_at"]
@@ -51,16 +56,9 @@ class CategoryViewSet(viewsets.ModelViewSet):
 class CourseViewSet(viewsets.ModelViewSet):
     """ViewSet for courses with approval workflow."""
 
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    throttle_scope = "catalog"
+    filter_backends = [DjangoFilterBackend, OrderingFilter, CourseSearchFilter]
     filterset_fields = ["category", "difficulty_level", "is_free", "status"]
-    search_fields = [
-        "title",
-        "description",
-        "instructor__first_name",
-        "instructor__last_name",
-        "venue",
-        "schedule",
-    ]
     ordering_fields = [
         "created_at",
         "published_at",
@@ -93,30 +91,26 @@ class CourseViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         if not user.is_authenticated or user.is_student: # type: ignore
-            return (
-                Course.objects.filter(status=CourseStatus.PUBLISHED)
-                .select_related("instructor", "category")
-                .prefetch_related("sections__lessons")
+            queryset = Course.objects.filter(status=CourseStatus.PUBLISHED)
+        elif user.is_instructor: # type: ignore
+            queryset = Course.objects.filter(
+                Q(instructor=user) | Q(status=CourseStatus.PUBLISHED)
             )
+        elif user.is_admin_user: # type: ignore
+            queryset = Course.objects.select_related("reviewed_by")
+        else:
+            queryset = Course.objects.filter(status=CourseStatus.PUBLISHED)
 
-        if user.is_instructor: # type: ignore
-            return (
-                Course.objects.filter(
-                    Q(instructor=user) | Q(status=CourseStatus.PUBLISHED)
-                )
-                .select_related("instructor", "category")
-                .prefetch_related("sections__lessons")
-            )
+        # Catalog listings only need counts, not the full course structure
+        if self.action == "list":
+            return queryset.for_catalog()
 
-        if user.is_admin_user: # type: ignore
-            return Course.objects.select_related(
-                "instructor", "category", "reviewed_by"
-            ).prefetch_related("sections__lessons")
+        # Detail payloads are cached; the structure is loaded on cache misses only
+        if self.action == "retrieve":
+            return queryset.select_related("instructor", "category")
 
-        return (
-            Course.objects.filter(status=CourseStatus.PUBLISHED)
-            .select_related("instructor", "category")
-            .prefetch_related("sections__lessons")
+        return queryset.select_related("instructor", "category").prefetch_related(
+            "sections__lessons"
         )
 
     def get_permissions(self):
@@ -146,11 +140,26 @@ class CourseViewSet(viewsets.ModelViewSet):
         return Response({"success": True, "data": serializer.data})
 
     def retrieve(self, request, *args, **kwargs):
-        """Retrieve course details."""
+        """Retrieve course details from the versioned payload cache."""
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
+        version = course_version(instance.pk)
 
-        return Response({"success": True, "data": serializer.data})
+        is_enrolled = (
+            request.user.is_authenticated
+            and Enrollment.objects.filter(student=request.user, course=instance).exists()
+        )
+        # The ETag only needs the version, so revalidations skip the payload
+        etag = course_etag(
+            instance.pk, version, is_enrolled, request.build_absolute_uri("/")
+        )
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        payload = get_course_detail_payload(instance, request, version)
+        return Response(
+            {"success": True, "data": {**payload, "is_enrolled": is_enrolled}},
+            headers={"ETag": etag},
+        )
 
     @transaction.atomic
     def create(self, request, *args, **kwargs):
@@ -298,11 +307,14 @@ class MyCoursesViewSet(viewsets.ModelViewSet):
         This view should only return courses for the currently authenticated
         instructor.
         """
-        return (
-            Course.objects.filter(instructor=self.request.user)
-            .select_related("instructor", "category", "reviewed_by")
-            .prefetch_related("sections__lessons")
-        )
+        queryset = Course.objects.filter(instructor=self.request.user)
+
+        if self.action == "list":
+            return queryset.for_catalog()
+
+        return queryset.select_related(
+            "instructor", "category", "reviewed_by"
+        ).prefetch_related("sections__lessons")
 
     def get_serializer_class(self): # type: ignore
         """Return appropriate serializer based on action."""
@@ -436,6 +448,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     """ViewSet for course reviews."""
 
     serializer_class = ReviewSerializer
+    pagination_class = ReviewCursorPagination
     filter_backends = [OrderingFilter]
     ordering_fields = ["created_at", "rating"]
     ordering = ["-created_at"]
@@ -456,6 +469,20 @@ class ReviewViewSet(viewsets.ModelViewSet):
             "student", "course"
         )
 
+    def list(self, request, *args, **kwargs):
+        """List course reviews, newest first, with cursor pagination."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(
+                {"success": True, "data": serializer.data}
+            )
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({"success": True, "data": serializer.data})
+
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         """Create review."""
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Enrollment, LessonProgress, Certificate
+from .models import Enrollment, LessonProgress, Certificate, ProgressRefresh
 
 
 @admin.register(Enrollment)
@@ -26,3 +26,12 @@ class LessonProgressAdmin(admin.ModelAdmin):
 class CertificateAdmin(admin.ModelAdmin):
     list_display = ("certificate_number", "enrollment", "issued_at")
     readonly_fields = ("certificate_number", "issued_at")
+
+
+@admin.register(ProgressRefresh)
+class ProgressRefreshAdmin(admin.ModelAdmin):
+    list_display = ("course_id", "requested_at")
+    readonly_fields = ("course_id", "requested_at")
+
+    def has_add_permission(self, request):
+        return False
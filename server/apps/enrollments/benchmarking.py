@@ -0,0 +1,49 @@
+"""
+Seed data for enrollment benchmark commands.
+"""
+
+import random
+
+from apps.accounts.models import User
+from apps.courses.benchmarking import seed_courses
+from apps.courses.models import Course, Lesson, Section
+from .models import Enrollment, LessonProgress
+
+
+def seed_course_with_enrollments(enrollments, lessons, seed=0):
+    """
+    Create one course with `lessons` lessons and `enrollments` students,
+    each having completed a random subset of the lessons.
+    """
+    rng = random.Random(seed)
+    course = seed_courses(1)[0]
+    section = Section.objects.create(course=course, title="Benchmark section")
+    lesson_ids = [
+        lesson.id
+        for lesson in Lesson.objects.bulk_create(
+            Lesson(section=section, title=f"Lesson {order}", order=order)
+            for order in range(lessons)
+        )
+    ]
+    Course.objects.filter(pk=course.pk).rebuild_structure_counters()
+
+    students = User.objects.bulk_create(
+        (
+            User(email=f"benchmark-student-{index}@example.com", password="!")
+            for index in range(enrollments)
+        ),
+        batch_size=1000,
+    )
+    created = Enrollment.objects.bulk_create(
+        (Enrollment(student=student, course=course) for student in students),
+        batch_size=1000,
+    )
+    LessonProgress.objects.bulk_create(
+        (
+            LessonProgress(enrollment=enrollment, lesson_id=lesson_id, completed=True)
+            for enrollment in created
+            for lesson_id in rng.sample(lesson_ids, rng.randint(0, lessons))
+        ),
+        batch_size=1000,
+    )
+    return course
@@ -0,0 +1,168 @@
+"""
+Certificate documents (PDF or PNG) rendered with Pillow.
+
+Documents are rendered by the `render_certificates` worker, never during a
+request, and stored under MEDIA_ROOT with a name derived from their content
+hash, so a stored file never changes and can be cached forever. A
+certificate is re-rendered only when TEMPLATE_VERSION changes; the documents
+it replaces are kept, as their URLs may still be cached.
+"""
+
+import hashlib
+import io
+import logging
+from datetime import datetime
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageDraw, ImageFont
+
+from .models import Certificate
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout below changes to re-render every certificate
+TEMPLATE_VERSION = 1
+
+# A4 landscape at 150 dpi
+PAGE_SIZE = (1754, 1240)
+RESOLUTION = 150
+
+CONTENT_TYPES = {"PDF": "application/pdf", "PNG": "image/png"}
+
+
+def certificate_payload(certificate):
+    """Plain values a document is rendered from (safe to send to a process)."""
+    enrollment = certificate.enrollment
+    return {
+        "site_name": settings.SITE_NAME,
+        "student_name": enrollment.student.get_full_name(),
+        "course_title": enrollment.course.title,
+        "instructor_name": enrollment.course.instructor.get_full_name(),
+        "certificate_number": certificate.certificate_number,
+        "issued_at": certificate.issued_at.isoformat(),
+    }
+
+
+@lru_cache(maxsize=None)
+def _font(size):
+    if settings.CERTIFICATE_FONT:
+        return ImageFont.truetype(settings.CERTIFICATE_FONT, size)
+    return ImageFont.load_default(size=size)
+
+
+def render_certificate(payload, document_format="PDF"):
+    """Render a certificate payload; return the document bytes."""
+    width, height = PAGE_SIZE
+    image = Image.new("RGB", PAGE_SIZE, "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, width - 40, height - 40), outline="#1f3a5f", width=8)
+
+    issued_at = datetime.fromisoformat(payload["issued_at"])
+    center = width // 2
+    lines = (
+        (220, payload["site_name"], 48, "#1f3a5f"),
+        (360, "Certificate of Completion", 88, "black"),
+        (500, "This certifies that", 40, "#555555"),
+        (600, payload["student_name"], 80, "black"),
+        (720, "has successfully completed", 40, "#555555"),
+        (820, payload["course_title"], 60, "black"),
+        (940, f"Instructor: {payload['instructor_name']}", 36, "#555555"),
+        (1060, f"Issued {issued_at:%B %d, %Y}", 32, "#555555"),
+        (1120, f"Certificate No. {payload['certificate_number']}", 32, "#555555"),
+    )
+    for top, text, size, color in lines:
+        draw.text((center, top), text, font=_font(size), fill=color, anchor="mm")
+
+    buffer = io.BytesIO()
+    if document_format == "PDF":
+        # Fixed dates keep the bytes (and so the file name) reproducible
+        timestamp = issued_at.utctimetuple()
+        image.save(
+            buffer,
+            "PDF",
+            resolution=RESOLUTION,
+            title=f"Certificate {payload['certificate_number']}",
+            creationDate=timestamp,
+            modDate=timestamp,
+        )
+    else:
+        image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _render_or_error(payload, document_format):
+    """
+    render_certificate for the worker pool: return (content, error) instead
+    of raising, as an exception would end the pool's map for the whole batch.
+    """
+    try:
+        return render_certificate(payload, document_format), None
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+def document_name(content, document_format):
+    """Content-addressed storage name of a document."""
+    digest = hashlib.sha256(content).hexdigest()
+    return f"certificates/{digest}.{document_format.lower()}"
+
+
+def store_document(certificate, content, document_format):
+    """
+    Save a rendered document and point the certificate at it. The storage
+    may pick another name than the content hash (e.g. with a random suffix
+    when a concurrent worker saved the same document first); the name it
+    returns is the one recorded.
+    """
+    name = document_name(content, document_format)
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+
+    Certificate.objects.filter(pk=certificate.pk).update(
+        document=name, document_version=TEMPLATE_VERSION
+    )
+    return name
+
+
+def stale_certificates():
+    """Certificates never rendered or rendered from an older template."""
+    return Certificate.objects.exclude(document_version=TEMPLATE_VERSION)
+
+
+def render_stale_certificates(limit, map_func=map, document_format=None, failed=None):
+    """
+    Render up to `limit` stale certificates. `map_func` runs the rendering
+    (e.g. a process pool's map); storage and database writes stay in this
+    process. A certificate that fails to render or store is logged and its
+    id added to the `failed` set, which later calls skip, so it neither
+    stops the batch nor is retried in a loop. Returns the number of
+    certificates attempted.
+    """
+    document_format = document_format or settings.CERTIFICATE_DOCUMENT_FORMAT
+    failed = set() if failed is None else failed
+    certificates = list(
+        stale_certificates()
+        .exclude(pk__in=failed)
+        .select_related(
+            "enrollment__student", "enrollment__course__instructor"
+        )
+        .order_by("issued_at")[:limit]
+    )
+    payloads = [certificate_payload(certificate) for certificate in certificates]
+    formats = [document_format] * len(payloads)
+
+    for certificate, (content, error) in zip(
+        certificates, map_func(_render_or_error, payloads, formats)
+    ):
+        if error is None:
+            try:
+                store_document(certificate, content, document_format)
+                continue
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+        failed.add(certificate.pk)
+        logger.error(f"Could not render certificate {certificate.certificate_number}: {error}")
+    return len(certificates)
@@ -0,0 +1,129 @@
+"""
+Benchmark concurrent enrollment and progress writes per database profile.
+"""
+
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections, connection, connections
+
+from apps.accounts.models import User
+from apps.courses.models import Course, Lesson
+from apps.enrollments.benchmarking import seed_course_with_enrollments
+from apps.enrollments.services import enroll_student, record_lesson_progress
+from config.benchmarking import benchmark_database
+
+# Profiles compared with the configured settings: Django's stock behaviour
+# for the vendor, i.e. no persistent connections and no tuning
+BASELINE_PROFILES = {
+    "sqlite": {
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {
+            "timeout": 5,
+            "transaction_mode": "DEFERRED",
+            "pragmas": {"journal_mode": "DELETE", "synchronous": "FULL"},
+        },
+    },
+}
+DEFAULT_BASELINE = {"CONN_MAX_AGE": 0}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed an isolated database and run concurrent enrollments plus "
+        "lesson progress batches from several threads, once with Django's "
+        "stock connection settings and once with the configured profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=400)
+        parser.add_argument("--lessons", type=int, default=10)
+        parser.add_argument("--threads", type=int, default=8)
+
+    def _student_session(self, student, course_id, lesson_ids):
+        """One student enrolls, then reports progress in two batches."""
+        writes, errors = 0, 0
+        halves = [lesson_ids[: len(lesson_ids) // 2], lesson_ids[len(lesson_ids) // 2 :]]
+        steps = [lambda: enroll_student(student, course_id)] + [
+            lambda half=half: record_lesson_progress(
+                student,
+                [{"lesson": lesson_id, "completed": True} for lesson_id in half],
+            )
+            for half in halves
+        ]
+        for step in steps:
+            try:
+                step()
+                writes += 1
+            except OperationalError:
+                errors += 1
+            finally:
+                # Request boundary: closes the connection unless persistent
+                close_old_connections()
+        return writes, errors
+
+    def _run_worker(self, sessions):
+        try:
+            return [self._student_session(*session) for session in sessions]
+        finally:
+            connections.close_all()
+
+    def _run_profile(self, name, course, lesson_ids, options):
+        students = User.objects.bulk_create(
+            User(email=f"{name}-writer-{index}@example.com", password="!")
+            for index in range(options["students"])
+        )
+        connections.close_all()
+
+        threads = options["threads"]
+        sessions = [(student, course.id, lesson_ids) for student in students]
+        chunks = [sessions[index::threads] for index in range(threads)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = [
+                result
+                for chunk_results in executor.map(self._run_worker, chunks)
+                for result in chunk_results
+            ]
+        elapsed = time.perf_counter() - start
+
+        writes = sum(result[0] for result in results)
+        errors = sum(result[1] for result in results)
+        self.stdout.write(
+            f"{name:<10} {writes / elapsed:8.1f} writes/s "
+            f"({writes} transactions in {elapsed:.2f} s, {errors} failed)"
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            settings_dict = connection.settings_dict
+            configured = copy.deepcopy(
+                {key: settings_dict[key] for key in ("CONN_MAX_AGE", "OPTIONS")}
+            )
+            baseline = BASELINE_PROFILES.get(connection.vendor, DEFAULT_BASELINE)
+            self.stdout.write(
+                f"{connection.vendor}: {options['threads']} threads, "
+                f"{options['students']} students, {options['lessons']} lessons"
+            )
+
+            profiles = (("stock", baseline), ("configured", configured))
+            course = seed_course_with_enrollments(0, options["lessons"])
+            Course.objects.filter(pk=course.pk).update(
+                available_seats=options["students"] * len(profiles),
+                admission_deadline=None,
+            )
+            lesson_ids = list(
+                Lesson.objects.filter(section__course=course).values_list("id", flat=True)
+            )
+
+            for name, profile in profiles:
+                connections.close_all()
+                settings_dict.update(copy.deepcopy({**configured, **profile}))
+                try:
+                    self._run_profile(name, course, lesson_ids, options)
+                finally:
+                    settings_dict.update(copy.deepcopy(configured))
+
+        self.stdout.write(self.style.SUCCESS("Concurrent write benchmark finished."))
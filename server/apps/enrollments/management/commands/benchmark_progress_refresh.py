@@ -0,0 +1,73 @@
+"""
+Benchmark the progress recount that follows a lesson change.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.courses.models import Lesson
+from apps.enrollments.benchmarking import seed_course_with_enrollments
+from apps.enrollments.models import Enrollment
+from apps.enrollments.progress import process_refresh_queue
+from config.benchmarking import benchmark_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed an isolated database with one large course, add a lesson and "
+        "time the queued progress recount against per-enrollment updates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--enrollments", type=int, default=50000)
+        parser.add_argument("--lessons", type=int, default=20)
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=2000,
+            help="Enrollments timed with update_progress(), extrapolated.",
+        )
+
+    @staticmethod
+    def _per_row(sample, func):
+        start = time.perf_counter()
+        for enrollment in sample:
+            func(enrollment)
+        return (time.perf_counter() - start) / max(len(sample), 1)
+
+    def handle(self, *args, **options):
+        total = options["enrollments"]
+        with benchmark_database():
+            course = seed_course_with_enrollments(total, options["lessons"])
+            self.stdout.write(f"Seeded {total} enrollments.")
+
+            section = course.sections.get()
+            Lesson.objects.create(section=section, title="New lesson", order=999)
+
+            sample = list(
+                Enrollment.objects.filter(course=course).select_related("course")[
+                    : options["sample"]
+                ]
+            )
+            recount = self._per_row(sample, Enrollment.count_completed_lessons)
+            with transaction.atomic():
+                per_row = self._per_row(sample, Enrollment.update_progress)
+                # Roll back so the queued recount starts from the same rows
+                transaction.set_rollback(True)
+            self.stdout.write(
+                f"update_progress() loop: {per_row * total:8.2f} s "
+                f"(recount {recount * total:.2f} s + write "
+                f"{(per_row - recount) * total:.2f} s, extrapolated from {len(sample)})"
+            )
+
+            start = time.perf_counter()
+            courses, updated = process_refresh_queue()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"queued recount:         {elapsed:8.2f} s "
+                f"({courses} course, {updated} enrollments updated)"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Progress refresh benchmark finished."))
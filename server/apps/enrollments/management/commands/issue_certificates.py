@@ -0,0 +1,24 @@
+"""
+Issue certificates to completed enrollments that have none.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.enrollments.models import Certificate, Enrollment
+
+
+class Command(BaseCommand):
+    help = "Backfill certificates for completed enrollments without one."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        enrollment_ids = Enrollment.objects.filter(
+            completed_at__isnull=False, certificate__isnull=True
+        ).values_list("pk", flat=True)
+
+        issued = Certificate.objects.issue(
+            list(enrollment_ids), batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Issued {issued} certificate(s)."))
@@ -0,0 +1,33 @@
+"""
+Recount enrollment progress from the lesson progress rows.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.enrollments.models import Enrollment
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount completed lessons and progress percentages of enrollments. "
+        "Lesson completions update progress incrementally; run this "
+        "periodically to repair any drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            action="append",
+            dest="courses",
+            help="Only reconcile enrollments of the given course ID (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Enrollment.objects.all()
+        if options["courses"]:
+            queryset = queryset.filter(course_id__in=options["courses"])
+
+        updated = queryset.reconcile_progress()
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled progress of {updated} enrollment(s).")
+        )
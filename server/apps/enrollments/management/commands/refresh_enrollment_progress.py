@@ -0,0 +1,44 @@
+"""
+Worker that recounts enrollment progress of courses whose lessons changed.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.enrollments.progress import process_refresh_queue
+
+
+class Command(BaseCommand):
+    help = "Recount enrollment progress of courses queued by lesson changes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        total_courses = total_enrollments = 0
+        while True:
+            courses, enrollments = process_refresh_queue()
+            total_courses += courses
+            total_enrollments += enrollments
+            if not courses:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recounted {total_courses} course(s); "
+                f"{total_enrollments} enrollment(s) updated."
+            )
+        )
@@ -0,0 +1,69 @@
+"""
+Worker that renders certificate documents with a process pool.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.enrollments.documents import render_stale_certificates
+
+
+class Command(BaseCommand):
+    help = (
+        "Render certificates that have no document yet or were rendered "
+        "from an older template version."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=settings.CERTIFICATE_RENDER_WORKERS
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--format",
+            choices=["PDF", "PNG"],
+            default=settings.CERTIFICATE_DOCUMENT_FORMAT,
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=10.0,
+            help="Seconds to wait when every certificate is rendered.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once every certificate is rendered instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        rendered = 0
+        # Certificates that failed in this pass; retried after the next poll
+        failed = set()
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            map_func = lambda func, *iterables: pool.map(  # noqa: E731
+                func, *iterables, chunksize=8
+            )
+            while True:
+                failures = len(failed)
+                count = render_stale_certificates(
+                    options["batch_size"], map_func, options["format"], failed
+                )
+                rendered += count - (len(failed) - failures)
+                if not count:
+                    if options["once"]:
+                        break
+                    failed.clear()
+                    time.sleep(options["poll_interval"])
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {rendered} certificate(s) in {elapsed:.1f} s; "
+                f"{len(failed)} failed."
+            )
+        )
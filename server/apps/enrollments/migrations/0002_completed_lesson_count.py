@@ -0,0 +1,37 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_completed_lessons(apps, schema_editor):
+    Enrollment = apps.get_model("enrollments", "Enrollment")
+    LessonProgress = apps.get_model("enrollments", "LessonProgress")
+
+    completed = (
+        LessonProgress.objects.filter(enrollment=OuterRef("pk"), completed=True)
+        .order_by()
+        .values("enrollment")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Enrollment.objects.update(
+        completed_lesson_count=Coalesce(Subquery(completed), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_lesson_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_completed_lessons, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0002_completed_lesson_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressRefresh',
+            fields=[
+                ('course_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('requested_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Progress Refresh',
+                'verbose_name_plural': 'Progress Refresh Queue',
+                'db_table': 'progress_refresh_queue',
+                'ordering': ['requested_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.9 on 2026-10-17 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0003_progress_refresh_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='document',
+            field=models.FileField(blank=True, upload_to='certificates/'),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='document_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
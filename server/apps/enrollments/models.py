@@ -2,13 +2,121 @@
 Enrollment and progress tracking models.
 """
 
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 from apps.accounts.models import User
+from apps.analytics.services import invalidate_course_analytics
+from apps.courses.cache import invalidate_course
 from apps.courses.models import Course, Lesson
 import uuid
 
 
+class EnrollmentQuerySet(models.QuerySet):
+    """Custom queryset for enrollments."""
+
+    def with_resume_state(self):
+        """
+        Annotate where the student stands in each course, within the same
+        query: the first lesson (in course order) not completed yet and the
+        lesson accessed last, as correlated subqueries. The course,
+        instructor and certificate are joined.
+        """
+        lesson_completed = LessonProgress.objects.filter(
+            enrollment=models.OuterRef(models.OuterRef("pk")),
+            lesson=models.OuterRef("pk"),
+            completed=True,
+        )
+        next_lessons = (
+            Lesson.objects.filter(section__course=models.OuterRef("course_id"))
+            .filter(~models.Exists(lesson_completed))
+            .order_by("section__order", "order", "pk")
+        )
+        last_accessed = LessonProgress.objects.filter(
+            enrollment=models.OuterRef("pk")
+        ).order_by("-last_accessed")
+        return self.select_related("course__instructor", "certificate").annotate(
+            next_lesson_id=models.Subquery(next_lessons.values("pk")[:1]),
+            last_lesson_id=models.Subquery(
+                last_accessed.values("lesson_id")[:1], output_field=models.UUIDField()
+            ),
+            last_lesson_accessed_at=models.Subquery(
+                last_accessed.values("last_accessed")[:1]
+            ),
+        )
+
+    def reconcile_progress(self, batch_size=1000):
+        """
+        Recount completed lessons and progress of every enrollment in the
+        queryset with one grouped count. Both sides of the ratio come from
+        the rows: the completed progress rows of lessons still in the course,
+        and the course's lessons, so certificates are only issued for
+        enrollments whose lessons are really all completed. Enrollments that
+        end up with the same values are written together, in UPDATEs of at
+        most `batch_size` rows. Returns the number of enrollments updated.
+        """
+        enrollments = self.order_by()
+        completed_counts = dict(
+            LessonProgress.objects.filter(
+                completed=True,
+                enrollment__in=enrollments.values("pk"),
+                lesson__section__course=models.F("enrollment__course"),
+            )
+            .order_by()
+            .values_list("enrollment")
+            .annotate(total=models.Count("id"))
+        )
+        lesson_totals = dict(
+            Lesson.objects.filter(section__course__in=enrollments.values("course_id"))
+            .order_by()
+            .values_list("section__course")
+            .annotate(total=models.Count("id"))
+        )
+
+        # (completed lessons, progress, newly completed) -> enrollment ids
+        changes = {}
+        course_ids = set()
+        rows = enrollments.values_list(
+            "pk",
+            "course_id",
+            "completed_lesson_count",
+            "progress_percentage",
+            "completed_at",
+        )
+        for pk, course_id, stored_count, stored_progress, completed_at in rows.iterator(
+            chunk_size=batch_size
+        ):
+            completed = completed_counts.get(pk, 0)
+            total = lesson_totals.get(course_id, 0)
+            progress = Enrollment.progress_for(completed, total)
+            newly_completed = bool(total) and completed >= total and not completed_at
+            if (completed, progress) != (stored_count, stored_progress) or newly_completed:
+                changes.setdefault((completed, progress, newly_completed), []).append(pk)
+                course_ids.add(course_id)
+
+        now = timezone.now()
+        completed_pks = []
+        with transaction.atomic():
+            for (completed, progress, newly_completed), pks in changes.items():
+                values = {"completed_lesson_count": completed, "progress_percentage": progress}
+                if newly_completed:
+                    values["completed_at"] = now
+                    completed_pks.extend(pks)
+                for start in range(0, len(pks), batch_size):
+                    Enrollment.objects.filter(pk__in=pks[start:start + batch_size]).update(
+                        **values
+                    )
+            Certificate.objects.issue(completed_pks, batch_size=batch_size)
+
+            # The UPDATEs bypass the post_save receivers that invalidate these
+            for course_id in course_ids:
+                invalidate_course(course_id)
+                invalidate_course_analytics(course_id)
+        return sum(len(pks) for pks in changes.values())
+
+
 class Enrollment(models.Model):
     """Student enrollment in courses."""
 
@@ -27,6 +135,7 @@ class Enrollment(models.Model):
         default=0,  # type: ignore
         validators=[MinValueValidator(0), MaxValueValidator(100)],
     )
+    completed_lesson_count = models.PositiveIntegerField(default=0)
     completed_lessons = models.ManyToManyField(
         Lesson, through="LessonProgress", related_name="completed_by"
     )
@@ -36,6 +145,8 @@ class Enrollment(models.Model):
     last_accessed = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = EnrollmentQuerySet.as_manager()
+
     class Meta:
         db_table = "enrollments"
         verbose_name = "Enrollment"
@@ -51,25 +162,69 @@ class Enrollment(models.Model):
     def __str__(self):
         return f"{self.student.email} enrolled in {self.course.title}"
 
-    def update_progress(self):
-        """Calculate and update progress percentage."""
-        total_lessons = (
-            self.course.sections.aggregate(total=models.Count("lessons"))["total"] or 0  # type: ignore
+    @classmethod
+    def progress_for(cls, completed_lessons, total_lessons):
+        """Progress percentage of lesson counts, rounded as it is stored."""
+        if total_lessons == 0:
+            return Decimal("0.00")
+        field = cls._meta.get_field("progress_percentage")
+        # Counts may run ahead of the total until lesson deletions are reconciled
+        ratio = min(completed_lessons / total_lessons, 1)
+        return field.to_python(ratio * 100).quantize(
+            Decimal("0.01")
         )
 
-        if total_lessons == 0:
-            self.progress_percentage = 0
-        else:
-            completed = self.lesson_progress.filter(completed=True).count()  # type: ignore
-            self.progress_percentage = (completed / total_lessons) * 100
+    def set_progress(self, completed_lessons, total_lessons):
+        """Derive the progress percentage from lesson counts."""
+        self.completed_lesson_count = completed_lessons
+        self.progress_percentage = self.progress_for(completed_lessons, total_lessons)
 
         # Mark as completed if 100%
         if self.progress_percentage >= 100 and not self.completed_at:
-            from django.utils import timezone
-
             self.completed_at = timezone.now()
 
-        self.save(update_fields=["progress_percentage", "completed_at"])
+    def record_completed_lessons(self, count=1):
+        """
+        Count newly completed lessons without recounting the progress rows:
+        the stored counter is incremented and divided by the course's cached
+        lesson total.
+        """
+        with transaction.atomic():
+            completed, self.completed_at, total = (
+                Enrollment.objects.select_for_update(of=("self",))
+                .filter(pk=self.pk)
+                .values_list("completed_lesson_count", "completed_at", "course__lesson_count")
+                .get()
+            )
+            completed += count
+            if total and completed >= total and not self.completed_at:
+                # The counter may still include lessons deleted since; the
+                # completion and its certificate are final, so recount first
+                completed = self.count_completed_lessons()
+            self.set_progress(completed, total)
+            self._save_progress()
+
+    def count_completed_lessons(self):
+        """Count the completed lesson progress rows of this enrollment."""
+        return self.lesson_progress.filter(completed=True).count()  # type: ignore
+
+    def update_progress(self):
+        """
+        Recount completed lessons and update the progress percentage.
+        Used by the reconciler; lesson completions use
+        `record_completed_lessons`.
+        """
+        self.set_progress(self.count_completed_lessons(), self.course.lesson_count)
+        self._save_progress()
+
+    def _save_progress(self):
+        """Save the progress fields; issue the certificate on completion."""
+        with transaction.atomic():
+            self.save(
+                update_fields=["completed_lesson_count", "progress_percentage", "completed_at"]
+            )
+            if self.completed_at:
+                Certificate.objects.issue([self.pk])
 
 
 class LessonProgress(models.Model):
@@ -109,15 +264,96 @@ class LessonProgress(models.Model):
 
     def mark_complete(self):
         """Mark lesson as completed."""
-        if not self.completed:
-            from django.utils import timezone
+        if self.completed:
+            return
 
-            self.completed = True
-            self.completed_at = timezone.now()
-            self.save(update_fields=["completed", "completed_at"])
+        with transaction.atomic():
+            # Only the request that flips the row counts the lesson
+            updated = LessonProgress.objects.filter(pk=self.pk, completed=False).update(
+                completed=True, completed_at=timezone.now()
+            )
+            if updated:
+                # Update enrollment progress
+                self.enrollment.record_completed_lessons()
+        self.refresh_from_db(fields=["completed", "completed_at"])
+
+
+class ProgressRefresh(models.Model):
+    """
+    A course whose enrollments need their progress recounted because its
+    lessons changed. Rows are written in the transaction of the lesson change
+    and consumed by the `refresh_enrollment_progress` worker.
+    """
+
+    # No foreign key: the row may outlive a course deleted in the same transaction
+    course_id = models.UUIDField(primary_key=True)
+    requested_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "progress_refresh_queue"
+        verbose_name = "Progress Refresh"
+        verbose_name_plural = "Progress Refresh Queue"
+        ordering = ["requested_at"]
+
+    def __str__(self):
+        return f"Refresh progress of course {self.course_id}"
+
+
+# Crockford's base32: no I, L, O or U, so numbers are easy to read out
+CERTIFICATE_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+CERTIFICATE_LOOKALIKES = str.maketrans({"I": "1", "L": "1", "O": "0"})
 
-            # Update enrollment progress
-            self.enrollment.update_progress()
+
+class CertificateManager(models.Manager):
+    """Manager issuing course completion certificates."""
+
+    def issue(self, enrollment_ids, batch_size=1000):
+        """
+        Issue certificates to the given enrollments that are completed and
+        have none yet, with one bulk INSERT per batch. Returns the number of
+        certificates created.
+        """
+        enrollment_ids = list(enrollment_ids)
+        created = 0
+        for start in range(0, len(enrollment_ids), batch_size):
+            missing = list(
+                Enrollment.objects.filter(
+                    pk__in=enrollment_ids[start:start + batch_size],
+                    completed_at__isnull=False,
+                    certificate__isnull=True,
+                ).values_list("pk", flat=True)
+            )
+            if not missing:
+                continue
+
+            with transaction.atomic():
+                existing = self.filter(enrollment_id__in=missing).count()
+                # Numbers derive from the enrollment, so a concurrent issue of
+                # the same certificate is a conflict on the enrollment and is
+                # skipped; bulk_create() still returns the skipped rows, so
+                # the inserted ones are counted
+                self.bulk_create(
+                    [
+                        Certificate(
+                            enrollment_id=enrollment_id,
+                            certificate_number=Certificate.number_for(enrollment_id),
+                        )
+                        for enrollment_id in missing
+                    ],
+                    ignore_conflicts=True,
+                )
+                created += self.filter(enrollment_id__in=missing).count() - existing
+        return created
+
+    def verify(self, number):
+        """Look up a certificate by number, tolerating case and separators."""
+        raw = "".join(number.split()).replace("-", "").upper()
+        candidates = {raw, raw.translate(CERTIFICATE_LOOKALIKES)}
+        return (
+            self.select_related("enrollment__student", "enrollment__course")
+            .filter(certificate_number__in=candidates)
+            .first()
+        )
 
 
 class Certificate(models.Model):
@@ -130,6 +366,12 @@ class Certificate(models.Model):
     certificate_number = models.CharField(max_length=100, unique=True, db_index=True)
     issued_at = models.DateTimeField(auto_now_add=True)
 
+    # Rendered document, named by its content hash (see documents.py)
+    document = models.FileField(upload_to="certificates/", blank=True)
+    document_version = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+
+    objects = CertificateManager()
+
     class Meta:
         db_table = "certificates"
         verbose_name = "Certificate"
@@ -141,13 +383,21 @@ class Certificate(models.Model):
             f"Certificate {self.certificate_number} for {self.enrollment.student.email}"
         )
 
+    @staticmethod
+    def number_for(enrollment_id):
+        """
+        Certificate number of an enrollment: its 128-bit UUID in base32
+        (26 characters). Distinct enrollments can never share a number.
+        """
+        value = uuid.UUID(str(enrollment_id)).int
+        digits = []
+        for _ in range(26):
+            value, digit = divmod(value, 32)
+            digits.append(CERTIFICATE_ALPHABET[digit])
+        return "".join(reversed(digits))
+
     def save(self, *args, **kwargs):
         """Auto-generate certificate number."""
         if not self.certificate_number:
-            import random
-            import string
-
-            self.certificate_number = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=12)
-            )
+            self.certificate_number = self.number_for(self.enrollment_id)
         super().save(*args, **kwargs)
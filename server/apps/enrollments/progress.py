@@ -0,0 +1,61 @@
+"""
+Background recount of enrollment progress after course structure changes.
+
+Adding, removing or moving a lesson changes the lesson total of a course and
+so the progress of every enrollment in it. The lesson signal only queues the
+course (one upserted ProgressRefresh row, however many lessons changed); the
+worker then recounts all of its enrollments with one grouped count and
+chunked bulk updates.
+"""
+
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Enrollment, ProgressRefresh
+
+logger = logging.getLogger(__name__)
+
+
+def request_progress_refresh(course_ids):
+    """Queue the given courses for a progress recount."""
+    now = timezone.now()
+    ProgressRefresh.objects.bulk_create(
+        [
+            ProgressRefresh(course_id=course_id, requested_at=now)
+            for course_id in set(course_ids)
+            if course_id
+        ],
+        update_conflicts=True,
+        unique_fields=["course_id"],
+        update_fields=["requested_at"],
+    )
+
+
+def refresh_course_progress(course_id):
+    """Recount the progress of every enrollment in a course."""
+    return Enrollment.objects.filter(course_id=course_id).reconcile_progress(
+        batch_size=settings.PROGRESS_REFRESH_BATCH_SIZE
+    )
+
+
+def process_refresh_queue(limit=None):
+    """
+    Recount the queued courses, oldest request first. A course queued again
+    while it was being recounted stays queued for the next pass.
+    Returns (courses processed, enrollments updated).
+    """
+    queued = ProgressRefresh.objects.values_list("course_id", "requested_at")
+    if limit:
+        queued = queued[:limit]
+
+    courses = enrollments = 0
+    for course_id, requested_at in list(queued):
+        enrollments += refresh_course_progress(course_id)
+        ProgressRefresh.objects.filter(
+            course_id=course_id, requested_at=requested_at
+        ).delete()
+        courses += 1
+        logger.info(f"Recounted enrollment progress of course {course_id}")
+    return courses, enrollments
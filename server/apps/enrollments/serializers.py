@@ -1,5 +1,8 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Enrollment, LessonProgress, Certificate
+from apps.courses.models import Course
 from apps.courses.serializers import CourseListSerializer
 
 
@@ -13,6 +16,59 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'student', 'progress_percentage', 'enrolled_at', 'last_accessed', 'completed_at')
 
 
+class DashboardCourseSerializer(serializers.ModelSerializer):
+    instructor_name = serializers.CharField(source='instructor.get_full_name', read_only=True)
+    total_lessons = serializers.IntegerField(source='lesson_count', read_only=True)
+
+    class Meta:
+        model = Course
+        fields = ('id', 'title', 'slug', 'thumbnail', 'instructor_name', 'total_lessons')
+
+
+class EnrollmentDashboardSerializer(serializers.ModelSerializer):
+    """
+    Enrollment with its resume state, for querysets built with
+    `Enrollment.objects.with_resume_state()`. Lesson details are looked up
+    in the `lessons` context dict ({lesson id: lesson values}).
+    """
+
+    course = DashboardCourseSerializer(read_only=True)
+    completed_lessons = serializers.IntegerField(source='completed_lesson_count', read_only=True)
+    next_lesson = serializers.SerializerMethodField()
+    last_lesson = serializers.SerializerMethodField()
+    certificate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Enrollment
+        fields = (
+            'id', 'course', 'progress_percentage', 'completed_lessons', 'enrolled_at',
+            'last_accessed', 'completed_at', 'next_lesson', 'last_lesson', 'certificate',
+        )
+
+    def _lesson(self, lesson_id):
+        return self.context['lessons'].get(lesson_id) if lesson_id else None
+
+    def get_next_lesson(self, obj):
+        return self._lesson(obj.next_lesson_id)
+
+    def get_last_lesson(self, obj):
+        lesson = self._lesson(obj.last_lesson_id)
+        if lesson is None:
+            return None
+        return {**lesson, 'accessed_at': obj.last_lesson_accessed_at}
+
+    def get_certificate(self, obj):
+        try:
+            certificate = obj.certificate
+        except Certificate.DoesNotExist:
+            return None
+        return {
+            'id': certificate.id,
+            'certificate_number': certificate.certificate_number,
+            'issued_at': certificate.issued_at,
+        }
+
+
 class LessonProgressSerializer(serializers.ModelSerializer):
     lesson_title = serializers.CharField(source='lesson.title', read_only=True)
     
@@ -22,8 +78,39 @@ class LessonProgressSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'enrollment', 'started_at', 'completed_at', 'last_accessed')
 
 
+class LessonProgressEventSerializer(serializers.Serializer):
+    lesson = serializers.UUIDField()
+    watched_duration = serializers.IntegerField(min_value=0, default=0)
+    completed = serializers.BooleanField(default=False)
+
+
+class LessonProgressBatchSerializer(serializers.Serializer):
+    events = serializers.ListField(
+        child=LessonProgressEventSerializer(),
+        allow_empty=False,
+        max_length=settings.PROGRESS_BATCH_MAX_EVENTS,
+    )
+
+
 class CertificateSerializer(serializers.ModelSerializer):
+    student_name = serializers.CharField(source='enrollment.student.get_full_name', read_only=True)
+    course_id = serializers.UUIDField(source='enrollment.course_id', read_only=True)
+    course_title = serializers.CharField(source='enrollment.course.title', read_only=True)
+    completed_at = serializers.DateTimeField(source='enrollment.completed_at', read_only=True)
+    document_url = serializers.SerializerMethodField()
+
     class Meta:
         model = Certificate
-        fields = '__all__'
-        read_only_fields = ('id', 'certificate_number', 'issued_at')
+        fields = (
+            'id', 'certificate_number', 'enrollment', 'student_name', 'course_id',
+            'course_title', 'completed_at', 'issued_at', 'document_url',
+        )
+        read_only_fields = fields
+
+    def get_document_url(self, obj):
+        """Rendered document, or None until the render worker has run."""
+        if not obj.document:
+            return None
+        url = reverse('certificate-document', args=[obj.document.name.rsplit('/', 1)[-1]])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,214 @@
+"""
+Enrollment services with race-free seat reservation.
+"""
+
+import uuid
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from apps.courses.models import Course, CourseStatus, Lesson
+from .models import Enrollment, LessonProgress
+
+
+class EnrollmentOutcome(models.TextChoices):
+    """Result of an enrollment attempt."""
+
+    ENROLLED = "ENROLLED", "Enrolled successfully"
+    ALREADY_ENROLLED = "ALREADY_ENROLLED", "Already enrolled"
+    COURSE_FULL = "COURSE_FULL", "Course is full"
+    ADMISSION_CLOSED = "ADMISSION_CLOSED", "Admission deadline has passed"
+    NOT_FOUND = "NOT_FOUND", "Course not found"
+
+
+def _open_courses(course_id, today):
+    """Courses that can take one more student right now."""
+    return Course.objects.filter(
+        Q(admission_deadline__isnull=True) | Q(admission_deadline__gte=today),
+        pk=course_id,
+        status=CourseStatus.PUBLISHED,
+        available_seats__gt=0,
+    )
+
+
+def _rejection_reason(course_id, today):
+    """Explain why a seat could not be reserved."""
+    course = (
+        Course.objects.filter(pk=course_id, status=CourseStatus.PUBLISHED)
+        .only("admission_deadline", "available_seats")
+        .first()
+    )
+    if course is None:
+        return EnrollmentOutcome.NOT_FOUND
+    if course.admission_deadline and course.admission_deadline < today:
+        return EnrollmentOutcome.ADMISSION_CLOSED
+    return EnrollmentOutcome.COURSE_FULL
+
+
+def enroll_student(student, course_id):
+    """
+    Enroll a student in a published course.
+
+    The seat is reserved with a single conditional UPDATE
+    (available_seats > 0, admission open), so concurrent requests can never
+    oversell a course. Returns an (EnrollmentOutcome, Enrollment | None) tuple.
+    """
+    try:
+        course_id = uuid.UUID(str(course_id))
+    except ValueError:
+        return EnrollmentOutcome.NOT_FOUND, None
+
+    enrollment = Enrollment.objects.filter(student=student, course_id=course_id).first()
+    if enrollment:
+        return EnrollmentOutcome.ALREADY_ENROLLED, enrollment
+
+    today = timezone.now().date()
+    try:
+        with transaction.atomic():
+            reserved = _open_courses(course_id, today).update(
+                available_seats=F("available_seats") - 1,
+                enrollment_count=F("enrollment_count") + 1,
+            )
+            if not reserved:
+                return _rejection_reason(course_id, today), None
+
+            enrollment = Enrollment.objects.create(student=student, course_id=course_id)
+    except IntegrityError:
+        # A concurrent request enrolled the same student; the seat was rolled back.
+        enrollment = Enrollment.objects.get(student=student, course_id=course_id)
+        return EnrollmentOutcome.ALREADY_ENROLLED, enrollment
+
+    return EnrollmentOutcome.ENROLLED, enrollment
+
+
+@transaction.atomic
+def cancel_enrollment(enrollment):
+    """Delete an enrollment and release its seat."""
+    course_id = enrollment.course_id
+    enrollment.delete()
+    Course.objects.filter(pk=course_id).update(
+        available_seats=Least(F("available_seats") + 1, F("total_seats")),
+        enrollment_count=Greatest(F("enrollment_count") - 1, 0),
+    )
+
+
+def coalesce_progress_events(events):
+    """
+    Merge progress events per lesson: the furthest watched position wins and
+    a lesson reported completed once stays completed.
+    """
+    merged = {}
+    for event in events:
+        lesson_id = event["lesson"]
+        watched, completed = merged.get(lesson_id, (0, False))
+        merged[lesson_id] = (
+            max(watched, event.get("watched_duration", 0)),
+            completed or event.get("completed", False),
+        )
+    return merged
+
+
+def record_lesson_progress(student, events):
+    """
+    Apply a batch of (lesson, watched_duration, completed) events for a
+    student in one transaction.
+
+    Events are coalesced per lesson; missing LessonProgress rows are inserted
+    in one query and the rest updated with one bulk UPDATE. Progress is only
+    advanced for enrollments that gained completed lessons, once each.
+    Returns a summary with the lessons that were rejected because they do not
+    exist or the student is not enrolled in their course.
+    """
+    merged = coalesce_progress_events(events)
+
+    lesson_courses = dict(
+        Lesson.objects.filter(pk__in=list(merged)).values_list("id", "section__course_id")
+    )
+    enrollment_ids = dict(
+        Enrollment.objects.filter(
+            student=student, course_id__in=set(lesson_courses.values())
+        ).values_list("course_id", "id")
+    )
+    targets = {
+        (enrollment_ids[course_id], lesson_id): merged[lesson_id]
+        for lesson_id, course_id in lesson_courses.items()
+        if course_id in enrollment_ids
+    }
+    accepted = {lesson_id for _, lesson_id in targets}
+    rejected = [lesson_id for lesson_id in merged if lesson_id not in accepted]
+
+    now = timezone.now()
+    newly_completed = {}
+    with transaction.atomic():
+        # Create missing rows first so concurrent batches converge on one row
+        LessonProgress.objects.bulk_create(
+            [
+                LessonProgress(enrollment_id=enrollment_id, lesson_id=lesson_id)
+                for enrollment_id, lesson_id in targets
+            ],
+            ignore_conflicts=True,
+        )
+        rows = LessonProgress.objects.select_for_update().filter(
+            enrollment_id__in={enrollment_id for enrollment_id, _ in targets},
+            lesson_id__in=accepted,
+        )
+
+        changed = []
+        for progress in rows:
+            key = (progress.enrollment_id, progress.lesson_id)
+            if key not in targets:
+                continue
+            watched, completed = targets[key]
+            progress.watched_duration = max(progress.watched_duration, watched)
+            if completed and not progress.completed:
+                progress.completed = True
+                progress.completed_at = now
+                newly_completed[progress.enrollment_id] = (
+                    newly_completed.get(progress.enrollment_id, 0) + 1
+                )
+            progress.last_accessed = now
+            changed.append(progress)
+
+        LessonProgress.objects.bulk_update(
+            changed, ["watched_duration", "completed", "completed_at", "last_accessed"]
+        )
+
+        enrollments = list(Enrollment.objects.filter(pk__in=newly_completed))
+        for enrollment in enrollments:
+            enrollment.record_completed_lessons(newly_completed[enrollment.pk])
+
+    return {
+        "processed": len(changed),
+        "completed_enrollments": [
+            enrollment.id for enrollment in enrollments if enrollment.completed_at
+        ],
+        "rejected": rejected,
+    }
+
+
+def resume_lessons(enrollments):
+    """
+    Details of the next and last lessons of enrollments annotated by
+    `with_resume_state()`, fetched in one query: {lesson id: values}.
+    """
+    lesson_ids = {
+        lesson_id
+        for enrollment in enrollments
+        for lesson_id in (enrollment.next_lesson_id, enrollment.last_lesson_id)
+        if lesson_id
+    }
+    lessons = Lesson.objects.filter(pk__in=lesson_ids).values(
+        "id", "title", "lesson_type", "section_id", "section__title"
+    )
+    return {
+        lesson["id"]: {
+            "id": lesson["id"],
+            "title": lesson["title"],
+            "lesson_type": lesson["lesson_type"],
+            "section_id": lesson["section_id"],
+            "section_title": lesson["section__title"],
+        }
+        for lesson in lessons
+    }
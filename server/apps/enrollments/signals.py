@@ -1,7 +1,11 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 import logging
 
+from apps.courses.cache import invalidate_course
+from apps.courses.models import Section
+from .progress import request_progress_refresh
+
 logger = logging.getLogger(__name__)
 
 
@@ -9,3 +13,41 @@ logger = logging.getLogger(__name__)
 def enrollment_post_save(sender, instance, created, **kwargs):
     if created:
         logger.info(f"New enrollment: {instance.student.email} in {instance.course.title}")
+        # Seat and enrollment counters are part of the cached course payload
+        invalidate_course(instance.course_id)
+
+
+@receiver(post_delete, sender='enrollments.Enrollment')
+def enrollment_post_delete(sender, instance, **kwargs):
+    invalidate_course(instance.course_id)
+
+
+def _section_courses(*section_ids):
+    return Section.objects.filter(pk__in=section_ids).values_list("course_id", flat=True)
+
+
+@receiver(post_save, sender='courses.Lesson')
+def lesson_post_save_progress(sender, instance, created, raw=False, **kwargs):
+    """A new or moved lesson changes the lesson total of its course(s)."""
+    if raw:
+        return
+    if created:
+        request_progress_refresh(_section_courses(instance.section_id))
+        return
+
+    previous = getattr(instance, "_previous_structure", None)
+    if previous and previous[0] != instance.section_id:
+        request_progress_refresh(_section_courses(previous[0], instance.section_id))
+
+
+@receiver(post_delete, sender='courses.Lesson')
+def lesson_post_delete_progress(sender, instance, **kwargs):
+    request_progress_refresh(_section_courses(instance.section_id))
+
+
+@receiver(post_save, sender='courses.Section')
+def section_post_save_progress(sender, instance, created, raw=False, **kwargs):
+    """Moving a section moves its lessons between courses."""
+    previous_course_id = getattr(instance, "_previous_course_id", None)
+    if not raw and previous_course_id and previous_course_id != instance.course_id:
+        request_progress_refresh([previous_course_id, instance.course_id])
@@ -0,0 +1,343 @@
+import shutil
+import tempfile
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, UserRole
+from apps.analytics.services import instructor_namespace
+from apps.courses.cache import course_version
+from apps.courses.models import Category, Course, CourseStatus, Lesson, Section
+from config.cache import get_version
+
+from . import documents
+from .models import Certificate, Enrollment, LessonProgress
+from .services import EnrollmentOutcome, enroll_student, record_lesson_progress
+
+
+def create_course(**kwargs):
+    instructor = User.objects.create_user(
+        email=f"instructor-{Course.objects.count()}@example.com",
+        password="Passw0rd!x",
+        role=UserRole.INSTRUCTOR,
+    )
+    category, _ = Category.objects.get_or_create(name="Programming", slug="programming")
+    index = Course.objects.count()
+    fields = {
+        "title": f"Course {index}",
+        "slug": f"course-{index}",
+        "description": "Description",
+        "short_description": "Short description",
+        "learning_outcomes": "Outcomes",
+        "price": Decimal("10.00"),
+        "status": CourseStatus.PUBLISHED,
+        **kwargs,
+    }
+    return Course.objects.create(instructor=instructor, category=category, **fields)
+
+
+def create_lessons(course, count):
+    section = Section.objects.create(course=course, title="Section", order=1)
+    return [
+        Lesson.objects.create(section=section, title=f"Lesson {index}", order=index)
+        for index in range(count)
+    ]
+
+
+class ConcurrentEnrollmentTests(TransactionTestCase):
+    def setUp(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("Needs a file-backed database shared between threads")
+
+    def test_parallel_enrollments_do_not_oversell(self):
+        course = create_course(total_seats=3, available_seats=3)
+        students = [
+            User.objects.create_user(email=f"student-{index}@example.com", password="!")
+            for index in range(10)
+        ]
+        outcomes = []
+        barrier = threading.Barrier(len(students))
+
+        def enroll(student):
+            barrier.wait()
+            try:
+                outcomes.append(enroll_student(student, course.pk)[0])
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=enroll, args=(student,)) for student in students]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count(EnrollmentOutcome.ENROLLED), 3)
+        self.assertEqual(outcomes.count(EnrollmentOutcome.COURSE_FULL), 7)
+        course.refresh_from_db()
+        self.assertEqual((course.available_seats, course.enrollment_count), (0, 3))
+        self.assertEqual(Enrollment.objects.filter(course=course).count(), 3)
+
+
+class DashboardPaginationTests(TestCase):
+    def test_cursor_pagination_falls_back_for_expression_ordering(self):
+        student = User.objects.create_user(
+            email="student@example.com", password="Passw0rd!x", email_verified=True
+        )
+        for _ in range(3):
+            enroll_student(student, create_course().pk)
+        client = APIClient()
+        client.force_authenticate(student)
+
+        response = client.get(
+            "/api/v1/enrollments/enrollments/dashboard/",
+            {"pagination": "cursor", "page_size": 2},
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["count"], 3)
+        self.assertEqual(len(response.json()["results"]["data"]), 2)
+
+
+class LessonProgressTests(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(
+            email="student@example.com", password="Passw0rd!x", email_verified=True
+        )
+        self.course = create_course()
+        self.lessons = create_lessons(self.course, 3)
+        self.enrollment = enroll_student(self.student, self.course.pk)[1]
+
+    def progress_of(self, enrollment):
+        enrollment.refresh_from_db()
+        return (
+            enrollment.completed_lesson_count,
+            enrollment.progress_percentage,
+            enrollment.completed_at is not None,
+        )
+
+    def assert_matches_recount(self):
+        """The incremental progress equals a full recount of the rows."""
+        incremental = self.progress_of(self.enrollment)
+        recounted = Enrollment.objects.get(pk=self.enrollment.pk)
+        recounted.update_progress()
+        self.assertEqual(incremental, self.progress_of(recounted))
+
+    def test_incremental_progress_matches_recount(self):
+        first = LessonProgress.objects.create(
+            enrollment=self.enrollment, lesson=self.lessons[0]
+        )
+        first.mark_complete()
+        self.assert_matches_recount()
+        first.mark_complete()
+        self.assert_matches_recount()
+
+        record_lesson_progress(
+            self.student,
+            [
+                {"lesson": lesson.pk, "completed": True}
+                for lesson in self.lessons[:2]
+            ],
+        )
+        self.assert_matches_recount()
+
+        LessonProgress.objects.create(
+            enrollment=self.enrollment, lesson=self.lessons[2]
+        ).mark_complete()
+        self.assert_matches_recount()
+        self.assertEqual(
+            self.progress_of(self.enrollment), (3, Decimal("100.00"), True)
+        )
+
+    def test_concurrent_completions_count_once(self):
+        progress = LessonProgress.objects.create(
+            enrollment=self.enrollment, lesson=self.lessons[0]
+        )
+        # Two requests that both loaded the row before either completed it
+        stale = LessonProgress.objects.get(pk=progress.pk)
+        progress.mark_complete()
+        stale.mark_complete()
+
+        self.assertTrue(stale.completed)
+        self.assertEqual(
+            self.progress_of(self.enrollment), (1, Decimal("33.33"), False)
+        )
+        self.assert_matches_recount()
+
+    def test_stale_count_does_not_complete_the_enrollment(self):
+        lesson = Lesson.objects.create(
+            section=self.lessons[0].section, title="Lesson 3", order=3
+        )
+        for completed in self.lessons[:2]:
+            LessonProgress.objects.create(
+                enrollment=self.enrollment, lesson=completed
+            ).mark_complete()
+        # Deleted before the progress refresh worker recounts: the counter
+        # still holds 2 completed lessons out of now 3
+        self.lessons[0].delete()
+
+        LessonProgress.objects.create(
+            enrollment=self.enrollment, lesson=lesson
+        ).mark_complete()
+
+        self.assertEqual(
+            self.progress_of(self.enrollment), (2, Decimal("66.67"), False)
+        )
+        self.assertFalse(Certificate.objects.exists())
+
+    def test_progress_is_capped_at_100(self):
+        self.assertEqual(Enrollment.progress_for(4, 3), Decimal("100.00"))
+
+
+class ReconcileProgressTests(TestCase):
+    def setUp(self):
+        student = User.objects.create_user(email="student@example.com", password="!")
+        self.course = create_course()
+        self.lessons = create_lessons(self.course, 3)
+        self.enrollment = enroll_student(student, self.course.pk)[1]
+        for lesson in self.lessons[:2]:
+            LessonProgress.objects.create(
+                enrollment=self.enrollment, lesson=lesson, completed=True
+            )
+
+    def reconcile(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Enrollment.objects.filter(course=self.course).reconcile_progress()
+
+    def test_stale_lesson_total_does_not_issue_certificates(self):
+        # The cached total lags behind a lesson added meanwhile
+        Course.objects.filter(pk=self.course.pk).update(lesson_count=2)
+
+        self.assertEqual(self.reconcile(), 1)
+
+        self.enrollment.refresh_from_db()
+        self.assertEqual(
+            (self.enrollment.progress_percentage, self.enrollment.completed_at),
+            (Decimal("66.67"), None),
+        )
+        self.assertFalse(Certificate.objects.exists())
+
+    def test_reconciled_completion_issues_certificate_and_invalidates(self):
+        LessonProgress.objects.create(
+            enrollment=self.enrollment, lesson=self.lessons[2], completed=True
+        )
+        versions = (
+            course_version(self.course.pk),
+            get_version(instructor_namespace(self.course.instructor_id)),
+        )
+
+        self.assertEqual(self.reconcile(), 1)
+
+        self.assertTrue(Certificate.objects.filter(enrollment=self.enrollment).exists())
+        self.assertNotEqual(versions[0], course_version(self.course.pk))
+        self.assertNotEqual(
+            versions[1], get_version(instructor_namespace(self.course.instructor_id))
+        )
+        # Nothing left to reconcile: nothing is written or invalidated
+        versions = course_version(self.course.pk)
+        self.assertEqual(self.reconcile(), 0)
+        self.assertEqual(versions, course_version(self.course.pk))
+
+
+class CertificateIssueTests(TestCase):
+    def setUp(self):
+        self.enrollments = []
+        for index in range(3):
+            student = User.objects.create_user(
+                email=f"student-{index}@example.com", password="!"
+            )
+            self.enrollments.append(enroll_student(student, create_course().pk)[1])
+        Enrollment.objects.update(completed_at=timezone.now())
+
+    def test_counts_inserted_certificates(self):
+        first, second, third = (enrollment.pk for enrollment in self.enrollments)
+        # A conflicting row, as a concurrent issue would leave: the insert of
+        # the second certificate is skipped
+        Certificate.objects.create(
+            enrollment_id=first, certificate_number=Certificate.number_for(second)
+        )
+
+        self.assertEqual(Certificate.objects.issue([first, second, third]), 1)
+        self.assertEqual(Certificate.objects.issue([first, second, third]), 0)
+        self.assertEqual(Certificate.objects.count(), 2)
+
+
+class CertificateDocumentTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.certificates = []
+        for index in range(3):
+            student = User.objects.create_user(
+                email=f"student-{index}@example.com", password="!", email_verified=True
+            )
+            enrollment = enroll_student(student, create_course().pk)[1]
+            Enrollment.objects.filter(pk=enrollment.pk).update(completed_at=timezone.now())
+            Certificate.objects.issue([enrollment.pk])
+            self.certificates.append(Certificate.objects.get(enrollment=enrollment))
+
+    def download(self, certificate):
+        client = APIClient()
+        client.force_authenticate(certificate.enrollment.student)
+        response = client.get(f"/api/v1/enrollments/certificates/{certificate.pk}/")
+        return client.get(response.json()["document_url"])
+
+    def test_new_template_keeps_the_previous_document(self):
+        certificate = self.certificates[0]
+        previous = documents.store_document(certificate, b"version 1", "PDF")
+        certificate.refresh_from_db()
+
+        name = documents.store_document(certificate, b"version 2", "PDF")
+
+        certificate.refresh_from_db()
+        self.assertEqual(certificate.document.name, name)
+        self.assertTrue(default_storage.exists(previous))
+
+    def test_records_the_name_chosen_by_the_storage(self):
+        certificate = self.certificates[0]
+        documents.store_document(certificate, b"content", "PDF")
+        exists = default_storage.exists
+        checks = []
+
+        def exists_once_missing(name):
+            # A concurrent worker saves the same document after this check
+            checks.append(name)
+            return len(checks) > 1 and exists(name)
+
+        with mock.patch.object(default_storage, "exists", exists_once_missing):
+            name = documents.store_document(certificate, b"content", "PDF")
+
+        self.assertNotEqual(name, documents.document_name(b"content", "PDF"))
+        certificate.refresh_from_db()
+        self.assertEqual(certificate.document.name, name)
+        response = self.download(certificate)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"content")
+
+    def test_failures_do_not_stop_the_batch(self):
+        broken = self.certificates[1]
+        render = documents.render_certificate
+
+        def render_or_fail(payload, document_format):
+            if payload["certificate_number"] == broken.certificate_number:
+                raise OSError("font missing")
+            return render(payload, document_format)
+
+        failed = set()
+        with mock.patch.object(documents, "render_certificate", render_or_fail):
+            self.assertEqual(documents.render_stale_certificates(10, failed=failed), 3)
+            # The failed certificate is not retried within the same run
+            self.assertEqual(documents.render_stale_certificates(10, failed=failed), 0)
+
+        self.assertEqual(failed, {broken.pk})
+        self.assertEqual(list(documents.stale_certificates()), [broken])
+        self.assertEqual(self.download(self.certificates[0]).status_code, 200)
@@ -1,11 +1,22 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
-from .views import EnrollmentViewSet, LessonProgressViewSet
+from .views import (
+    CertificateDocumentView,
+    CertificateViewSet,
+    EnrollmentViewSet,
+    LessonProgressViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'enrollments', EnrollmentViewSet, basename='enrollment')
 router.register(r'progress', LessonProgressViewSet, basename='lesson-progress')
+router.register(r'certificates', CertificateViewSet, basename='certificate')
 
 urlpatterns = [
+    re_path(
+        r'^certificates/documents/(?P<name>[0-9a-f]{64}(?:_[A-Za-z0-9]+)?\.(?:pdf|png))$',
+        CertificateDocumentView.as_view(),
+        name='certificate-document',
+    ),
     path('', include(router.urls)),
 ]
@@ -1,15 +1,28 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.core.files.storage import default_storage
 from django.db import transaction
+from django.db.models import F
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from rest_framework.views import APIView
+from .documents import CONTENT_TYPES
 from .models import Enrollment, LessonProgress, Certificate
 from .serializers import (
     EnrollmentSerializer,
+    EnrollmentDashboardSerializer,
     LessonProgressSerializer,
+    LessonProgressBatchSerializer,
     CertificateSerializer,
 )
-from apps.courses.models import Course
+from .services import (
+    EnrollmentOutcome,
+    cancel_enrollment,
+    enroll_student,
+    record_lesson_progress,
+    resume_lessons,
+)
 
 
 class EnrollmentViewSet(viewsets.ModelViewSet):
@@ -21,37 +34,67 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_authenticated:
             return Enrollment.objects.none()
         return Enrollment.objects.filter(student=self.request.user).select_related(
-            "course", "student"
+            "course__instructor", "course__category", "student"
         )
 
-    @transaction.atomic
     def create(self, request, *args, **kwargs):
-        course_id = request.data.get("course")
-        try:
-            course = Course.objects.get(id=course_id, status="PUBLISHED")
-        except Course.DoesNotExist:
+        outcome, enrollment = enroll_student(request.user, request.data.get("course"))
+
+        if enrollment is None:
+            error_status = {
+                EnrollmentOutcome.NOT_FOUND: status.HTTP_404_NOT_FOUND,
+                EnrollmentOutcome.COURSE_FULL: status.HTTP_409_CONFLICT,
+            }.get(outcome, status.HTTP_400_BAD_REQUEST)
             return Response(
-                {"success": False, "error": {"message": "Course not found"}},
-                status=status.HTTP_404_NOT_FOUND,
+                {
+                    "success": False,
+                    "error": {"message": outcome.label, "code": outcome.value},
+                },
+                status=error_status,
             )
 
-        enrollment, created = Enrollment.objects.get_or_create(
-            student=request.user, course=course
-        )
-
-        if created:
-            course.enrollment_count += 1
-            course.save(update_fields=["enrollment_count"])
-
+        created = outcome == EnrollmentOutcome.ENROLLED
         return Response(
             {
                 "success": True,
-                "message": "Enrolled successfully" if created else "Already enrolled",
+                "message": outcome.label,
                 "data": EnrollmentSerializer(enrollment).data,
             },
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
         )
 
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request):
+        """
+        "My learning": every enrollment with its progress, the lesson to
+        resume from, the lesson accessed last and the certificate, most
+        recently studied first. Uses a fixed number of queries per page.
+        """
+        queryset = (
+            Enrollment.objects.filter(student=request.user)
+            .with_resume_state()
+            .order_by(F("last_lesson_accessed_at").desc(nulls_last=True), "-enrolled_at")
+        )
+        page = self.paginate_queryset(queryset)
+        enrollments = list(queryset) if page is None else page
+        serializer = EnrollmentDashboardSerializer(
+            enrollments,
+            many=True,
+            context={**self.get_serializer_context(), "lessons": resume_lessons(enrollments)},
+        )
+
+        if page is not None:
+            return self.get_paginated_response({"success": True, "data": serializer.data})
+        return Response({"success": True, "data": serializer.data})
+
+    def destroy(self, request, *args, **kwargs):
+        enrollment = self.get_object()
+        cancel_enrollment(enrollment)
+        return Response(
+            {"success": True, "message": "Unenrolled successfully"},
+            status=status.HTTP_204_NO_CONTENT,
+        )
+
 
 class LessonProgressViewSet(viewsets.ModelViewSet):
     serializer_class = LessonProgressSerializer
@@ -69,3 +112,76 @@ class LessonProgressViewSet(viewsets.ModelViewSet):
         progress = self.get_object()
         progress.mark_complete()
         return Response({"success": True, "message": "Lesson marked as complete"})
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """Record many progress events (e.g. video heartbeats) at once."""
+        serializer = LessonProgressBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        summary = record_lesson_progress(
+            request.user, serializer.validated_data["events"]  # type: ignore
+        )
+        return Response({"success": True, "data": summary})
+
+
+class CertificateViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = CertificateSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):  # type: ignore
+        if not self.request.user.is_authenticated:
+            return Certificate.objects.none()
+        return Certificate.objects.filter(
+            enrollment__student=self.request.user
+        ).select_related("enrollment__student", "enrollment__course")
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[AllowAny],
+        url_path=r"verify/(?P<number>[A-Za-z0-9 -]+)",
+    )
+    def verify(self, request, number=None):
+        """Public check that a certificate number is genuine."""
+        certificate = Certificate.objects.verify(number)
+        if certificate is None:
+            return Response(
+                {"success": False, "error": {"message": "Certificate not found."}},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        serializer = CertificateSerializer(
+            certificate, context=self.get_serializer_context()
+        )
+        return Response({"success": True, "data": serializer.data})
+
+
+class CertificateDocumentView(APIView):
+    """
+    Serve a rendered certificate. Names are content hashes (with the
+    storage's suffix if it renamed the file), so a URL always returns the
+    same bytes and may be cached forever.
+    """
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    max_age = 365 * 24 * 60 * 60
+
+    def get(self, request, name):
+        digest, extension = name.split(".")
+        etag = f'"{digest}"'
+        cache_control = f"public, max-age={self.max_age}, immutable"
+
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponseNotModified()
+        else:
+            path = f"certificates/{name}"
+            if not default_storage.exists(path):
+                raise Http404("Certificate document not found.")
+            response = FileResponse(
+                default_storage.open(path),
+                content_type=CONTENT_TYPES[extension.upper()],
+                filename=f"certificate.{extension}",
+            )
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        return response
@@ -0,0 +1,55 @@
+"""
+Helpers for benchmark management commands.
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Run the block against a freshly migrated throwaway database, so seeded
+    benchmark data never touches the real one. SQLite test databases are
+    file-backed to keep timings comparable with production.
+    """
+    temp_dir = None
+    for connection in connections.all():
+        if connection.vendor == "sqlite":
+            temp_dir = temp_dir or tempfile.mkdtemp(prefix="benchmark-")
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(
+                temp_dir, f"{connection.alias}.sqlite3"
+            )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+        if temp_dir:
+            for name in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, name))
+            os.rmdir(temp_dir)
+
+
+def time_call(func, repeat=5):
+    """Call func `repeat` times; return the median duration in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
@@ -0,0 +1,61 @@
+"""
+Versioned cache helpers.
+
+Each namespace (e.g. a single course) has a version number stored in the
+cache. Cached payloads embed that version in their key, so bumping the
+version invalidates every payload of the namespace without deleting keys.
+
+Versions are only as shared as the API_CACHE_ALIAS cache. Deployments with
+more than one worker process must point it at a shared backend (Redis,
+Memcached, or the database cache); with the default per-process LocMem cache
+a bump is invisible to the other workers, which keep serving stale payloads
+and ETags until their entries expire.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def get_cache():
+    """Return the cache backend used for API payloads."""
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return f"{namespace}:version"
+
+
+def get_version(namespace):
+    """Return the current version of a namespace, creating it if needed."""
+    cache = get_cache()
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp so an evicted version never reuses an old key
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate every payload cached under a namespace."""
+    cache = get_cache()
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def bump_version_on_commit(namespace):
+    """
+    Bump a namespace version once the current transaction commits, so a
+    concurrent reader cannot cache pre-commit data under the new version.
+    """
+    transaction.on_commit(lambda: bump_version(namespace))
@@ -0,0 +1,41 @@
+"""
+SQLite backend that applies PRAGMAs on connect.
+
+Accepts two OPTIONS besides those of django.db.backends.sqlite3:
+`pragmas`, a {name: value} dict run on every new connection, and
+`transaction_mode` ("DEFERRED", "IMMEDIATE" or "EXCLUSIVE"), the kind of
+BEGIN used by atomic blocks. IMMEDIATE takes the write lock when the
+transaction starts, so concurrent writers wait for the busy timeout instead
+of failing with "database is locked" when upgrading a read lock.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pragmas", None)
+        params.pop("transaction_mode", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict["OPTIONS"].get("pragmas", {}).items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = (self.settings_dict["OPTIONS"].get("transaction_mode") or "DEFERRED").upper()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"transaction_mode must be one of {', '.join(TRANSACTION_MODES)}."
+            )
+        if self.is_in_memory_db():
+            # Shared-cache connections (tests, mirrors) fail at once on a held
+            # lock rather than waiting, so only take it when writing
+            mode = "DEFERRED"
+        self.cursor().execute(f"BEGIN {mode}")
@@ -0,0 +1,96 @@
+"""
+Request middleware.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import get_cache
+from .routers import replica_configured, replica_reads
+
+
+PIN_COOKIE_NAME = "replica_pin"
+PIN_COOKIE_SALT = "config.middleware.ReplicaReadMiddleware"
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+class ReplicaReadMiddleware:
+    """
+    Serve safe-method requests to REPLICA_READ_PATHS from the read replica.
+
+    After a client's successful write, its reads stay on the primary for
+    REPLICA_PIN_SECONDS so it sees its own changes despite replication lag.
+    The pin is a signed, expiring cookie, which every worker can check. For
+    clients that do not send cookies back, it is also kept in the API cache
+    keyed by user, which then must be shared between workers; the user is
+    read from the access token without a database query, as DRF only
+    authenticates inside the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.authentication = JWTAuthentication()
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        if request.method in SAFE_METHODS:
+            eligible = request.path.startswith(tuple(settings.REPLICA_READ_PATHS))
+            if eligible and not self._is_pinned(request):
+                with replica_reads():
+                    return self.get_response(request)
+            return self.get_response(request)
+
+        response = self.get_response(request)
+        if response.status_code < 400:
+            self._pin(request, response)
+        return response
+
+    def _user_id(self, request):
+        try:
+            header = self.authentication.get_header(request)
+            raw_token = header and self.authentication.get_raw_token(header)
+            if raw_token:
+                token = self.authentication.get_validated_token(raw_token)
+                return str(token[api_settings.USER_ID_CLAIM])
+        except (AuthenticationFailed, KeyError):
+            return None
+
+        # Session users, e.g. on the admin site
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return str(user.pk)
+        return None
+
+    def _is_pinned(self, request):
+        # The signature's timestamp bounds the pin, whatever the cookie's expiry
+        if request.get_signed_cookie(
+            PIN_COOKIE_NAME,
+            default=None,
+            salt=PIN_COOKIE_SALT,
+            max_age=settings.REPLICA_PIN_SECONDS,
+        ):
+            return True
+        user_id = self._user_id(request)
+        return user_id is not None and get_cache().get(_pin_key(user_id)) is not None
+
+    def _pin(self, request, response):
+        response.set_signed_cookie(
+            PIN_COOKIE_NAME,
+            "1",
+            salt=PIN_COOKIE_SALT,
+            max_age=settings.REPLICA_PIN_SECONDS,
+            secure=request.is_secure(),
+            httponly=True,
+            samesite="Lax",
+        )
+        user_id = self._user_id(request)
+        if user_id is not None:
+            get_cache().set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
@@ -0,0 +1,201 @@
+"""
+Pagination classes shared by all list endpoints.
+
+Page-number pagination stays the default. Keyset (cursor) pagination can be
+selected per request with `?pagination=cursor`, or per view with
+`pagination_mode = "cursor"`. It avoids the COUNT(*) and the growing OFFSET of
+deep page-number pagination.
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination keyed on the view's ordering field plus `id`.
+
+    The composite (field, id) position is unique, so each page is a plain
+    range scan on the index of the ordering field.
+    """
+
+    ordering = "-pk"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # The queryset's ordering is final: filters may replace the ordering
+        # backend's choice, e.g. search results are ordered by relevance
+        ordering = queryset.query.order_by
+        if not ordering:
+            for backend in getattr(view, "filter_backends", []):
+                if hasattr(backend, "get_ordering"):
+                    ordering = backend().get_ordering(request, queryset, view)
+                    break
+
+        if not ordering:
+            ordering = queryset.model._meta.ordering or self.ordering
+        if isinstance(ordering, str):
+            ordering = [ordering]
+
+        field = ordering[0]
+        if not isinstance(field, str):
+            # Expressions such as F().desc(); see supports_ordering()
+            return tuple(ordering)
+        if field.lstrip("-") in ("id", "pk"):
+            return (field,)
+
+        # Use the primary key as the tie-breaker, in the same direction as the key field
+        direction = "-" if field.startswith("-") else ""
+        return (field, f"{direction}pk")
+
+    @classmethod
+    def supports_ordering(cls, model, ordering):
+        """Keyset pagination needs a local, non-null ordering field."""
+        if not isinstance(ordering[0], str):
+            return False
+        field_name = ordering[0].lstrip("-")
+        if field_name in ("id", "pk"):
+            return True
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return False
+        return not field.null
+
+    def _get_position_from_instance(self, instance, ordering):
+        field_name = ordering[0].lstrip("-")
+        if isinstance(instance, dict):
+            value, pk = instance[field_name], instance.get("id", instance.get("pk"))
+        else:
+            value, pk = getattr(instance, field_name), instance.pk
+        return json.dumps([self._encode_value(value), self._encode_value(pk)])
+
+    @staticmethod
+    def _encode_value(value):
+        # Keep full precision; microseconds matter for timestamp keys
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            return str(value)
+        return value
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*[self._reverse(o) for o in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self._position_filter(current_position))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    @staticmethod
+    def _reverse(order):
+        return order[1:] if order.startswith("-") else f"-{order}"
+
+    def _position_filter(self, position):
+        """Rows strictly after the (field, id) position in the walk direction."""
+        try:
+            value, pk = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        order = self.ordering[0]
+        field_name = order.lstrip("-")
+        lookup = "lt" if self.cursor.reverse != order.startswith("-") else "gt"
+
+        if len(self.ordering) == 1:
+            return Q(**{f"{field_name}__{lookup}": value})
+        return Q(**{f"{field_name}__{lookup}": value}) | Q(
+            **{field_name: value, f"pk__{lookup}": pk}
+        )
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    Default pagination: page numbers, or keyset pagination when requested
+    with `?pagination=cursor` (or `cursor=`) or by `view.pagination_mode`.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    mode_query_param = "pagination"
+    cursor_paginator_class = KeysetCursorPagination
+
+    def use_cursor(self, request, view):
+        mode = request.query_params.get(self.mode_query_param) or getattr(
+            view, "pagination_mode", "page"
+        )
+        return mode == "cursor" or "cursor" in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+
+        if self.use_cursor(request, view):
+            paginator = self.cursor_paginator_class()
+            ordering = paginator.get_ordering(request, queryset, view)
+            # Nullable, related, annotated or expression orderings, e.g. search
+            # relevance, keep page-number pagination
+            if paginator.supports_ordering(queryset.model, ordering):
+                self.cursor_paginator = paginator
+                return paginator.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
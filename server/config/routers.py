@@ -0,0 +1,64 @@
+"""
+Read-replica database routing.
+
+Reads go to the REPLICA_DATABASE_ALIAS database only inside `replica_reads()`
+blocks, which ReplicaReadMiddleware opens around safe-method requests to the
+REPLICA_READ_PATHS. Everything else, including every write, uses the
+primary. Without a replica in DATABASES the router keeps all queries on the
+primary.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DATABASE_ALIAS = "replica"
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def replica_configured():
+    return REPLICA_DATABASE_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads():
+    """Route the reads of the block to the replica, when one is configured."""
+    token = _read_from_replica.set(replica_configured())
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Route the reads of the block to the primary, e.g. when building a
+    payload that is cached under a version bumped by a primary write.
+    """
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get():
+            return REPLICA_DATABASE_ALIAS
+        # Also for objects loaded from the replica, whose state would
+        # otherwise keep later queries on it
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # The rest of the block must see this write
+        _read_from_replica.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows
+        return True
@@ -62,6 +62,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "config.middleware.ReplicaReadMiddleware",
 ]
 
 
@@ -88,12 +89,158 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
+# PostgreSQL when DATABASE_URL is set (needs psycopg2-binary and
+# dj-database-url), otherwise a local SQLite file tuned for concurrent writes.
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 closes them after
+# every request).
+DATABASE_URL = config("DATABASE_URL", default="")
+DB_CONN_MAX_AGE = config("DB_CONN_MAX_AGE", default=60, cast=int)
+
+if DATABASE_URL:
+    import dj_database_url
+
+    DATABASES = {
+        "default": dj_database_url.parse(
+            DATABASE_URL,
+            conn_max_age=DB_CONN_MAX_AGE,
+            # Check a persistent connection before reusing it in a new request
+            conn_health_checks=config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool),
+        )
+    }
+    # Transaction-pooling proxies such as PgBouncer cannot keep server-side
+    # cursors open between transactions
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = config(
+        "DB_DISABLE_SERVER_SIDE_CURSORS", default=False, cast=bool
+    )
+else:
+    SQLITE_JOURNAL_MODE = config("SQLITE_JOURNAL_MODE", default="DELETE").upper()
+    DATABASES = {
+        "default": {
+            "ENGINE": "config.db.sqlite3",
+            "NAME": config("SQLITE_PATH", default=str(BASE_DIR / "db.sqlite3")),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "OPTIONS": {
+                # Seconds a writer waits for the write lock before failing
+                "timeout": config("SQLITE_BUSY_TIMEOUT", default=20, cast=int),
+                # Take the write lock at BEGIN so waiting writers queue up
+                "transaction_mode": config("SQLITE_TRANSACTION_MODE", default="IMMEDIATE"),
+                "pragmas": {
+                    # The journal mode is stored in the database file, and WAL
+                    # keeps -wal/-shm files next to it: opt in with
+                    # SQLITE_JOURNAL_MODE=WAL so readers and the writer stop
+                    # blocking each other
+                    "journal_mode": SQLITE_JOURNAL_MODE,
+                    # WAL at NORMAL skips the fsync per commit; a power loss may
+                    # drop the last commits
+                    "synchronous": config(
+                        "SQLITE_SYNCHRONOUS",
+                        default="NORMAL" if SQLITE_JOURNAL_MODE == "WAL" else "FULL",
+                    ),
+                    "mmap_size": config("SQLITE_MMAP_SIZE", default=268435456, cast=int),
+                },
+            },
+            # A file rather than Django's in-memory default, so that tests
+            # exercise the journal mode and locking of real deployments
+            "TEST": {
+                "NAME": config("SQLITE_TEST_PATH", default=str(BASE_DIR / "test_db.sqlite3")),
+            },
+        }
+    }
+
+# Read replica: DATABASE_REPLICA_URL (PostgreSQL) or SQLITE_REPLICA_PATH (a
+# second SQLite file, for trying the routing locally). Safe-method requests
+# to REPLICA_READ_PATHS read from it, except for clients who wrote within the
+# last REPLICA_PIN_SECONDS; without a replica everything uses "default".
+DATABASE_REPLICA_URL = config("DATABASE_REPLICA_URL", default="")
+SQLITE_REPLICA_PATH = config("SQLITE_REPLICA_PATH", default="")
+
+if DATABASE_REPLICA_URL:
+    import dj_database_url
+
+    DATABASES["replica"] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool),
+    )
+elif SQLITE_REPLICA_PATH:
+    DATABASES["replica"] = {**DATABASES["default"], "NAME": SQLITE_REPLICA_PATH}
+if "replica" in DATABASES:
+    # Tests read the replica alias from the test primary
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["config.routers.ReplicaRouter"]
+REPLICA_READ_PATHS = ["/api/v1/courses/", "/api/v1/analytics/"]
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=5, cast=int)
+
+# Cache
+# LocMem by default, which is per process: with several worker processes,
+# CACHE_BACKEND/CACHE_LOCATION must point at a shared backend (e.g. Redis or
+# Memcached), or cache invalidations and limits only reach one worker.
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="learning-platform"),
     }
 }
+API_CACHE_ALIAS = config("API_CACHE_ALIAS", default="default")
+COURSE_DETAIL_CACHE_TIMEOUT = config(
+    "COURSE_DETAIL_CACHE_TIMEOUT", default=300, cast=int
+)
+
+INSTRUCTOR_ANALYTICS_CACHE_TIMEOUT = config(
+    "INSTRUCTOR_ANALYTICS_CACHE_TIMEOUT", default=300, cast=int
+)
+
+# Daily analytics rollups: rows newer than the lag (seconds) wait for the next
+# run, so transactions still in flight are not skipped
+ANALYTICS_ROLLUP_LAG = config("ANALYTICS_ROLLUP_LAG", default=300, cast=int)
+ANALYTICS_TIMESERIES_MAX_DAYS = config(
+    "ANALYTICS_TIMESERIES_MAX_DAYS", default=1096, cast=int
+)
+
+# Largest number of events accepted by the batch lesson progress endpoint
+PROGRESS_BATCH_MAX_EVENTS = config("PROGRESS_BATCH_MAX_EVENTS", default=500, cast=int)
+
+# Enrollments written per UPDATE when recounting a course's progress
+PROGRESS_REFRESH_BATCH_SIZE = config("PROGRESS_REFRESH_BATCH_SIZE", default=1000, cast=int)
+
+# Certificate documents: "PDF" or "PNG"; an empty font uses Pillow's default
+CERTIFICATE_DOCUMENT_FORMAT = config("CERTIFICATE_DOCUMENT_FORMAT", default="PDF")
+CERTIFICATE_FONT = config("CERTIFICATE_FONT", default="")
+CERTIFICATE_RENDER_WORKERS = config("CERTIFICATE_RENDER_WORKERS", default=4, cast=int)
+
+# Number of recent reviews embedded in course detail responses
+COURSE_DETAIL_RECENT_REVIEWS = config("COURSE_DETAIL_RECENT_REVIEWS", default=5, cast=int)
+
+# Course search; the backend is chosen from the database vendor when empty
+COURSE_SEARCH_BACKEND = config("COURSE_SEARCH_BACKEND", default="")
+COURSE_SEARCH_MAX_RESULTS = config("COURSE_SEARCH_MAX_RESULTS", default=500, cast=int)
+
+# PBKDF2 iterations for new password hashes; 0 keeps Django's default.
+# Lower only where hashing cost matters more than brute-force resistance
+PASSWORD_HASH_ITERATIONS = config("PASSWORD_HASH_ITERATIONS", default=0, cast=int)
+PASSWORD_HASHERS = [
+    "apps.accounts.hashers.ConfiguredPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Login attempt limits in django-ratelimit syntax (e.g. "20/m"), counted per
+# client IP and per email before the password is hashed; empty disables.
+# They replace the sliding-window throttle on the login endpoint. Counters
+# live in the RATELIMIT_USE_CACHE cache, which must be shared between
+# workers to limit across them
+LOGIN_RATELIMIT_IP = config("LOGIN_RATELIMIT_IP", default="20/m")
+LOGIN_RATELIMIT_EMAIL = config("LOGIN_RATELIMIT_EMAIL", default="")
+RATELIMIT_USE_CACHE = API_CACHE_ALIAS
+
+# Seconds a process trusts a cached user auth version; bounds how long a
+# revoked access token keeps working in other processes
+AUTH_VERSION_CACHE_TTL = config("AUTH_VERSION_CACHE_TTL", default=30, cast=int)
 
 # Custom User Model
 AUTH_USER_MODEL = "accounts.User"
@@ -141,10 +288,10 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "config.pagination.StandardPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -158,13 +305,23 @@ REST_FRAMEWORK = {
         "rest_framework.parsers.FormParser",
     ),
     "EXCEPTION_HANDLER": "config.exceptions.custom_exception_handler",
-    # "DEFAULT_THROTTLE_CLASSES": [
-    #     "rest_framework.throttling.AnonRateThrottle",
-    #     "rest_framework.throttling.UserRateThrottle",
-    # ],
-    # "DEFAULT_THROTTLE_RATES": {"anon": "100/hour", "user": "1000/hour"},
+    "DEFAULT_THROTTLE_CLASSES": ["config.throttling.SlidingWindowThrottle"],
+    # Per-scope rates ("300/min"); an empty value disables the scope
+    "DEFAULT_THROTTLE_RATES": {
+        "catalog": config("THROTTLE_RATE_CATALOG", default="300/min") or None,
+        "register": config("THROTTLE_RATE_REGISTER", default="10/hour") or None,
+        "password_reset": config("THROTTLE_RATE_PASSWORD_RESET", default="5/hour")
+        or None,
+    },
 }
 
+# Throttle counters: config.throttling.LocalWindowStore (per worker, at most
+# THROTTLE_MAX_KEYS clients) or config.throttling.CacheWindowStore (shared
+# through the THROTTLE_CACHE_ALIAS cache)
+THROTTLE_STORE = config("THROTTLE_STORE", default="config.throttling.LocalWindowStore")
+THROTTLE_MAX_KEYS = config("THROTTLE_MAX_KEYS", default=100000, cast=int)
+THROTTLE_CACHE_ALIAS = config("THROTTLE_CACHE_ALIAS", default=API_CACHE_ALIAS)
+
 # JWT Configuration
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(
@@ -181,6 +338,7 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "TOKEN_TYPE_CLAIM": "token_type",
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.serializers.UserClaimsTokenRefreshSerializer",
     # "UPDATE_LAST_LOGIN": True,
     # "TOKEN_BLACKLIST_ENABLED": True,
     # "TOKEN_BLACKLIST_CHECKS": [
@@ -203,6 +361,19 @@ DEFAULT_FROM_EMAIL = config(
     "DEFAULT_FROM_EMAIL", default="noreply@learningplatform.com"
 )
 
+# Recipients sent per mail connection by multi-recipient notifications
+EMAIL_BULK_CHUNK_SIZE = config("EMAIL_BULK_CHUNK_SIZE", default=50, cast=int)
+
+# Email outbox worker (manage.py send_outbox_emails)
+EMAIL_OUTBOX_WORKERS = config("EMAIL_OUTBOX_WORKERS", default=4, cast=int)
+EMAIL_OUTBOX_BATCH_SIZE = config("EMAIL_OUTBOX_BATCH_SIZE", default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config("EMAIL_OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config("EMAIL_OUTBOX_RETRY_DELAY", default=30, cast=int)
+EMAIL_OUTBOX_MAX_RETRY_DELAY = config(
+    "EMAIL_OUTBOX_MAX_RETRY_DELAY", default=3600, cast=int
+)
+EMAIL_OUTBOX_LOCK_TIMEOUT = config("EMAIL_OUTBOX_LOCK_TIMEOUT", default=300, cast=int)
+
 # CORS Configuration
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOWED_ORIGINS = config(
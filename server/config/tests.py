@@ -0,0 +1,184 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, UserRole
+from apps.courses.models import Category, Course, CourseStatus
+
+from .throttling import CacheWindowStore, LocalWindowStore, get_throttle_store
+
+COURSES_URL = "/api/v1/courses/courses/"
+
+THROTTLE_CACHES = {
+    **settings.CACHES,
+    "throttle-tests": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttle-tests",
+    },
+}
+
+
+@override_settings(CACHES=THROTTLE_CACHES)
+class WindowStoreTests(SimpleTestCase):
+    """Both stores count 10 requests per minute the same way."""
+
+    limit, duration = 10, 60
+
+    def stores(self):
+        caches["throttle-tests"].clear()
+        return [LocalWindowStore(max_keys=10), CacheWindowStore("throttle-tests")]
+
+    def hits(self, store, now, count):
+        return [store.hit("client", self.limit, self.duration, now) for _ in range(count)]
+
+    def test_counts_the_previous_window_by_its_remaining_weight(self):
+        for store in self.stores():
+            with self.subTest(store=type(store).__name__):
+                self.assertEqual(self.hits(store, 30, 10), [0] * 10)
+                self.assertTrue(store.hit("client", self.limit, self.duration, 59))
+
+                # Half of the previous window is still covered: it counts 5
+                waits = self.hits(store, 90, 6)
+                self.assertEqual(waits[:5], [0] * 5)
+                self.assertTrue(waits[5])
+
+    def test_window_rollover(self):
+        for store in self.stores():
+            with self.subTest(store=type(store).__name__):
+                self.hits(store, 30, 10)
+                # A window without requests in between: nothing carries over
+                self.assertEqual(self.hits(store, 150, 10), [0] * 10)
+                self.assertTrue(store.hit("client", self.limit, self.duration, 150))
+
+    def test_retry_after_when_the_current_window_is_full(self):
+        for store in self.stores():
+            with self.subTest(store=type(store).__name__):
+                self.hits(store, 30, 10)
+                wait = store.hit("client", self.limit, self.duration, 30)
+
+                # At 66s the previous window weighs 9, leaving room for one
+                self.assertAlmostEqual(wait, 36)
+                self.assertTrue(store.hit("client", self.limit, self.duration, 65.9))
+                self.assertEqual(store.hit("client", self.limit, self.duration, 66), 0)
+
+    def test_retry_after_while_the_previous_window_fades(self):
+        for store in self.stores():
+            with self.subTest(store=type(store).__name__):
+                self.hits(store, 30, 10)
+                self.hits(store, 90, 5)
+                wait = store.hit("client", self.limit, self.duration, 90)
+
+                # At 96s the previous window weighs 4: 5 + 4 + 1 fits
+                self.assertAlmostEqual(wait, 6)
+                self.assertTrue(store.hit("client", self.limit, self.duration, 95.9))
+                self.assertEqual(store.hit("client", self.limit, self.duration, 96), 0)
+
+    def test_rejected_requests_are_not_counted(self):
+        store = LocalWindowStore(max_keys=10)
+        self.hits(store, 30, 10)
+        self.hits(store, 30, 20)
+        self.assertEqual(self.hits(store, 90, 5), [0] * 5)
+
+    def test_local_store_forgets_the_least_recent_clients(self):
+        store = LocalWindowStore(max_keys=2)
+        for key in ("first", "second", "first", "third"):
+            store.hit(key, 1, self.duration, 30)
+
+        self.assertTrue(store.hit("first", 1, self.duration, 30))
+        self.assertEqual(store.hit("second", 1, self.duration, 30), 0)
+
+
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        get_throttle_store.cache_clear()
+        self.addCleanup(get_throttle_store.cache_clear)
+
+    def test_throttled_response_carries_retry_after(self):
+        rates = {**api_settings.DEFAULT_THROTTLE_RATES, "catalog": "2/min"}
+        client = APIClient()
+        with override_settings(
+            REST_FRAMEWORK={
+                **api_settings.user_settings,
+                "DEFAULT_THROTTLE_RATES": rates,
+            }
+        ):
+            statuses = [
+                client.get(COURSES_URL).status_code for _ in range(2)
+            ]
+            response = client.get(COURSES_URL)
+
+        self.assertEqual(statuses, [200, 200])
+        self.assertEqual(response.status_code, 429)
+        # Up to a window and a half: the full window has to fade by half
+        self.assertIn(int(response["Retry-After"]), range(1, 91))
+
+
+class KeysetCursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        instructor = User.objects.create_user(
+            email="instructor@example.com", password="!", role=UserRole.INSTRUCTOR
+        )
+        category = Category.objects.create(name="Programming", slug="programming")
+        for index in range(7):
+            Course.objects.create(
+                instructor=instructor,
+                category=category,
+                title=f"Course {index}",
+                slug=f"course-{index}",
+                description="Description",
+                short_description="Short description",
+                learning_outcomes="Outcomes",
+                price=Decimal("10.00"),
+                status=CourseStatus.PUBLISHED,
+            )
+        # Five courses share a timestamp; only the id tells them apart
+        tied = Course.objects.order_by("pk").values_list("pk", flat=True)[1:6]
+        Course.objects.filter(pk__in=list(tied)).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+
+    def setUp(self):
+        get_throttle_store.cache_clear()
+        self.addCleanup(get_throttle_store.cache_clear)
+        self.client = APIClient()
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        return [course["id"] for course in body["results"]["data"]], body
+
+    def test_pages_cover_tied_rows_once_in_both_directions(self):
+        for ordering in ("-created_at", "created_at"):
+            with self.subTest(ordering=ordering):
+                expected = [
+                    str(pk)
+                    for pk in Course.objects.order_by(
+                        ordering, ordering.replace("created_at", "pk")
+                    ).values_list("pk", flat=True)
+                ]
+                ids, body = self.get(
+                    COURSES_URL,
+                    {"pagination": "cursor", "ordering": ordering, "page_size": 2},
+                )
+                self.assertNotIn("count", body)
+                self.assertIsNone(body["previous"])
+                pages = [ids]
+                while body["next"]:
+                    ids, body = self.get(body["next"])
+                    pages.append(ids)
+                self.assertEqual(sum(pages, []), expected)
+                self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+                backward = [ids]
+                while body["previous"]:
+                    ids, body = self.get(body["previous"])
+                    backward.insert(0, ids)
+                self.assertEqual(backward, pages)
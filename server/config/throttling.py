@@ -0,0 +1,160 @@
+"""
+Sliding-window request throttling.
+
+Views opt in with a `throttle_scope` whose rate ("100/min") is set in
+REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]; scopes without a rate are not
+throttled. Requests are counted per user, or per client IP when anonymous,
+with the sliding-window counter approximation: the count of the current
+fixed window plus the previous window's count weighted by how much of it
+the sliding window still covers. A client costs two counters whatever its
+request rate, unlike DRF's throttles which keep one timestamp per request.
+
+Counters live in the store named by THROTTLE_STORE: LocalWindowStore keeps
+them in process (limits apply per worker), CacheWindowStore shares them
+between workers through a Django cache.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def _window(now, duration):
+    """Index of the fixed window containing `now`, and how far into it we are."""
+    window, offset = divmod(now, duration)
+    return int(window), offset / duration
+
+
+def _retry_after(current, previous, elapsed, limit, duration):
+    """Seconds until the sliding count drops low enough to allow a request."""
+    if current < limit and previous:
+        # The previous window's weight fades during this window
+        needed = 1 - (limit - 1 - current) / previous
+        return max(needed - elapsed, 0) * duration
+    # Wait for the next window, where this window's count fades instead
+    needed = 1 - (limit - 1) / current
+    return (1 - elapsed + max(needed, 0)) * duration
+
+
+class BaseWindowStore:
+    """Interface of throttle counter stores."""
+
+    def hit(self, key, limit, duration, now):
+        """
+        Count a request for `key` if fewer than `limit` were made in the
+        last `duration` seconds. Return 0 when allowed, otherwise the seconds
+        to wait; rejected requests are not counted.
+        """
+        raise NotImplementedError
+
+
+class LocalWindowStore(BaseWindowStore):
+    """
+    In-process counters. At most THROTTLE_MAX_KEYS clients are tracked;
+    the least recently seen are forgotten first.
+    """
+
+    def __init__(self, max_keys=None):
+        self.max_keys = max_keys or settings.THROTTLE_MAX_KEYS
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, duration, now):
+        window, elapsed = _window(now, duration)
+        with self._lock:
+            start, current, previous = self._counters.pop(key, (window, 0, 0))
+            if start != window:
+                previous = current if start == window - 1 else 0
+                current = 0
+
+            allowed = current + previous * (1 - elapsed) + 1 <= limit
+            if allowed:
+                current += 1
+            self._counters[key] = (window, current, previous)
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+
+        if allowed:
+            return 0
+        return _retry_after(current, previous, elapsed, limit, duration)
+
+
+class CacheWindowStore(BaseWindowStore):
+    """
+    Counters shared through the THROTTLE_CACHE_ALIAS cache, one key per
+    client and window expiring after two windows. Concurrent requests may
+    overshoot the limit slightly, as the check and the increment are
+    separate cache operations.
+    """
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or settings.THROTTLE_CACHE_ALIAS]
+
+    def hit(self, key, limit, duration, now):
+        window, elapsed = _window(now, duration)
+        current_key = f"throttle:{key}:{window}"
+        previous_key = f"throttle:{key}:{window - 1}"
+        counts = self.cache.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+
+        if current + previous * (1 - elapsed) + 1 > limit:
+            return _retry_after(current, previous, elapsed, limit, duration)
+
+        timeout = 2 * duration + 1
+        if not self.cache.add(current_key, 1, timeout):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # Expired between add() and incr()
+                self.cache.set(current_key, 1, timeout)
+        return 0
+
+
+@lru_cache(maxsize=None)
+def get_throttle_store():
+    """Return the configured throttle counter store."""
+    return import_string(settings.THROTTLE_STORE)()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Throttle the requests of views that set a `throttle_scope`."""
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved per request
+        self.wait_seconds = 0
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None)
+        if not self.scope:
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(
+            api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        )
+        if self.num_requests is None:
+            return True
+
+        self.wait_seconds = get_throttle_store().hit(
+            self.get_cache_key(request, view),
+            self.num_requests,
+            self.duration,
+            self.timer(),
+        )
+        return not self.wait_seconds
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return f"{self.scope}:{self.duration}:{ident}"
+
+    def wait(self):
+        return self.wait_seconds